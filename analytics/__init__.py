@@ -0,0 +1 @@
+# analytics package: numeric engines shared by the dashboard pages
@@ -0,0 +1,204 @@
+#aggregates.py
+import os
+import threading
+
+import pandas as pd
+
+from data import datasets, store
+from data.leagues import get_adapter
+from data.schema import SCHEMAS, player_seasons
+
+# Small summary tables materialized after every fetch, so the dashboards read O(result)
+# rows instead of re-aggregating the raw player seasons:
+#   season_summary: one row per (season, stat) with count, mean, std, min, percentiles and max
+#   team_seasons:   one row per (season, team) with every stat summed and the number of player rows
+#                   (the per-player average is the sum divided by `players`)
+#   player_careers: one row per player with seasons played, first/last season, summed counting
+#                   stats and averaged rate stats
+#   leaderboards:   the top LEADERBOARD_SIZE player seasons of each season for each ranked stat
+TABLES = ['season_summary', 'team_seasons', 'player_careers', 'leaderboards']
+
+# Largest top-N the leaderboards answer (the bar chart slider goes up to 100)
+LEADERBOARD_SIZE = 100
+PERCENTILES = [0.1, 0.25, 0.5, 0.75, 0.9]
+
+# Tables read from disk, per process: {(league, name): (version, table)}
+_loaded = {}
+_lock = threading.Lock()
+
+
+def stat_columns(league, df):
+    # Counting stats (summed over a career) and rate stats (averaged) present in the frame
+    schema = SCHEMAS[league]
+    counts = [col for col in schema['ints'] if col in df.columns and col.lower() != 'rank']
+    rates = [col for col in schema['floats'] if col in df.columns]
+    return counts, rates
+
+
+def ranked_stats(league, df):
+    # Stats the dashboards rank players by: the radar options and the bar chart stats
+    adapter = get_adapter(league)
+    stats = list(adapter.stats_options) + (list(adapter.bar_chart[0]) if adapter.bar_chart else [])
+    return [col for col in dict.fromkeys(stats) if col in df.columns]
+
+
+def season_summary(league, df):
+    adapter = get_adapter(league)
+    counts, rates = stat_columns(league, df)
+    if not counts + rates:
+        return pd.DataFrame(columns=[adapter.season_col, 'stat'])
+    described = df.groupby(adapter.season_col, observed=True)[counts + rates].describe(percentiles=PERCENTILES)
+    summary = described.stack(level=0, future_stack=True)
+    summary.index = summary.index.set_names([adapter.season_col, 'stat'])
+    summary.columns = [f"p{col[:-1]}" if col.endswith('%') else col for col in summary.columns]
+    return summary.reset_index()
+
+
+def team_seasons(league, df):
+    adapter = get_adapter(league)
+    counts, rates = stat_columns(league, df)
+    keys = [adapter.season_col, adapter.team_col]
+    grouped = df.groupby(keys, observed=True)
+    totals = grouped[counts + rates].sum()
+    totals['players'] = grouped.size()
+    return totals.reset_index()
+
+
+def player_careers(league, df):
+    adapter = get_adapter(league)
+    counts, rates = stat_columns(league, df)
+    season = adapter.season_col
+    # Season labels ('2023-24') are categorical; ordering the categories by label (which is
+    # chronological) lets min/max run on the codes
+    if isinstance(df[season].dtype, pd.CategoricalDtype):
+        labels = df[season].cat
+        df = df.assign(**{season: labels.reorder_categories(sorted(labels.categories), ordered=True)})
+    grouped = df.groupby(adapter.key_columns['player_id'], observed=True, sort=False)
+    careers = grouped.agg(**{
+        adapter.player_col: (adapter.player_col, 'last'),
+        'seasons': (season, 'nunique'),
+        'first_season': (season, 'min'),
+        'last_season': (season, 'max'),
+    })
+    careers = careers.join(grouped[counts].sum()).join(grouped[rates].mean())
+    return careers.reset_index()
+
+
+def leaderboards(league, df):
+    # Rows carry every ranked stat so one leaderboard can feed a multi-stat bar chart
+    adapter = get_adapter(league)
+    stats = ranked_stats(league, df)
+    columns = [adapter.season_col, adapter.player_col, adapter.team_col] + stats
+    boards = []
+    for stat in stats:
+        # Partial sort per season; ties keep the dataset order
+        values = df[stat].dropna()
+        best = values.groupby(df[adapter.season_col], observed=True, sort=False).nlargest(LEADERBOARD_SIZE)
+        top = df.loc[best.index.get_level_values(-1), columns]
+        top = top.assign(stat=stat, rank=top.groupby(adapter.season_col, observed=True).cumcount() + 1)
+        boards.append(top)
+    if not boards:
+        return pd.DataFrame(columns=['stat', 'rank'] + columns)
+    return pd.concat(boards, ignore_index=True)[['stat', 'rank'] + columns]
+
+
+BUILDERS = {
+    'season_summary': season_summary,
+    'team_seasons': team_seasons,
+    'player_careers': player_careers,
+    'leaderboards': leaderboards,
+}
+
+
+def build(league, df):
+    if df.empty:
+        # Nothing fetched yet for this league
+        return {name: pd.DataFrame() for name in TABLES}
+    return {name: BUILDERS[name](league, df) for name in TABLES}
+
+
+def materialize(league, df=None, store_dir=None):
+    # Post-fetch step: recompute every table from the stored dataset and record the
+    # dataset version they were built from
+    store_dir = store_dir or store.current_root()
+    version = store.dataset_version(league, store_dir)
+    if df is None:
+        df = store.read_league(league, store_dir=store_dir)
+    else:
+        df = player_seasons(league, df)
+    tables = build(league, df)
+    store.write_aggregates(league, tables, version, store_dir)
+    return tables
+
+
+def load(league, name):
+    # One aggregate table for the current dataset version: read from disk once per version,
+    # or built from the dataset (once per version) when the stored tables are stale or missing
+    root = store.current_root()
+    version = store.dataset_version(league, root)
+    with _lock:
+        entry = _loaded.get((league, name))
+        if entry is not None and entry[0] == version:
+            return entry[1]
+
+    table = store.read_aggregate(league, name, version, root)
+    if table is not None:
+        table.attrs['version'] = version
+    else:
+        # Tables built from the dataset carry its version in attrs already
+        table = datasets.get_derived(league, 'aggregates', lambda df: build(league, df))[name]
+    with _lock:
+        _loaded[(league, name)] = (version, table)
+    return table
+
+
+def _is_all(value):
+    return value is None or value == 'All'
+
+
+def _season_rows(table, season_col, season):
+    if _is_all(season):
+        return table
+    return table[table[season_col].astype(str) == str(season)]
+
+
+def season_means(league, stat):
+    # League average of a stat per season: [season column, stat]
+    season_col = get_adapter(league).season_col
+    summary = load(league, 'season_summary')
+    rows = summary[summary['stat'] == stat]
+    return rows[[season_col, 'mean']].rename(columns={'mean': stat}).reset_index(drop=True)
+
+
+def team_totals(league, stats, season=None, team=None, table=None):
+    # Per-team sums of stats for one season (or all of them), largest first
+    adapter = get_adapter(league)
+    table = load(league, 'team_seasons') if table is None else table
+    rows = _season_rows(table, adapter.season_col, season)
+    if not _is_all(team):
+        rows = rows[rows[adapter.team_col].astype(str) == str(team)]
+    totals = rows.groupby(adapter.team_col, observed=True)[stats].sum().reset_index()
+    return totals.sort_values(stats[0], ascending=False)
+
+
+def leaders(league, stats, n, season=None, table=None):
+    # Top n player seasons by stats[0], or None when the leaderboards can't answer
+    # (a stat that isn't ranked or n beyond LEADERBOARD_SIZE)
+    adapter = get_adapter(league)
+    boards = load(league, 'leaderboards') if table is None else table
+    if n > LEADERBOARD_SIZE or any(stat not in boards.columns for stat in stats):
+        return None
+    rows = boards[boards['stat'] == stats[0]]
+    if rows.empty and not boards.empty:
+        return None
+    # The overall top n are always within the per-season top n, so "All" ranks the union
+    rows = _season_rows(rows, adapter.season_col, season)
+    columns = [adapter.player_col, adapter.team_col, adapter.season_col] + stats
+    return rows.nlargest(n, stats[0])[columns]
+
+
+if __name__ == "__main__":
+    for league in SCHEMAS:
+        if store.has_store(league) or os.path.exists(store.CSV_PATHS[league]):
+            tables = materialize(league)
+            print(f"{league}: " + ", ".join(f"{name} {len(table)} rows" for name, table in tables.items()))
@@ -0,0 +1,40 @@
+#comparison.py
+import numpy as np
+import pandas as pd
+
+
+class ComparisonEngine:
+    # Radar-chart engine for player comparisons. Every stat is min/max scaled
+    # against the whole league for its season (so the scale doesn't move when the
+    # selection changes), then averaged per player with a single groupby.
+    # Built once per dataset version; a comparison is just a lookup into the result.
+
+    def __init__(self, df, player_col, season_col, stats):
+        self.stats = list(stats)
+        self.version = df.attrs.get('version')
+        self._stat_pos = {stat: i for i, stat in enumerate(self.stats)}
+
+        values = df[self.stats].to_numpy(dtype='float64')
+        season_codes, _ = pd.factorize(df[season_col])
+
+        # League-wide min/max of every stat for every season
+        per_season = pd.DataFrame(values).groupby(season_codes)
+        lows = per_season.min().to_numpy()
+        spans = per_season.max().to_numpy() - lows
+        lows, spans = lows[season_codes], spans[season_codes]
+        # A stat that is constant within a season scales to 0, like MinMaxScaler does
+        with np.errstate(invalid='ignore', divide='ignore'):
+            normalized = np.where(spans > 0, (values - lows) / spans, 0.0)
+
+        # Per-player mean of the normalized stats across their seasons
+        player_codes, players = pd.factorize(df[player_col])
+        means = pd.DataFrame(normalized).groupby(player_codes).mean()
+        self.player_matrix = means.to_numpy(dtype='float32')
+        self._player_pos = {player: i for i, player in enumerate(players.tolist())}
+
+    def series(self, players, stats):
+        # (len(players), len(stats)) array of normalized values in [0, 1]; unknown players are dropped
+        players = [player for player in players if player in self._player_pos]
+        rows = [self._player_pos[player] for player in players]
+        cols = [self._stat_pos[stat] for stat in stats]
+        return players, self.player_matrix[np.ix_(rows, cols)]
@@ -0,0 +1,104 @@
+#similarity.py
+import numpy as np
+import pandas as pd
+
+from data import datasets
+from data.leagues import get_adapter
+
+
+class SimilarityIndex:
+    # "Players like X": k-nearest-neighbour search over player seasons. Every stat is
+    # z-scored against the whole league for its season (so different eras compare fairly),
+    # and the vectors are kept as one contiguous float32 matrix next to their squared norms.
+    # A query is then one matrix-vector product and a partial sort, with no pandas scan.
+
+    def __init__(self, df, player_col, season_col, team_col, stats):
+        self.stats = list(stats)
+        self.player_col, self.season_col, self.team_col = player_col, season_col, team_col
+
+        values = df[self.stats].to_numpy(dtype='float64')
+        season_codes, season_labels = pd.factorize(df[season_col])
+        self._season_codes = season_codes
+        self._season_labels = np.asarray(season_labels.astype(str))
+        per_season = pd.DataFrame(values).groupby(season_codes)
+        means = per_season.mean().to_numpy()[season_codes]
+        stds = per_season.std(ddof=0).to_numpy()[season_codes]
+        # A stat that is constant within a season (or missing) sits at the league average
+        with np.errstate(invalid='ignore', divide='ignore'):
+            scores = np.where(stds > 0, (values - means) / stds, 0.0)
+        self.matrix = np.ascontiguousarray(np.nan_to_num(scores), dtype=np.float32)
+        self._norms = np.einsum('ij,ij->i', self.matrix, self.matrix)
+
+        # Labels and raw values of every row, returned with the matches
+        self.rows = df[[player_col, season_col, team_col] + self.stats].reset_index(drop=True)
+
+        # Player -> row positions, as slices of one sorted array
+        player_codes, players = pd.factorize(df[player_col])
+        self._order = np.argsort(player_codes, kind='stable')
+        self._bounds = np.searchsorted(player_codes[self._order], np.arange(len(players) + 1))
+        self._player_pos = {player: i for i, player in enumerate(players.tolist())}
+
+    def __len__(self):
+        return len(self.matrix)
+
+    def player_rows(self, player):
+        pos = self._player_pos.get(player)
+        if pos is None:
+            return np.empty(0, dtype=np.intp)
+        return self._order[self._bounds[pos]:self._bounds[pos + 1]]
+
+    def _season_of(self, rows):
+        return self._season_labels[self._season_codes[rows]]
+
+    def seasons(self, player):
+        # The player's seasons, newest first
+        rows = self.player_rows(player)
+        labels = self.rows[self.season_col].iloc[rows].unique().tolist()
+        return sorted(labels, key=str, reverse=True)
+
+    def query(self, player, season=None, k=10, include_self=False):
+        # The k player seasons closest to `player` in `season` (their latest season by default),
+        # nearest first. The player's own other seasons are skipped unless include_self.
+        rows = self.player_rows(player)
+        if season is not None:
+            rows = rows[self._season_of(rows) == str(season)]
+        if not rows.size:
+            return self.rows.iloc[:0].assign(distance=np.float32())
+        if season is None:
+            labels = self._season_of(rows)
+            rows = rows[labels == max(labels)]
+        row = rows[0]
+
+        # Squared euclidean distance to every row: |a|^2 - 2ab + |b|^2, in one float32 buffer
+        distances = self.matrix @ self.matrix[row]
+        distances *= -2
+        distances += self._norms
+        distances += self._norms[row]
+        if include_self:
+            distances[row] = np.inf
+        else:
+            distances[self.player_rows(player)] = np.inf
+        k = min(k, int(np.isfinite(distances).sum()))
+        if k <= 0:
+            return self.rows.iloc[:0].assign(distance=np.float32())
+        best = np.argpartition(distances, k - 1)[:k]
+        best = best[np.argsort(distances[best], kind='stable')]
+        matches = self.rows.iloc[best].reset_index(drop=True)
+        matches.insert(3, 'distance', np.sqrt(np.maximum(distances[best], 0)))
+        return matches
+
+
+def load(league, stats=None):
+    # The league's index over the dashboard columns, built once per dataset version
+    adapter = get_adapter(league)
+    stats = stats or adapter.stats_options
+    return datasets.get_derived(
+        league, ('similarity', tuple(stats)),
+        lambda df: SimilarityIndex(df, adapter.player_col, adapter.season_col, adapter.team_col, stats),
+        adapter.page_columns,
+    )
+
+
+def similar_players(league, player, season=None, k=10):
+    # e.g. similar_players('nba', 'LeBron James', '2022-23') -> the 10 closest player seasons
+    return load(league).query(player, season=season, k=k)
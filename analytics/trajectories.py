@@ -0,0 +1,278 @@
+#trajectories.py
+import threading
+
+import numpy as np
+import pandas as pd
+
+from data import datasets, store
+from data.leagues import get_adapter
+from data.schema import season_year
+
+# Career trajectories of every player. Rows are kept sorted by (player id, season), so each
+# player's seasons are contiguous and a history is a slice between two offsets. Rolling means,
+# changes from the previous season, career peaks and the league's aging curve are computed
+# for every stat in one vectorized pass; when seasons are rewritten only the players with
+# rows in them are recomputed and spliced back in.
+#
+# The data has no birth dates, so age is the season of a player's career (1 = their first
+# season in the data), and the aging curve is the mean change of each stat from one career
+# season to the next over every player who played both (the "delta method").
+
+# Seasons in the rolling mean, the current one included
+WINDOW = 3
+
+# Engines of the published data, per process: {league: (version, {season: partition version} or None, engine)}
+_loaded = {}
+_lock = threading.Lock()
+
+ROW_FIELDS = ('id', 'year', 'season', 'player', 'team', 'values', 'rolling', 'delta', 'experience')
+
+
+def _encode(values, labels):
+    # Codes of values into labels (an object array), and labels extended with the values it
+    # didn't hold yet; codes already handed out stay valid
+    codes, uniques = pd.factorize(values)
+    uniques = np.asarray(uniques, dtype=object)
+    positions = pd.Index(labels).get_indexer(uniques) if len(labels) else np.full(len(uniques), -1)
+    missing = positions < 0
+    positions[missing] = len(labels) + np.arange(missing.sum())
+    return positions[codes].astype(np.int32), np.concatenate([labels, uniques[missing]])
+
+
+def _metrics(ids, values, window):
+    # Rolling means, changes from the previous season and the career season of every row, and
+    # the in-career position of each player's peak per stat, for rows sorted by (id, year)
+    n = len(ids)
+    positions = np.arange(n)
+    first = np.ones(n, dtype=bool)
+    first[1:] = ids[1:] != ids[:-1]
+    starts = np.flatnonzero(first)
+    start_of_row = np.maximum.accumulate(np.where(first, positions, 0)) if n else positions
+    experience = (positions - start_of_row + 1).astype(np.int32)
+
+    # Windowed sums from cumulative sums; missing values don't count towards the mean
+    present = ~np.isnan(values)
+    zeros = np.zeros((1, values.shape[1]))
+    sums = np.concatenate([zeros, np.cumsum(np.where(present, values, 0.0), axis=0)])
+    counts = np.concatenate([zeros, np.cumsum(present, axis=0)])
+    low = np.maximum(start_of_row, positions - window + 1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rolling = (sums[positions + 1] - sums[low]) / (counts[positions + 1] - counts[low])
+
+    delta = np.full_like(values, np.nan)
+    delta[1:] = values[1:] - values[:-1]
+    delta[first] = np.nan
+
+    # First row holding each player's maximum (a stat never recorded points at the first season)
+    if n:
+        filled = np.where(present, values, -np.inf)
+        best = np.maximum.reduceat(filled, starts, axis=0)
+        player_of_row = np.cumsum(first) - 1
+        candidates = np.where(filled == best[player_of_row], positions[:, None], n)
+        peak = (np.minimum.reduceat(candidates, starts, axis=0) - starts[:, None]).astype(np.int32)
+    else:
+        peak = np.empty((0, values.shape[1]), dtype=np.int32)
+    return rolling, delta, experience, ids[starts], peak
+
+
+def _curve_sums(delta, experience, size):
+    # Per career season: sum and count of the changes into it, for every stat
+    valid = ~np.isnan(delta)
+    sums = np.zeros((size, delta.shape[1]))
+    counts = np.zeros((size, delta.shape[1]))
+    for j in range(delta.shape[1]):
+        sums[:, j] = np.bincount(experience, weights=np.where(valid[:, j], delta[:, j], 0.0), minlength=size)[:size]
+        counts[:, j] = np.bincount(experience, weights=valid[:, j], minlength=size)[:size]
+    return sums, counts
+
+
+class TrajectoryEngine:
+    # Row arrays sorted by (player id, year) with per-player offsets, and the aging curve as
+    # per-career-season sums and counts so it can be updated without a rescan. Seasons,
+    # player names and teams are stored as int32 codes into label arrays.
+
+    def __init__(self, df, id_col, player_col, season_col, team_col, stats, window=WINDOW):
+        self.stats = list(stats)
+        self._stat_pos = {stat: i for i, stat in enumerate(self.stats)}
+        self.id_col, self.player_col, self.season_col, self.team_col = id_col, player_col, season_col, team_col
+        self.window = window
+        raw, self._labels = self._raw(df, {})
+        self._set(self._computed(raw), None, None)
+
+    def _raw(self, df, labels):
+        # Plain arrays of a frame's rows sorted by (id, year), and the label arrays extended
+        # with its seasons, names and teams
+        ids = df[self.id_col].to_numpy()
+        if ids.dtype == object:
+            ids = ids.astype(str)
+        raw, labels = {'id': ids}, dict(labels)
+        for field, col in (('season', self.season_col), ('player', self.player_col), ('team', self.team_col)):
+            raw[field], labels[field] = _encode(df[col].astype(str), labels.get(field, np.empty(0, dtype=object)))
+        raw['year'] = season_year(labels['season'])[raw['season']] if len(ids) else np.empty(0, dtype=int)
+        raw['values'] = df[self.stats].to_numpy(dtype='float64')
+        order = np.lexsort((raw['year'], ids))
+        return {field: value[order] for field, value in raw.items()}, labels
+
+    def _computed(self, raw):
+        values = raw['values'].astype('float64')
+        rolling, delta, experience, player_ids, peak = _metrics(raw['id'], values, self.window)
+        rows = dict(raw, values=values.astype(np.float32), rolling=rolling.astype(np.float32),
+                    delta=delta.astype(np.float32), experience=experience)
+        return rows, player_ids, peak
+
+    def _set(self, computed, curve_sums, curve_counts):
+        rows, self._player_ids, self._peak = computed
+        self._rows = rows
+        first = np.ones(len(rows['id']), dtype=bool)
+        first[1:] = rows['id'][1:] != rows['id'][:-1]
+        self._offsets = np.append(np.flatnonzero(first), len(rows['id']))
+        if curve_sums is None:
+            size = int(rows['experience'].max()) + 1 if len(rows['experience']) else 1
+            curve_sums, curve_counts = _curve_sums(rows['delta'].astype('float64'), rows['experience'], size)
+        self._curve_sums, self._curve_counts = curve_sums, curve_counts
+
+        # Display name -> player; a name shared by several ids goes to the one who played last
+        last = self._offsets[1:] - 1
+        order = np.argsort(rows['year'][last], kind='stable')
+        self._by_name = dict(zip(self._labels['player'][rows['player'][last][order]].tolist(), order.tolist()))
+
+    def __len__(self):
+        return len(self._rows['id'])
+
+    def updated(self, df, seasons):
+        # A new engine with every row of `seasons` replaced by df's rows (e.g. a refetched or
+        # new season). Only players with rows in those seasons, before or after, are
+        # recomputed; the rest keep their arrays. This engine is left untouched.
+        rows = self._rows
+        new, labels = self._raw(df, self._labels)
+        season_codes = pd.Index(labels['season']).get_indexer([str(season) for season in seasons])
+        replaced = np.isin(rows['season'], season_codes[season_codes >= 0])
+        affected_ids = np.union1d(rows['id'][replaced], new['id'])
+        affected = np.isin(rows['id'], affected_ids)
+
+        kept = affected & ~replaced
+        merged = {field: np.concatenate([rows[field][kept], new[field]]) for field in ('id', 'year', 'season', 'player', 'team')}
+        merged['values'] = np.concatenate([rows['values'][kept].astype('float64'), new['values']])
+        order = np.lexsort((merged['year'], merged['id']))
+        redone, redone_ids, redone_peak = self._computed({field: value[order] for field, value in merged.items()})
+
+        # Changes of the affected players leave the aging curve and come back recomputed
+        size = max(len(self._curve_sums), int(redone['experience'].max(initial=0)) + 1)
+        curve_sums = np.zeros((size, len(self.stats)))
+        curve_counts = np.zeros((size, len(self.stats)))
+        curve_sums[:len(self._curve_sums)] = self._curve_sums
+        curve_counts[:len(self._curve_counts)] = self._curve_counts
+        old_sums, old_counts = _curve_sums(rows['delta'][affected].astype('float64'), rows['experience'][affected], size)
+        new_sums, new_counts = _curve_sums(redone['delta'].astype('float64'), redone['experience'], size)
+        curve_sums += new_sums - old_sums
+        curve_counts += new_counts - old_counts
+        used = np.flatnonzero(curve_counts.any(axis=1))
+        size = max(int(used[-1]) + 1 if len(used) else 1, int(redone['experience'].max(initial=0)) + 1,
+                   int(rows['experience'][~affected].max(initial=0)) + 1)
+
+        # Both blocks are sorted by id, so the stable sort of their concatenation is a merge
+        unchanged = ~affected
+        row_order = np.argsort(np.concatenate([rows['id'][unchanged], redone['id']]), kind='stable')
+        combined = {field: np.concatenate([rows[field][unchanged], redone[field]])[row_order] for field in ROW_FIELDS}
+        unchanged_players = ~np.isin(self._player_ids, affected_ids)
+        player_ids = np.concatenate([self._player_ids[unchanged_players], redone_ids])
+        player_order = np.argsort(player_ids, kind='stable')
+        peak = np.concatenate([self._peak[unchanged_players], redone_peak])[player_order]
+
+        engine = object.__new__(TrajectoryEngine)
+        engine.__dict__.update({name: value for name, value in self.__dict__.items()
+                                if name in ('stats', '_stat_pos', 'id_col', 'player_col', 'season_col', 'team_col', 'window')})
+        engine._labels = labels
+        engine._set((combined, player_ids[player_order], peak), curve_sums[:size], curve_counts[:size])
+        return engine
+
+    def _slice(self, player):
+        pos = self._by_name.get(player)
+        if pos is None:
+            return None, slice(0, 0)
+        return pos, slice(self._offsets[pos], self._offsets[pos + 1])
+
+    def _label(self, field, rows):
+        return self._labels[field][self._rows[field][rows]]
+
+    def players(self):
+        return sorted(self._by_name)
+
+    def history(self, player, stats=None):
+        # The player's seasons, oldest first: season, team and the stats
+        _, rows = self._slice(player)
+        stats = list(stats or self.stats)
+        frame = pd.DataFrame({self.season_col: self._label('season', rows), self.team_col: self._label('team', rows)})
+        for stat in stats:
+            frame[stat] = self._rows['values'][rows, self._stat_pos[stat]]
+        return frame
+
+    def aging_curve(self, stats=None):
+        # Mean change of each stat into every career season, and how many players it's over
+        stats = list(stats or self.stats)
+        cols = [self._stat_pos[stat] for stat in stats]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = self._curve_sums[:, cols] / self._curve_counts[:, cols]
+        frame = pd.DataFrame(means[2:], columns=stats)
+        frame.insert(0, 'players', self._curve_counts[2:, cols[0]].astype(int) if cols else 0)
+        frame.insert(0, 'career_season', np.arange(2, len(means)))
+        return frame
+
+    def trajectory(self, player, stat):
+        # One stat over the player's career: value, rolling mean, change from the previous season
+        # and that change against the league's aging curve for the same career season
+        _, rows = self._slice(player)
+        j = self._stat_pos[stat]
+        experience = self._rows['experience'][rows]
+        delta = self._rows['delta'][rows, j]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            expected = self._curve_sums[experience, j] / self._curve_counts[experience, j]
+        return pd.DataFrame({
+            self.season_col: self._label('season', rows), self.team_col: self._label('team', rows),
+            'career_season': experience, stat: self._rows['values'][rows, j],
+            f"rolling_{self.window}": self._rows['rolling'][rows, j], 'change': delta,
+            'vs_aging_curve': delta - expected,
+        })
+
+    def peak(self, player, stat):
+        # (season, value) of the player's best season in stat, or None
+        pos, rows = self._slice(player)
+        if pos is None:
+            return None
+        row = rows.start + self._peak[pos, self._stat_pos[stat]]
+        return self._labels['season'][self._rows['season'][row]], float(self._rows['values'][row, self._stat_pos[stat]])
+
+
+def _build(league, df):
+    adapter = get_adapter(league)
+    return TrajectoryEngine(df, adapter.key_columns['player_id'], adapter.player_col, adapter.season_col,
+                            adapter.team_col, adapter.stats_options)
+
+
+def load(league):
+    # The league's engine for the published dataset version. With the columnar store, a new
+    # version whose seasons only changed or were added updates the previous engine with the
+    # changed partitions; otherwise the engine is built from the whole dataset.
+    adapter = get_adapter(league)
+    root = store.current_root()
+    version = store.dataset_version(league, root)
+    with _lock:
+        entry = _loaded.get(league)
+        if entry is not None and entry[0] == version:
+            return entry[2]
+
+    if not store.has_store(league, root):
+        parts = None
+        engine = datasets.get_derived(league, ('trajectories',), lambda df: _build(league, df), adapter.page_columns)
+    else:
+        parts = {season: store.partition_version(league, season, root) for season in store.list_seasons(league, root)}
+        if entry is not None and entry[1] is not None and set(entry[1]) <= set(parts):
+            changed = [season for season in parts if entry[1].get(season) != parts[season]]
+            columns = list(dict.fromkeys([adapter.key_columns['player_id'], adapter.player_col, adapter.season_col,
+                                          adapter.team_col] + adapter.stats_options))
+            engine = entry[2].updated(store.read_league(league, columns=columns, seasons=changed, store_dir=root), changed)
+        else:
+            engine = _build(league, datasets.get_dataset(league, adapter.page_columns))
+    with _lock:
+        _loaded[league] = (version, parts, engine)
+    return engine
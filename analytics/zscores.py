@@ -0,0 +1,211 @@
+#zscores.py
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from data import datasets, store
+from data.leagues import get_adapter, leagues
+from data.schema import SCHEMAS
+
+# Season-relative z-scores and percentiles of every player season, so players from
+# different leagues can be put on one scale. Seasons are scored independently of each
+# other, so a new or refetched season only scores itself and history is never rebuilt.
+#
+# Layout: store/<league>/scores/season=<value>.npz holds one season's arrays
+# (player, team: str; z: float32 and pct: uint8, rows x stats), and
+# store/<league>/scores/_index.json the partition fingerprint and stats each one was built from.
+
+# Tables assembled from the season files, per process: {league: (version, LeagueScores)}
+_loaded = {}
+_lock = threading.Lock()
+
+
+def scores_dir(league, store_dir=None):
+    return os.path.join(store.league_dir(league, store_dir), 'scores')
+
+
+def score_path(league, season, store_dir=None):
+    return os.path.join(scores_dir(league, store_dir), f"season={season}.npz")
+
+
+def read_index(league, store_dir=None):
+    path = os.path.join(scores_dir(league, store_dir), '_index.json')
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_index(league, index, store_dir=None):
+    path = os.path.join(scores_dir(league, store_dir), '_index.json')
+    store.write_atomic(path, lambda f: json.dump(index, f, indent=2))
+
+
+def score_season(league, part, stats=None):
+    # z-scores and percentile ranks of one season's rows against that season only
+    adapter = get_adapter(league)
+    stats = list(stats or adapter.stats_options)
+    values = part[stats].to_numpy(dtype='float64')
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = np.nanmean(values, axis=0) if len(values) else np.zeros(len(stats))
+        stds = np.nanstd(values, axis=0) if len(values) else np.zeros(len(stats))
+        z = np.where(stds > 0, (values - means) / stds, 0.0)
+    # Missing values score as the league average / median
+    pct = part[stats].rank(pct=True).to_numpy(dtype='float64') * 100
+    return {
+        'player': part[adapter.player_col].astype(str).to_numpy(dtype=str),
+        'team': part[adapter.team_col].astype(str).to_numpy(dtype=str),
+        'z': np.nan_to_num(z).astype(np.float32),
+        'pct': np.nan_to_num(np.round(pct), nan=50).astype(np.uint8),
+    }
+
+
+def _source(league, season, stats, store_dir):
+    # What a season's scores were built from: its partition file and the stat list.
+    # Player and team names come from the dimension tables and aren't part of it.
+    return {'partition': store.partition_version(league, season, store_dir), 'stats': list(stats)}
+
+
+def _read_season(league, season, stats, store_dir):
+    columns = list(dict.fromkeys([get_adapter(league).player_col, get_adapter(league).team_col] + list(stats)))
+    return store.read_league(league, columns=columns, seasons=[season], store_dir=store_dir)
+
+
+def update(league, store_dir=None):
+    # Score the seasons whose partition changed since the last run; returns the seasons scored
+    store_dir = store_dir or store.current_root()
+    if not store.has_store(league, store_dir):
+        return []
+    stats = get_adapter(league).stats_options
+    index = read_index(league, store_dir)
+    seasons = store.list_seasons(league, store_dir)
+    os.makedirs(scores_dir(league, store_dir), exist_ok=True)
+
+    scored = []
+    for season in seasons:
+        source = _source(league, season, stats, store_dir)
+        if index.get(season) == source and os.path.exists(score_path(league, season, store_dir)):
+            continue
+        arrays = score_season(league, _read_season(league, season, stats, store_dir), stats)
+        store.write_atomic(score_path(league, season, store_dir), lambda f: np.savez(f, **arrays), 'wb')
+        index[season] = source
+        scored.append(season)
+
+    # Seasons that are gone from the store
+    for season in [season for season in index if season not in seasons]:
+        del index[season]
+        if os.path.exists(score_path(league, season, store_dir)):
+            os.remove(score_path(league, season, store_dir))
+    write_index(league, index, store_dir)
+    return scored
+
+
+class LeagueScores:
+    # Every season's scores of one league, concatenated, with player -> rows lookups
+
+    def __init__(self, league, stats, seasons):
+        # seasons: [(season label, arrays from score_season), ...]
+        self.league = league
+        self.stats = list(stats)
+        seasons = [(season, arrays) for season, arrays in seasons if len(arrays['player'])]
+        self.players = np.concatenate([arrays['player'] for _, arrays in seasons]) if seasons else np.empty(0, dtype=str)
+        self.teams = np.concatenate([arrays['team'] for _, arrays in seasons]) if seasons else np.empty(0, dtype=str)
+        self.seasons = np.concatenate([np.full(len(arrays['player']), str(season)) for season, arrays in seasons]) if seasons else np.empty(0, dtype=str)
+        self.z = np.concatenate([arrays['z'] for _, arrays in seasons]) if seasons else np.empty((0, len(self.stats)), dtype=np.float32)
+        self.pct = np.concatenate([arrays['pct'] for _, arrays in seasons]) if seasons else np.empty((0, len(self.stats)), dtype=np.uint8)
+        # One number per player season for cross-league rankings
+        self.overall = self.z.mean(axis=1) if self.stats else np.zeros(len(self.players), dtype=np.float32)
+
+        codes, players = pd.factorize(self.players)
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(players) + 1))
+        self._player_rows = {player: order[bounds[i]:bounds[i + 1]] for i, player in enumerate(players.tolist())}
+
+    def __len__(self):
+        return len(self.players)
+
+    def player_options(self):
+        return sorted(self._player_rows)
+
+    def seasons_of(self, player):
+        # The player's seasons, newest first
+        return sorted(set(self.seasons[self._player_rows.get(player, [])].tolist()), reverse=True)
+
+    def lookup(self, player, season=None):
+        # Row of the player's season (their latest by default), or None
+        rows = self._player_rows.get(player)
+        if rows is None or not len(rows):
+            return None
+        if season is not None:
+            rows = rows[self.seasons[rows] == str(season)]
+            if not len(rows):
+                return None
+        return rows[np.argmax(self.seasons[rows])] if season is None else rows[0]
+
+    def player_frame(self, player, season=None):
+        # One row per stat: z-score and percentile of the player's season
+        row = self.lookup(player, season)
+        if row is None:
+            return pd.DataFrame(columns=['stat', 'z', 'percentile'])
+        return pd.DataFrame({'stat': self.stats, 'z': self.z[row], 'percentile': self.pct[row]})
+
+    def top(self, n=10):
+        # The n player seasons with the highest mean z-score
+        best = np.argsort(-self.overall, kind='stable')[:n]
+        return pd.DataFrame({
+            'league': self.league.upper(), 'player': self.players[best], 'season': self.seasons[best],
+            'team': self.teams[best], 'mean_z': self.overall[best],
+            'mean_percentile': self.pct[best].mean(axis=1) if self.stats else 0.0,
+        })
+
+
+def _from_dataset(league, df, stats):
+    season_col = get_adapter(league).season_col
+    return LeagueScores(league, stats, [(season, score_season(league, part, stats))
+                                        for season, part in df.groupby(season_col, observed=True, sort=True)])
+
+
+def load(league, store_dir=None):
+    # The league's scores for the current dataset version. Seasons with up-to-date files are read
+    # from disk; any other season is scored in memory. Without a columnar store the whole CSV
+    # dataset is scored once per version.
+    store_dir = store_dir or store.current_root()
+    version = store.dataset_version(league, store_dir)
+    with _lock:
+        entry = _loaded.get(league)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+
+    adapter = get_adapter(league)
+    stats = adapter.stats_options
+    if store.has_store(league, store_dir):
+        index = read_index(league, store_dir)
+        seasons = []
+        for season in sorted(store.list_seasons(league, store_dir)):
+            path = score_path(league, season, store_dir)
+            if index.get(season) == _source(league, season, stats, store_dir) and os.path.exists(path):
+                with np.load(path) as arrays:
+                    seasons.append((season, {name: arrays[name] for name in arrays.files}))
+            else:
+                seasons.append((season, score_season(league, _read_season(league, season, stats, store_dir), stats)))
+        scores = LeagueScores(league, stats, seasons)
+    else:
+        scores = datasets.get_derived(league, ('zscores', tuple(stats)),
+                                      lambda df: _from_dataset(league, df, stats), adapter.page_columns)
+    with _lock:
+        _loaded[league] = (version, scores)
+    return scores
+
+
+def scored_leagues():
+    # Leagues with a radar stat list and some data (the MLB pitching and fielding groups have none)
+    return [league for league in leagues() if league in SCHEMAS and get_adapter(league).stats_options
+            and (store.has_store(league) or os.path.exists(store.CSV_PATHS[league]))]
+
+
+if __name__ == "__main__":
+    for league in scored_leagues():
+        print(f"{league}: scored seasons {update(league)}")
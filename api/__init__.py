@@ -0,0 +1 @@
+# api package: local JSON query service over the league datasets
@@ -0,0 +1,132 @@
+#queries.py
+import os
+
+import pandas as pd
+
+from analytics import aggregates
+from analytics.comparison import ComparisonEngine
+from data import datasets, store
+from data.leagues import get_adapter, leagues
+from data.schema import SCHEMAS
+
+# The dashboard's filtered and aggregated views as plain functions of (league, parameters),
+# answered from the same process-wide datasets, filter indexes and aggregate tables as the
+# pages. Every query returns a DataFrame whose attrs['version'] is the dataset version it was
+# answered from. Bad parameters raise QueryError, unknown leagues, seasons, teams and players
+# raise NotFound.
+
+DEFAULT_N = 10
+# Deeper lists than the materialized leaderboards would be a full scan per request
+MAX_N = aggregates.LEADERBOARD_SIZE
+
+
+class QueryError(ValueError):
+    pass
+
+
+class NotFound(LookupError):
+    pass
+
+
+def served_leagues():
+    # Leagues with a dashboard page layout and some data
+    return [league for league in leagues() if league in SCHEMAS and get_adapter(league).bar_chart
+            and (store.has_store(league) or os.path.exists(store.CSV_PATHS[league]))]
+
+
+def _adapter(league):
+    if league not in served_leagues():
+        raise NotFound(f"Unknown league: {league}")
+    return get_adapter(league)
+
+
+def _dataset(league):
+    adapter = _adapter(league)
+    return adapter, datasets.get_dataset(league, adapter.page_columns), datasets.get_index(league, adapter.page_columns)
+
+
+def _value(index, name, value):
+    # Query strings are text; map one back to the index's value (e.g. '2022' -> 2022 for MLB seasons)
+    if value is None or value == 'All':
+        return None
+    values = {str(option): option for option in index.options(name)}
+    if str(value) not in values:
+        raise NotFound(f"Unknown {name}: {value}")
+    return values[str(value)]
+
+
+def _stats(adapter, stats, default, allowed=None):
+    stats = list(dict.fromkeys(stats or default))
+    keys = {adapter.player_col, adapter.team_col, adapter.season_col, *adapter.key_columns.values()}
+    allowed = allowed or [col for col in adapter.page_columns if col not in keys]
+    unknown = [stat for stat in stats if stat not in allowed]
+    if unknown:
+        raise QueryError(f"Unknown stats: {', '.join(unknown)}")
+    return stats
+
+
+def _columns(adapter, columns):
+    columns = list(dict.fromkeys(columns or adapter.table_columns))
+    unknown = [col for col in columns if col not in adapter.page_columns]
+    if unknown:
+        raise QueryError(f"Unknown columns: {', '.join(unknown)}")
+    return columns
+
+
+def leaders(league, stats=None, n=DEFAULT_N, season=None):
+    # Top n player seasons by stats[0] (the league's bar chart stats by default)
+    adapter, df, index = _dataset(league)
+    stats = _stats(adapter, stats, adapter.bar_chart[0])
+    if not 1 <= n <= MAX_N:
+        raise QueryError(f"n must be between 1 and {MAX_N}")
+    season = _value(index, 'season', season)
+    rows = aggregates.leaders(league, stats, n, season=season)
+    if rows is None:
+        # A stat without a materialized leaderboard
+        rows = index.subset(df, season=season).nlargest(n, stats[0])
+        rows = rows[[adapter.player_col, adapter.team_col, adapter.season_col] + stats]
+    return rows
+
+
+def team_totals(league, stats=None, season=None):
+    # Per-team sums of stats for one season or all of them, largest first
+    adapter = _adapter(league)
+    index = datasets.get_index(league, adapter.page_columns)
+    stats = _stats(adapter, stats, adapter.bar_chart[0])
+    return aggregates.team_totals(league, stats, season=_value(index, 'season', season))
+
+
+def team_rows(league, team, season=None, columns=None):
+    # The team's player seasons (of one season or all of them)
+    adapter, df, index = _dataset(league)
+    rows = index.subset(df, team=_value(index, 'team', team), season=_value(index, 'season', season))
+    return rows[_columns(adapter, columns)]
+
+
+def player_history(league, player, columns=None):
+    # Every season of one player, oldest first
+    adapter, df, index = _dataset(league)
+    rows = index.subset(df, player=_value(index, 'player', player))
+    columns = _columns(adapter, columns)
+    order = rows[adapter.season_col].astype(str).to_numpy().argsort(kind='stable')
+    return rows.iloc[order][columns]
+
+
+def comparison(league, players, stats=None):
+    # Season-normalized stat means of each player, as on the radar chart (unknown players are dropped)
+    adapter = _adapter(league)
+    stats = _stats(adapter, stats, adapter.stats_options[:4], allowed=adapter.stats_options)
+    if not players:
+        raise QueryError("No players given")
+    engine = datasets.get_derived(
+        league, ('comparison', tuple(adapter.stats_options)),
+        lambda df: ComparisonEngine(df, adapter.player_col, adapter.season_col, adapter.stats_options),
+        adapter.page_columns,
+    )
+    names, values = engine.series(players, stats)
+    if not names:
+        raise NotFound(f"Unknown players: {', '.join(players)}")
+    frame = pd.DataFrame(values, columns=stats)
+    frame.insert(0, 'player', names)
+    frame.attrs['version'] = engine.version
+    return frame
@@ -0,0 +1,243 @@
+#server.py
+import contextlib
+import gzip
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    import orjson
+except ImportError:  # the stdlib encoder is slower but produces the same documents
+    orjson = None
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import Response
+from starlette.routing import Route
+
+from api import queries
+from data import store
+
+# Local JSON API over the league datasets for tools that need the dashboard's views without
+# its UI. Responses are encoded once (plus a gzip copy) and kept in an LRU keyed by the
+# normalized query and the dataset version, so a repeated query is a dict lookup and a
+# refresh (a new version) retires every cached answer of that league at once.
+#
+#   GET /health
+#   GET /stats                                      cache counters
+#   GET /{league}/leaders?stats=PTS,GP&n=10&season=2022-23
+#   GET /{league}/team-totals?stats=homeRuns,rbi&season=2022
+#   GET /{league}/teams/{team}?season=2022&columns=playerFullName,homeRuns
+#   GET /{league}/players/{player}?columns=Season,PTS
+#   GET /{league}/compare?players=A,B&stats=PTS,AST
+#
+# List parameters are comma-separated. Errors are {"error": message} with status 400 or 404.
+
+HOST = '127.0.0.1'
+PORT = 8000
+# Encoded responses kept per process; whichever limit is hit first evicts the oldest entries
+MAX_RESPONSES = 4096
+MAX_BYTES = 64 * 1024 * 1024
+# Bodies smaller than this are sent uncompressed
+GZIP_MIN_BYTES = 1024
+# Seconds a league's dataset version (and the list of served leagues) is trusted before the
+# files are checked again; checking on every request would cost more than serving a hit
+VERSION_TTL = 1.0
+
+
+class ResponseCache:
+    # Bounded LRU of encoded responses: key -> (body, gzipped body or None)
+
+    def __init__(self, max_items=MAX_RESPONSES, max_bytes=MAX_BYTES):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.num_bytes = 0
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            self._items.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry
+
+    def put(self, key, entry):
+        size = len(entry[0]) + len(entry[1] or b'')
+        with self._lock:
+            if key in self._items:
+                return
+            self._items[key] = entry
+            self.num_bytes += size
+            while self._items and (len(self._items) > self.max_items or self.num_bytes > self.max_bytes):
+                _, (body, gzipped) = self._items.popitem(last=False)
+                self.num_bytes -= len(body) + len(gzipped or b'')
+                self.stats['evictions'] += 1
+
+    def __len__(self):
+        return len(self._items)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.num_bytes = 0
+
+
+cache = ResponseCache()
+# {league: (checked at, version)} and (checked at, served leagues)
+_versions = {}
+_served = (None, [])
+
+
+def served_leagues():
+    global _served
+    now = time.monotonic()
+    if _served[0] is None or now - _served[0] > VERSION_TTL:
+        _served = (now, queries.served_leagues())
+    return _served[1]
+
+
+def dataset_version(league):
+    now = time.monotonic()
+    entry = _versions.get(league)
+    if entry is None or now - entry[0] > VERSION_TTL:
+        entry = (now, store.dataset_version(league))
+        _versions[league] = entry
+    return entry[1]
+
+
+def dumps(payload):
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(payload, separators=(',', ':')).encode()
+
+
+def encode(payload):
+    body = dumps(payload)
+    return body, gzip.compress(body, compresslevel=5) if len(body) >= GZIP_MIN_BYTES else None
+
+
+def frame_payload(league, version, frame):
+    # float32 stats are widened through their shortest text form (12.2, not 12.199999809265137),
+    # and missing values become null (the stdlib encoder would write NaN, which isn't JSON)
+    frame = frame.assign(**{col: frame[col].to_numpy().astype(str).astype('float64')
+                            for col in frame.columns if frame[col].dtype == 'float32'})
+    frame = frame.astype(object).where(frame.notna(), None)
+    return {'league': league, 'version': version, 'columns': [str(col) for col in frame.columns],
+            'rows': frame.to_dict('records')}
+
+
+def send(request, entry, status=200):
+    body, gzipped = entry
+    if gzipped is not None and 'gzip' in request.headers.get('accept-encoding', ''):
+        return Response(gzipped, status_code=status, media_type='application/json',
+                        headers={'content-encoding': 'gzip', 'vary': 'Accept-Encoding'})
+    return Response(body, status_code=status, media_type='application/json',
+                    headers={'vary': 'Accept-Encoding'} if gzipped is not None else None)
+
+
+def error(request, status, message):
+    return send(request, encode({'error': message}), status)
+
+
+def _list(value):
+    return [item.strip() for item in value.split(',') if item.strip()] if value else None
+
+
+def endpoint(query, params=(), path_params=()):
+    # Starlette handler for a queries function. params maps query-string names to their type
+    # ('list', 'int' or 'str') and default; only those are read, so unrelated parameters and
+    # explicit defaults don't split the cache.
+    params = dict(params)
+
+    async def handle(request):
+        league = request.path_params['league']
+        if league not in served_leagues():
+            return error(request, 404, f"Unknown league: {league}")
+        args = {name: request.path_params[name] for name in path_params}
+        for name, (kind, default) in params.items():
+            value = request.query_params.get(name)
+            if kind == 'list':
+                value = _list(value)
+            elif kind == 'int' and value is not None:
+                try:
+                    value = int(value)
+                except ValueError:
+                    return error(request, 400, f"{name} must be an integer")
+            args[name] = default if value in (None, '') else value
+
+        normalized = tuple((name, tuple(value) if isinstance(value, list) else value)
+                           for name, value in sorted(args.items()))
+        entry = cache.get((query.__name__, league, dataset_version(league), normalized))
+        if entry is None:
+            try:
+                # Misses run in the thread pool so a slow one (a first load) never blocks the hits
+                frame = await run_in_threadpool(query, league, **args)
+            except queries.NotFound as e:
+                return error(request, 404, str(e))
+            except queries.QueryError as e:
+                return error(request, 400, str(e))
+            # The version checked above can be up to VERSION_TTL old; the answer is filed and
+            # labelled under the version of the data the query actually read
+            version = frame.attrs.get('version') or dataset_version(league)
+            entry = encode(frame_payload(league, version, frame))
+            cache.put((query.__name__, league, version, normalized), entry)
+        return send(request, entry)
+
+    return handle
+
+
+async def health(request):
+    return send(request, encode({'status': 'ok', 'leagues': served_leagues()}))
+
+
+async def stats(request):
+    return send(request, encode({'responses': len(cache), 'bytes': cache.num_bytes, **cache.stats}))
+
+
+def warm():
+    # Load every served league's dataset and index before the first request
+    for league in served_leagues():
+        queries.leaders(league)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    await run_in_threadpool(warm)
+    yield
+
+
+app = Starlette(routes=[
+    Route('/health', health),
+    Route('/stats', stats),
+    Route('/{league}/leaders', endpoint(queries.leaders, {'stats': ('list', None), 'n': ('int', queries.DEFAULT_N),
+                                                          'season': ('str', None)})),
+    Route('/{league}/team-totals', endpoint(queries.team_totals, {'stats': ('list', None), 'season': ('str', None)})),
+    Route('/{league}/teams/{team}', endpoint(queries.team_rows, {'season': ('str', None), 'columns': ('list', None)},
+                                             path_params=['team'])),
+    Route('/{league}/players/{player}', endpoint(queries.player_history, {'columns': ('list', None)},
+                                                 path_params=['player'])),
+    Route('/{league}/compare', endpoint(queries.comparison, {'players': ('list', None), 'stats': ('list', None)})),
+], lifespan=lifespan)
+
+
+def option(name, default=None):
+    # Value of a --name value argument
+    if f"--{name}" in sys.argv[:-1]:
+        return sys.argv[sys.argv.index(f"--{name}") + 1]
+    return default
+
+
+if __name__ == "__main__":
+    # python -m api.server [--host 127.0.0.1] [--port 8000] [--workers N]
+    # Each worker process keeps its own datasets and response cache.
+    import uvicorn
+
+    uvicorn.run('api.server:app', host=option('host', HOST), port=int(option('port', PORT)),
+                workers=int(option('workers', 1)), log_level='warning', access_log=False)
@@ -0,0 +1,163 @@
+#api_load.py
+# Load test of the JSON API (api.server): keep-alive clients replay a mix of leaderboard,
+# team, player and comparison queries built from the served data, and report throughput,
+# latency percentiles and the server's cache counters. Starts a server on a free port unless
+# --url points at a running one.
+#
+#   python -m benchmarks.api_load                                  # 32 connections for 10 s
+#   python -m benchmarks.api_load --connections 64 --seconds 30
+#   python -m benchmarks.api_load --url http://127.0.0.1:8000 --gzip
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import quote, urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CONNECTIONS = 32
+SECONDS = 10
+# Players and teams per league the query mix is built from
+SAMPLE = 20
+
+
+def option(name, default=None):
+    # Value of a --name value argument
+    if f"--{name}" in sys.argv[:-1]:
+        return sys.argv[sys.argv.index(f"--{name}") + 1]
+    return default
+
+
+async def request(reader, writer, host, path, use_gzip):
+    # One GET on a keep-alive connection: (status, body bytes)
+    headers = f"GET {path} HTTP/1.1\r\nHost: {host}\r\n"
+    if use_gzip:
+        headers += "Accept-Encoding: gzip\r\n"
+    writer.write(f"{headers}\r\n".encode())
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode('latin-1').split("\r\n")
+    status = int(lines[0].split()[1])
+    length = 0
+    for line in lines[1:]:
+        name, _, value = line.partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+
+async def fetch_json(host, port, path):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        status, body = await request(reader, writer, host, path, False)
+        return json.loads(body) if status == 200 else None
+    finally:
+        writer.close()
+
+
+async def query_mix(host, port):
+    # URLs covering every endpoint, from the leagues' own leaders, teams and seasons
+    paths = []
+    for league in (await fetch_json(host, port, '/health'))['leagues']:
+        leaders = await fetch_json(host, port, f"/{league}/leaders?n=100")
+        columns = leaders['columns']
+        players = list(dict.fromkeys(row[columns[0]] for row in leaders['rows']))[:SAMPLE]
+        teams = list(dict.fromkeys(row[columns[1]] for row in leaders['rows']))[:SAMPLE]
+        seasons = list(dict.fromkeys(str(row[columns[2]]) for row in leaders['rows']))
+        for season in ['All'] + seasons:
+            paths.append(f"/{league}/leaders?season={quote(season)}&n=25")
+            paths.append(f"/{league}/team-totals?season={quote(season)}")
+        for team in teams:
+            paths.append(f"/{league}/teams/{quote(team)}?season={quote(seasons[0])}")
+        for player in players:
+            paths.append(f"/{league}/players/{quote(player)}")
+        for first, second in zip(players, players[1:]):
+            paths.append(f"/{league}/compare?players={quote(first)},{quote(second)}")
+    return paths
+
+
+async def client(host, port, paths, offset, deadline, use_gzip, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    i = offset
+    try:
+        while time.perf_counter() < deadline:
+            path = paths[i % len(paths)]
+            i += 1
+            started = time.perf_counter()
+            status, _ = await request(reader, writer, host, path, use_gzip)
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                errors.append((status, path))
+    finally:
+        writer.close()
+
+
+async def run(host, port, connections, seconds, use_gzip):
+    paths = await query_mix(host, port)
+    # One pass fills the server's cache; the measured run is then mostly hits, like steady traffic
+    reader, writer = await asyncio.open_connection(host, port)
+    for path in paths:
+        await request(reader, writer, host, path, use_gzip)
+    writer.close()
+
+    latencies, errors = [], []
+    started = time.perf_counter()
+    deadline = started + seconds
+    await asyncio.gather(*(client(host, port, paths, i * 7, deadline, use_gzip, latencies, errors)
+                           for i in range(connections)))
+    elapsed = time.perf_counter() - started
+    stats = await fetch_json(host, port, '/stats')
+
+    latencies.sort()
+    percentile = lambda p: latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000 if latencies else 0.0
+    print(f"{len(paths)} distinct queries, {connections} connections, {elapsed:.1f} s, gzip {'on' if use_gzip else 'off'}")
+    print(f"  {len(latencies) / elapsed:,.0f} requests/s, {len(errors)} errors")
+    print(f"  latency p50 {percentile(0.50):.2f} ms, p90 {percentile(0.90):.2f} ms, p99 {percentile(0.99):.2f} ms")
+    print(f"  server cache: {stats['hits']} hits, {stats['misses']} misses, {stats['responses']} responses")
+    for status, path in errors[:5]:
+        print(f"  {status} {path}")
+    return 1 if errors else 0
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port):
+    process = subprocess.Popen([sys.executable, '-m', 'api.server', '--port', str(port)], cwd=ROOT)
+    # Ready once the datasets are loaded and the port accepts connections
+    for _ in range(600):
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return process
+        except OSError:
+            if process.poll() is not None:
+                break
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("The API server did not start")
+
+
+if __name__ == "__main__":
+    connections = int(option('connections', CONNECTIONS))
+    seconds = float(option('seconds', SECONDS))
+    use_gzip = '--gzip' in sys.argv
+    server = None
+    if option('url'):
+        url = urlsplit(option('url'))
+        host, port = url.hostname, url.port or 80
+    else:
+        host, port = '127.0.0.1', free_port()
+        server = start_server(port)
+    try:
+        code = asyncio.run(run(host, port, connections, seconds, use_gzip))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    sys.exit(code)
@@ -0,0 +1,102 @@
+#check_adapters.py
+# Checks of the league adapters against recorded API responses (benchmarks/fixtures/): the
+# parsed columns and values, the follow-up pages each first page asks for, and (MLB) which
+# stored rows make up the player seasons. Exits non-zero when a check fails.
+#
+#   python -m benchmarks.check_adapters
+import json
+import os
+import sys
+import tempfile
+import traceback
+
+import pandas as pd
+
+from data import store
+from data.fetch_engine import FetchResult
+from data.leagues import get_adapter
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name)) as f:
+        return json.load(f)
+
+
+def check_nfl():
+    adapter = get_adapter('nfl')
+    payload = load_fixture('espn_nfl_byathlete.json')
+    task = adapter.build_tasks([2023], adapter.api_url, lambda season: None)[0]
+    result = FetchResult(task.key, 200, payload, None)
+    df = adapter.parse(result).set_index('displayName')
+
+    # Each category's values land under the stat names listed for that category
+    mahomes = df.loc['Patrick Mahomes']
+    assert mahomes['season'] == 2023 and mahomes['teamAbbrev'] == 'KC' and mahomes['position'] == 'QB'
+    assert (mahomes['completions'], mahomes['passingYards'], mahomes['interceptions']) == (401, 4183, 14)
+    assert (mahomes['rushingAttempts'], mahomes['rushingYards']) == (75, 389)
+    assert df.loc['Christian McCaffrey', 'receivingYards'] == 564
+    assert df.loc['T.J. Watt', 'sacks'] == 19.0
+    # gamesPlayed is listed under general (16) and passing (17): the first category wins
+    assert mahomes['gamesPlayed'] == 16
+    # Categories an athlete has no entry for stay empty
+    assert df['passingYards'].isna().sum() == 2
+
+    # pagination.pages says how many pages follow the first; count / limit when it's missing
+    assert [next_task.key for next_task in adapter.next_pages(task, result)] == [(2023, 2), (2023, 3)]
+    assert [next_task.params['page'] for next_task in adapter.next_pages(task, result)] == [2, 3]
+    no_pages = dict(payload, pagination={'count': 120, 'limit': 50, 'page': 1})
+    assert len(adapter.next_pages(task, FetchResult(task.key, 200, no_pages, None))) == 2
+    assert adapter.next_pages(task, FetchResult(task.key, 200, dict(payload, pagination={}), None)) == []
+
+    # A page past the last athlete parses to nothing
+    assert adapter.parse(FetchResult(task.key, 200, dict(payload, athletes=[]), None)) is None
+
+
+def check_mlb():
+    adapter = get_adapter('mlb')
+    payload = load_fixture('bdfed_mlb_hitting.json')
+    task = adapter.build_tasks([2022], adapter.api_url, lambda season: None)[0]
+    assert task.params['limit'] == adapter.page_size
+
+    # The recorded page served 3 of its 8 rows although more were asked for: 3 is the
+    # server's page size and the rest is requested in steps of it
+    result = FetchResult(task.key, 200, payload, None)
+    follow_ups = adapter.next_pages(task, result)
+    assert [next_task.key for next_task in follow_ups] == [(2022, 'R', 3), (2022, 'R', 6)]
+    assert {next_task.params['limit'] for next_task in follow_ups} == {3}
+    # A page holding every row has no follow-ups; a full page keeps the requested size
+    assert adapter.next_pages(task, FetchResult(task.key, 200, dict(payload, totalSize=3), None)) == []
+    small = adapter.with_options(page_size=3)
+    small_task = small.build_tasks([2022], small.api_url, lambda season: None)[0]
+    assert [next_task.params['offset'] for next_task in small.next_pages(small_task, result)] == [3, 6]
+
+    # Postseason rows repeat (playerId, year): they are stored, but the player seasons the
+    # pages, aggregates and scores read are the regular season's
+    regular = adapter.parse(result)
+    postseason = adapter.parse(FetchResult((2022, 'P', 0), 200, {'stats': payload['stats'][:1], 'totalSize': 1}, None))
+    assert list(regular['gameType'].unique()) == ['R'] and list(postseason['gameType'].unique()) == ['P']
+    with tempfile.TemporaryDirectory() as store_dir:
+        store.write_partitions('mlb', pd.concat([regular, postseason], ignore_index=True), store_dir=store_dir)
+        rows = store.read_league('mlb', columns=adapter.page_columns, store_dir=store_dir)
+        assert len(rows) == 3 and not rows.duplicated(['playerId', 'year']).any()
+        assert 'gameType' not in rows.columns
+        assert len(store.read_league('mlb', store_dir=store_dir, all_rows=True)) == 4
+    assert len(adapter.normalize(pd.concat([regular, postseason], ignore_index=True))) == 3
+
+
+CHECKS = [check_nfl, check_mlb]
+
+
+if __name__ == "__main__":
+    failed = 0
+    for check in CHECKS:
+        try:
+            check()
+            print(f"ok      {check.__name__}")
+        except AssertionError:
+            failed += 1
+            print(f"FAILED  {check.__name__}")
+            traceback.print_exc()
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,303 @@
+#hot_paths.py
+# Timings of the fetch, load, aggregate, filter, radar, similarity, trajectory and render hot paths on
+# synthetic datasets (benchmarks/synthetic.py) of several sizes, with the HTTP layer mocked.
+# Compares against hot_paths_baseline.json and exits non-zero when a case regresses past the threshold.
+#
+#   python -m benchmarks.hot_paths                        # 10k and 100k rows, check the baseline
+#   python -m benchmarks.hot_paths --rows 10000,1000000   # other sizes
+#   python -m benchmarks.hot_paths --only load,filter     # cases whose name starts with these
+#   python -m benchmarks.hot_paths --update               # record the current timings as the baseline
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The dashboard's components are imported the way its pages import them (Streamlit puts
+# dashboard/ on the path)
+sys.path.insert(0, os.path.join(ROOT, 'dashboard'))
+
+import pandas as pd
+
+from analytics import aggregates
+from analytics.comparison import ComparisonEngine
+from analytics.similarity import SimilarityIndex
+from analytics.trajectories import TrajectoryEngine
+from benchmarks import synthetic
+from components import aggregation
+from data import pipeline, store
+from data.indexes import FilterIndex
+from data.leagues import get_adapter
+from data.schema import SCHEMAS, apply_schema
+from db import db_queries, db_setup
+from visualizations import plots
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'hot_paths_baseline.json')
+
+DEFAULT_ROWS = [10_000, 100_000]
+REPEATS = 3
+# Allowed slowdown over the baseline before the check fails (timings are noisier than imports);
+# differences under MIN_REGRESSION_MS are ignored so sub-millisecond cases don't flap
+TOLERANCE = 0.5
+MIN_REGRESSION_MS = 1.0
+
+
+def prepare(rows, workdir):
+    # Everything the cases need for one dataset size, built outside the timed sections
+    ctx = {'rows': rows}
+    for league in ('mlb', 'nba'):
+        adapter = get_adapter(league)
+        raw = synthetic.make_dataset(league, rows)
+        store_dir = os.path.join(workdir, f"store_{rows}")
+        synthetic.write_dataset(league, raw, store_dir)
+        csv_path = os.path.join(workdir, f"{league}_{rows}.csv")
+        raw.to_csv(csv_path, index=False)
+        df = store.read_league(league, columns=adapter.page_columns, store_dir=store_dir)
+        ctx[league] = {
+            'adapter': adapter, 'raw': raw, 'store_dir': store_dir, 'csv_path': csv_path, 'df': df,
+            'index': FilterIndex(df, SCHEMAS[league]['index'], newest_first=SCHEMAS[league].get('newest_first', False)),
+            'full': store.read_league(league, store_dir=store_dir),
+        }
+        ctx[league]['aggregates'] = aggregates.build(league, ctx[league]['full'])
+    ctx['db_path'] = os.path.join(workdir, f"stats_{rows}.sqlite")
+    for league in ('mlb', 'nba'):
+        db_setup.load_league(league, ctx[league]['raw'], version=str(rows), path=ctx['db_path'])
+    ctx['session'] = synthetic.MockSession({'mlb': ctx['mlb']['raw'], 'nba': ctx['nba']['raw']})
+    return ctx
+
+
+def fetch(ctx, league):
+    # Mocked requests -> JSON decode -> frames -> typed dataset (no rate limit, no disk cache)
+    adapter = ctx[league]['adapter']
+    tasks = adapter.build_tasks(adapter.seasons(), f"http://mock/{league}", lambda season: None)
+    results = pipeline.fetch_pages(adapter, tasks, session=ctx['session'], limiter=None)
+    frames = [adapter.parse(result) for result in results if result.payload is not None]
+    return apply_schema(league, pd.concat([frame for frame in frames if frame is not None], ignore_index=True))
+
+
+def load_csv(ctx, league):
+    entry = ctx[league]
+    return apply_schema(league, pd.read_csv(entry['csv_path'], usecols=entry['adapter'].page_columns))
+
+
+def load_store(ctx, league):
+    entry = ctx[league]
+    return store.read_league(league, columns=entry['adapter'].page_columns, store_dir=entry['store_dir'])
+
+
+def filter_pandas(ctx, league):
+    # What a top N bar chart does per rerun without SQLite: filter by season and team, then limit
+    entry = ctx[league]
+    adapter, index = entry['adapter'], entry['index']
+    season, team = index.options('season')[0], index.options('team')[0]
+    stats = adapter.bar_chart[0]
+    for filters in ({}, {'season': season}, {'season': season, 'team': team}):
+        subset = index.subset(entry['df'], **filters)
+        aggregation.limit_for_chart(subset, 25, stats, adapter.player_col)
+
+
+def filter_sqlite(ctx, league, mode):
+    # The same charts queried in SQLite, as the pages do when it holds their dataset version
+    entry = ctx[league]
+    index = entry['index']
+    season, team = index.options('season')[0], index.options('team')[0]
+    stats = entry['adapter'].bar_chart[0]
+    for filters in ({}, {'season': season}, {'season': season, 'team': team}):
+        if mode == aggregation.TEAM_TOTALS:
+            db_queries.team_totals(league, stats, path=ctx['db_path'], **filters)
+        else:
+            db_queries.top_n(league, stats, 25, path=ctx['db_path'], **filters)
+
+
+def filter_rows(ctx, league, source):
+    # A scatter's rows: a few players in one season and across all of them
+    entry = ctx[league]
+    adapter, index = entry['adapter'], entry['index']
+    season, players = index.options('season')[0], index.first_values('player', 3)
+    columns = [adapter.player_col] + adapter.bar_chart[0]
+    for filters in ({'season': season, 'player': players}, {'player': players}):
+        if source == 'sqlite':
+            db_queries.rows(league, columns, path=ctx['db_path'], **filters)
+        else:
+            index.subset(entry['df'], **filters)[columns]
+
+
+def filter_aggregates(ctx, league, mode):
+    # The same charts answered from the materialized tables (a team filter on top N isn't
+    # covered by the leaderboards and goes to SQLite or pandas on the page)
+    entry = ctx[league]
+    index, tables = entry['index'], entry['aggregates']
+    season, team = index.options('season')[0], index.options('team')[0]
+    stats = entry['adapter'].bar_chart[0]
+    if mode == aggregation.TEAM_TOTALS:
+        for filters in ({}, {'season': season}, {'season': season, 'team': team}):
+            aggregates.team_totals(league, stats, table=tables['team_seasons'], **filters)
+    else:
+        for filters in ({}, {'season': season}):
+            aggregates.leaders(league, stats, 25, table=tables['leaderboards'], **filters)
+
+
+def radar_build(ctx, league):
+    entry = ctx[league]
+    adapter = entry['adapter']
+    return ComparisonEngine(entry['df'], adapter.player_col, adapter.season_col, adapter.stats_options)
+
+
+def radar_series(ctx, league):
+    if 'engine' not in ctx[league]:
+        ctx[league]['engine'] = radar_build(ctx, league)
+    engine = ctx[league]['engine']
+    players = ctx[league]['index'].first_values('player', 5)
+    return engine.series(players, ctx[league]['adapter'].stats_options)
+
+
+def similarity_build(ctx, league):
+    entry = ctx[league]
+    adapter = entry['adapter']
+    return SimilarityIndex(entry['df'], adapter.player_col, adapter.season_col, adapter.team_col, adapter.stats_options)
+
+
+def similarity_query(ctx, league):
+    if 'similarity' not in ctx[league]:
+        ctx[league]['similarity'] = similarity_build(ctx, league)
+    engine = ctx[league]['similarity']
+    for player in ctx[league]['index'].first_values('player', 5):
+        engine.query(player, k=10)
+
+
+def trajectory_build(ctx, league, df=None):
+    entry = ctx[league]
+    adapter = entry['adapter']
+    return TrajectoryEngine(entry['df'] if df is None else df, adapter.key_columns['player_id'], adapter.player_col,
+                            adapter.season_col, adapter.team_col, adapter.stats_options)
+
+
+def trajectory_update(ctx, league):
+    # A new latest season landing on an engine built without it
+    entry = ctx[league]
+    if 'trajectory_base' not in entry:
+        seasons = entry['df'][entry['adapter'].season_col].astype(str)
+        latest = seasons.max()
+        entry['trajectory_base'] = trajectory_build(ctx, league, entry['df'][seasons != latest])
+        entry['trajectory_new'] = (entry['df'][seasons == latest], [latest])
+    return entry['trajectory_base'].updated(*entry['trajectory_new'])
+
+
+def trajectory_history(ctx, league):
+    if 'trajectories' not in ctx[league]:
+        ctx[league]['trajectories'] = trajectory_build(ctx, league)
+    engine = ctx[league]['trajectories']
+    stat = ctx[league]['adapter'].stats_options[0]
+    for player in ctx[league]['index'].first_values('player', 5):
+        engine.trajectory(player, stat)
+        engine.peak(player, stat)
+
+
+def render_fg_pct(ctx):
+    # Cold render (no figure cache) of the league-average FG% chart
+    df = ctx['nba']['df']
+    averages = df.groupby('Season', observed=True)['FG_PCT'].mean().reset_index()
+    return plots.render_png(plots.fg_pct_line(averages, 'Average FG%'))
+
+
+def render_scatter(ctx):
+    entry = ctx['nba']
+    players = entry['index'].first_values('player', 3)
+    data = entry['index'].subset(entry['df'], player=players)
+    return plots.render_png(plots.fgm_vs_fga_scatter(data, players))
+
+
+CASES = {
+    'fetch.mlb': lambda ctx: fetch(ctx, 'mlb'),
+    'fetch.nba': lambda ctx: fetch(ctx, 'nba'),
+    'load.csv.mlb': lambda ctx: load_csv(ctx, 'mlb'),
+    'load.store.mlb': lambda ctx: load_store(ctx, 'mlb'),
+    'load.store.nba': lambda ctx: load_store(ctx, 'nba'),
+    'filter.index_build.mlb': lambda ctx: FilterIndex(ctx['mlb']['df'], SCHEMAS['mlb']['index']),
+    'filter.pandas.top_n.mlb': lambda ctx: filter_pandas(ctx, 'mlb'),
+    'filter.sqlite.top_n.mlb': lambda ctx: filter_sqlite(ctx, 'mlb', aggregation.TOP_N),
+    'filter.sqlite.team_totals.nba': lambda ctx: filter_sqlite(ctx, 'nba', aggregation.TEAM_TOTALS),
+    'filter.pandas.rows.nba': lambda ctx: filter_rows(ctx, 'nba', 'pandas'),
+    'filter.sqlite.rows.nba': lambda ctx: filter_rows(ctx, 'nba', 'sqlite'),
+    'aggregates.build.mlb': lambda ctx: aggregates.build('mlb', ctx['mlb']['full']),
+    'aggregates.build.nba': lambda ctx: aggregates.build('nba', ctx['nba']['full']),
+    'filter.aggregates.top_n.mlb': lambda ctx: filter_aggregates(ctx, 'mlb', aggregation.TOP_N),
+    'filter.aggregates.team_totals.nba': lambda ctx: filter_aggregates(ctx, 'nba', aggregation.TEAM_TOTALS),
+    'radar.build.nba': lambda ctx: radar_build(ctx, 'nba'),
+    'radar.series.nba': lambda ctx: radar_series(ctx, 'nba'),
+    'similarity.build.nba': lambda ctx: similarity_build(ctx, 'nba'),
+    'similarity.query.nba': lambda ctx: similarity_query(ctx, 'nba'),
+    'trajectory.build.nba': lambda ctx: trajectory_build(ctx, 'nba'),
+    'trajectory.update.nba': lambda ctx: trajectory_update(ctx, 'nba'),
+    'trajectory.history.nba': lambda ctx: trajectory_history(ctx, 'nba'),
+    'render.fg_pct.nba': render_fg_pct,
+    'render.scatter.nba': render_scatter,
+}
+
+
+def measure(case, ctx):
+    # Best of REPEATS after one untimed warm-up run (mock bodies, lazy imports, OS caches)
+    case(ctx)
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        case(ctx)
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def report(rows_list, only=None, update=False):
+    baseline = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            baseline = json.load(f)
+
+    results = {}
+    failed = False
+    workdir = tempfile.mkdtemp(prefix='hot_paths_')
+    try:
+        for rows in rows_list:
+            started = time.perf_counter()
+            ctx = prepare(rows, workdir)
+            print(f"{rows:,} rows (setup {time.perf_counter() - started:.1f} s)")
+            for name, case in CASES.items():
+                if only and not any(name.startswith(prefix) for prefix in only):
+                    continue
+                key = f"{name}@{rows}"
+                ms = measure(case, ctx)
+                results[key] = round(ms, 2)
+                limit = baseline.get(key)
+                status = ''
+                if limit is not None and not update:
+                    over = ms > limit * (1 + TOLERANCE) and ms - limit > MIN_REGRESSION_MS
+                    failed = failed or over
+                    status = f" (baseline {limit:.1f} ms{' - REGRESSION' if over else ''})"
+                print(f"  {name:32} {ms:10.1f} ms{status}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if update:
+        baseline.update(results)
+        with open(BASELINE_PATH, 'w') as f:
+            json.dump(dict(sorted(baseline.items())), f, indent=2)
+            f.write('\n')
+        print(f"Baseline written to {BASELINE_PATH}")
+    return 1 if failed else 0
+
+
+def option(name):
+    # Value of a --name=value or --name value argument
+    for i, arg in enumerate(sys.argv):
+        if arg.startswith(f"--{name}="):
+            return arg.split('=', 1)[1]
+        if arg == f"--{name}" and i + 1 < len(sys.argv):
+            return sys.argv[i + 1]
+    return None
+
+
+if __name__ == "__main__":
+    rows_list = [int(rows) for rows in option('rows').split(',')] if option('rows') else DEFAULT_ROWS
+    only = option('only').split(',') if option('only') else None
+    sys.exit(report(rows_list, only=only, update='--update' in sys.argv))
@@ -0,0 +1,106 @@
+#import_time.py
+# Import-time report for the dashboard entry points, measured with `python -X importtime`
+# in a fresh interpreter per target. Compares against import_budget.json and exits
+# non-zero when a target goes over budget.
+#
+#   python -m benchmarks.import_time            # report and check the budget
+#   python -m benchmarks.import_time --update   # record the current timings as the budget
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DASHBOARD_DIR = os.path.join(ROOT, 'dashboard')
+BUDGET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'import_budget.json')
+
+# Module imported by each target; Home is what every new server worker pays on cold start
+TARGETS = {
+    'Home': 'Home',
+    'MLB page': 'sports.MLB',
+    'NBA page': 'sports.NBA',
+    'NFL page': 'sports.NFL',
+}
+
+# Baseline every target pays anyway; heavy modules it already imports aren't reported
+BASELINE = 'streamlit'
+
+# Libraries that must not be imported until a page or chart actually needs them
+HEAVY_MODULES = ['sklearn', 'matplotlib', 'seaborn', 'plotly', 'pyarrow', 'scipy']
+
+REPEATS = 3
+# Allowed slowdown over the recorded budget before the check fails
+TOLERANCE = 0.25
+
+
+def measure(module):
+    # Returns (total ms, {module: cumulative ms}, imported module names) for one fresh import.
+    # The breakdown covers the modules imported directly by the target.
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([DASHBOARD_DIR, ROOT]))
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+
+    total = 0.0
+    modules = {}
+    imported = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # The tree is indented by two spaces per level below the leading space
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        name = name.strip()
+        imported.add(name)
+        ms = int(cumulative) / 1000.0
+        if depth == 0:
+            total += ms
+        elif depth == 1:
+            modules[name] = ms
+    return total, modules, imported
+
+
+def report(update=False):
+    budget = {}
+    if os.path.exists(BUDGET_PATH):
+        with open(BUDGET_PATH) as f:
+            budget = json.load(f)
+
+    baseline_total, _, baseline_imported = measure(BASELINE)
+    print(f"{BASELINE} (baseline): {baseline_total:.0f} ms")
+
+    results = {}
+    failed = False
+    for target, module in TARGETS.items():
+        runs = [measure(module) for _ in range(REPEATS)]
+        total, modules, imported = min(runs, key=lambda run: run[0])
+        results[target] = round(total, 1)
+        heavy = sorted({
+            name.split('.')[0] for name in imported - baseline_imported if name.split('.')[0] in HEAVY_MODULES
+        })
+
+        limit = budget.get(target)
+        status = ''
+        if limit is not None and not update:
+            over = total > limit * (1 + TOLERANCE)
+            failed = failed or over
+            status = f" (budget {limit:.0f} ms{' - OVER BUDGET' if over else ''})"
+        print(f"{target}: {total:.0f} ms{status}")
+        if heavy:
+            print(f"  heavy modules imported beyond {BASELINE}: {', '.join(heavy)}")
+        for name, ms in sorted(modules.items(), key=lambda item: -item[1])[:8]:
+            print(f"  {ms:8.1f} ms  {name}")
+
+    if update:
+        with open(BUDGET_PATH, 'w') as f:
+            json.dump(results, f, indent=2)
+            f.write('\n')
+        print(f"Budget written to {BUDGET_PATH}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(report(update='--update' in sys.argv))
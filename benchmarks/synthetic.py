@@ -0,0 +1,115 @@
+#synthetic.py
+# Synthetic league datasets and a mocked HTTP layer for the benchmarks. Datasets keep the
+# columns, dtypes and value ranges of data/<league>_data.csv but have any number of rows:
+# rows are resampled from the real snapshot, spread evenly over its seasons, given new
+# player ids/names (each player at most once per season) and jittered stats.
+import json
+
+import numpy as np
+import pandas as pd
+
+from data import store
+from data.leagues import get_adapter
+from data.schema import SCHEMAS
+
+# Name columns filled with the generated player name
+NAME_COLUMNS = {
+    'mlb': ['playerName', 'playerFullName', 'playerUseName', 'playerInitLastName'],
+    'nba': ['PLAYER'],
+}
+
+
+def make_dataset(league, rows, seed=0):
+    # Raw (untyped) frame with the league's CSV columns and `rows` rows
+    adapter = get_adapter(league)
+    schema = SCHEMAS[league]
+    base = pd.read_csv(store.CSV_PATHS[league])
+    rng = np.random.default_rng(seed)
+
+    season_col = adapter.season_col
+    seasons = list(pd.unique(base[season_col]))
+    df = base.iloc[rng.integers(0, len(base), rows)].reset_index(drop=True)
+    df[season_col] = np.array(seasons, dtype=object)[np.arange(rows) * len(seasons) // rows]
+
+    # Each season draws its players from one shared pool, so players recur across seasons
+    per_season = -(-rows // len(seasons))
+    pool = int(per_season * 1.5)
+    ids = np.empty(rows, dtype=np.int64)
+    for season in seasons:
+        where = np.flatnonzero(df[season_col].to_numpy() == season)
+        ids[where] = 1_000_000 + rng.choice(pool, size=len(where), replace=False)
+    df[adapter.key_columns['player_id']] = ids
+    names = pd.Series(ids).map(lambda player_id: f"Player {player_id}")
+    for col in NAME_COLUMNS.get(league, [adapter.player_col]):
+        if col in df.columns:
+            df[col] = names
+
+    # +-20% on every stat so the rows aren't copies of each other
+    for col in schema['ints'] + schema['floats']:
+        if col not in df.columns or col == 'rank':
+            continue
+        values = pd.to_numeric(df[col], errors='coerce') * rng.uniform(0.8, 1.2, rows)
+        df[col] = values.round() if col in schema['ints'] else values.round(3)
+    return df
+
+
+def write_dataset(league, df, store_dir):
+    # Columnar store of a synthetic frame under store_dir (kept apart from data/store)
+    store.write_partitions(league, df, store_dir=store_dir)
+    return store_dir
+
+
+class MockResponse:
+    # Just enough of requests.Response for fetch_engine: the body is real JSON text, so
+    # decoding it costs what it does on a live response
+
+    def __init__(self, body, status_code=200):
+        self.status_code = status_code
+        self.headers = {}
+        self._body = body
+
+    def json(self):
+        return json.loads(self._body)
+
+
+class MockSession:
+    # Serves the MLB stats API and the NBA leaders endpoint from synthetic frames, without
+    # sockets. Bodies are encoded once per page and reused, so repeated runs measure the
+    # client side only. latency (seconds) is slept per request to model a slow upstream.
+
+    def __init__(self, frames, latency=0.0):
+        self.frames = frames
+        self.latency = latency
+        self.requests = 0
+        self._bodies = {}
+        self._by_season = {league: dict(tuple(df.groupby(get_adapter(league).season_col, sort=False)))
+                           for league, df in frames.items()}
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.requests += 1
+        if self.latency:
+            import time
+            time.sleep(self.latency)
+        key = (url, tuple(sorted((params or {}).items())))
+        if key not in self._bodies:
+            self._bodies[key] = self._body(params or {})
+        return MockResponse(self._bodies[key])
+
+    def _body(self, params):
+        if 'group' in params:
+            season = self._by_season['mlb'].get(int(params['season']))
+            if season is None or params['group'] != 'hitting':
+                return json.dumps({'stats': [], 'totalSize': 0})
+            offset, limit = int(params['offset']), int(params['limit'])
+            page = season.iloc[offset:offset + limit]
+            page = page.astype(object).where(page.notna(), None)
+            return json.dumps({'stats': page.to_dict('records'), 'totalSize': len(season)}, default=str)
+        season = self._by_season['nba'].get(params['Season'])
+        if season is None:
+            return json.dumps({'resultSet': {'headers': [], 'rowSet': []}})
+        rows = season.drop(columns='Season').astype(object)
+        rows = rows.where(rows.notna(), None)
+        return json.dumps({'resultSet': {'headers': list(rows.columns), 'rowSet': rows.values.tolist()}}, default=str)
+
+    def close(self):
+        pass
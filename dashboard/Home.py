@@ -1,8 +1,28 @@
+import importlib
+import os
+import sys
+import time
+
+# Make the project root importable so the pages can use the shared data package
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 import streamlit as st
-import plotly.express as px
-import pandas as pd
 from streamlit_option_menu import option_menu
-from sports import MLB, NBA, NFL
+
+from components import profiling
+
+# League pages are imported on first selection, so opening Home never loads their
+# data layer or plotting libraries: menu option -> (module, page function)
+PAGES = {
+    "MLB Stats": ("sports.MLB", "mlb_stats"),
+    "NBA Stats": ("sports.NBA", "nba_stats"),
+    "NFL Stats": ("sports.NFL", "nfl_stats"),
+    "Cross-League": ("sports.CrossLeague", "cross_league"),
+}
+
+def show_page(selected):
+    module_name, function_name = PAGES[selected]
+    getattr(importlib.import_module(module_name), function_name)()
 
 def show_home():
     st.markdown("""
@@ -91,6 +111,9 @@ def show_home():
         st.write("""
         Experience the power of our analytics with this interactive demo. This visualization showcases team performance across multiple metrics, allowing you to explore the data and gain insights at a glance.
         """)
+        import pandas as pd
+        import plotly.express as px
+
         metrics = ['Offensive Efficiency', 'Defensive Prowess', 'Player Synergy', 'Fan Engagement']
         teams = ['Warriors', 'Lakers', 'Celtics', 'Heat', 'Bucks']
         data = pd.DataFrame({
@@ -102,6 +125,23 @@ def show_home():
                          title='Comprehensive Team Performance Analysis', size_max=60)
         st.plotly_chart(fig)
 
+def background_refresh():
+    # Scheduled data refresh in the background (every DASHBOARD_REFRESH_SECONDS seconds), published
+    # with an atomic swap so pages keep serving the previous data until it's done. Imported only
+    # when enabled, since the refresher pulls in the data layer.
+    interval = int(os.environ.get("DASHBOARD_REFRESH_SECONDS") or 0)
+    if interval <= 0:
+        return
+    from data import refresher, store
+
+    refresher.start_background(interval)
+    pointer = store.read_pointer()
+    if pointer is not None:
+        published = time.strftime("%Y-%m-%d %H:%M", time.localtime(pointer["published_at"]))
+        st.sidebar.caption(f"Data refreshed {published}")
+    if refresher.status["last_error"]:
+        st.sidebar.caption("The last refresh failed; showing the previous data.")
+
 def main():
     # Sidebar 
     with st.sidebar:
@@ -109,8 +149,8 @@ def main():
         st.sidebar.markdown("---")
         selected = option_menu(
             menu_title=None,
-            options=["Home", "MLB Stats", "NBA Stats", "NFL Stats"],
-            icons=["house", "person", "dribbble", "shield"],
+            options=["Home", "MLB Stats", "NBA Stats", "NFL Stats", "Cross-League"],
+            icons=["house", "person", "dribbble", "shield", "bar-chart"],
             menu_icon="cast",
             default_index=0,
             styles={
@@ -120,19 +160,24 @@ def main():
                 "nav-link-selected": {"background-color": "#F00028"},
             }
         )
-    
+        # Opt-in timing of this rerun (always on with DASHBOARD_PROFILE=1)
+        profile = st.toggle("Profiling", value=profiling.env_enabled(), key="profiling")
+    background_refresh()
+
+    profiling.start_run(profile)
+
     # Display content based on selected page
-    if selected == "Home":
-        show_home()
-    elif selected == "MLB Stats":
-        # st.title("MLB Statistics")
-        MLB.mlb_stats()  # Load MLB stats 
-    elif selected == "NBA Stats":
-        # st.title("NBA Statistics")
-        NBA.nba_stats() # Load NBA Stats
-    elif selected == "NFL Stats":
-        # st.title("NFL Statistics")
-        st.write("NFL stats content coming soon!")
+    with profiling.span(f"page.{selected}"):
+        if selected == "Home":
+            show_home()
+        elif selected in PAGES:
+            show_page(selected)  # Load MLB / NBA / NFL stats or the cross-league view
+
+    run = profiling.finish_run(selected)
+    if run is not None:
+        profiling.sidebar_panel(run)
+        if profiling.env_enabled():
+            profiling.export(run)
 
 if __name__ == "__main__":
     st.set_page_config(page_title="Multi-Sport Analytics Dashboard", page_icon="🏆", layout="wide")
@@ -0,0 +1 @@
+# Reusable Streamlit components shared by the league pages
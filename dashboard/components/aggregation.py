@@ -0,0 +1,66 @@
+import streamlit as st
+from analytics import aggregates
+from components import profiling
+from db import db_queries
+
+TOP_N = "Top N players"
+TEAM_TOTALS = "Team totals"
+
+
+def chart_limit_controls(key, default_n=25):
+    # How a bar chart should summarize its rows: the top N players or one bar per team
+    col1, col2 = st.columns([2, 3])
+    with col1:
+        mode = st.radio("Show:", options=[TOP_N, TEAM_TOTALS], horizontal=True, key=f"{key}_mode")
+    with col2:
+        n = st.slider("N:", min_value=5, max_value=100, value=default_n, step=5, key=f"{key}_n",
+                      disabled=mode != TOP_N)
+    return mode, n
+
+
+def limit_for_chart(df, n, stats, label_col):
+    # Bounded number of bars whatever the filter: the top n rows by the first stat.
+    # Returns the frame to plot and the column to use on the x axis.
+    return df.nlargest(n, stats[0]), label_col
+
+
+def in_database(league, df):
+    # True when SQLite holds the same dataset version as the page's frame
+    return db_queries.available(league, df.attrs.get('version'))
+
+
+def like(frame, df):
+    # A query result typed like the page's frame (float32 stats, categorical names)
+    return frame.astype({col: df[col].dtype for col in frame.columns if col in df.columns})
+
+
+@profiling.timed('compute.filter_rows')
+def filter_rows(league, df, index, columns, season=None, team=None, player=None):
+    # The page's rows for the filters, from SQLite when it holds this dataset version and
+    # from the in-memory index otherwise
+    if in_database(league, df):
+        return like(db_queries.rows(league, columns, season=season, team=team, player=player), df)
+    return index.subset(df, season=season, team=team, player=player)[columns]
+
+
+@profiling.timed('compute.chart_frame')
+def chart_frame(league, df, index, season, team, mode, n, stats, label_col, team_col):
+    # The bars of a chart: team sums, or the top n player seasons of the filtered rows. The
+    # league-wide top n is a lookup in the materialized leaderboards; team totals and the top n
+    # within a team are queried in SQLite when it holds the page's dataset version. Without it,
+    # team totals come from the aggregate tables and the rest from the in-memory index.
+    if mode == TOP_N and (team is None or team == 'All'):
+        leaders = aggregates.leaders(league, stats, n, season=season)
+        if leaders is not None:
+            return leaders, label_col
+    if in_database(league, df):
+        if mode == TEAM_TOTALS:
+            # Sums keep SQLite's 64-bit integers; a season's int16 column can't hold a decade's total
+            return db_queries.team_totals(league, stats, season=season, team=team), team_col
+        return like(db_queries.top_n(league, stats, n, season=season, team=team), df), label_col
+    if mode == TEAM_TOTALS:
+        return aggregates.team_totals(league, stats, season=season, team=team), team_col
+    filtered_df = index.subset(df, season=season, team=team)
+    if filtered_df.empty:
+        return filtered_df, label_col
+    return limit_for_chart(filtered_df, n, stats, label_col)
@@ -0,0 +1,184 @@
+import streamlit as st
+from analytics import similarity, trajectories
+from analytics.comparison import ComparisonEngine
+from components import aggregation, profiling
+from data import datasets
+from data.leagues import get_adapter
+from models import ml_utils, predict
+from visualizations import charts
+
+# Dashboard building blocks shared by every league page. Column names come from the
+# league adapter, so the same code serves MLB, NBA and NFL.
+
+
+@profiling.timed('data.load_data')
+def load_data(league, columns=None):
+    # Shared process-wide copy of the typed dataset; reloaded only when the files on disk change.
+    # The frame is shared by every session, so never modify it in place.
+    return datasets.get_dataset(league, columns or get_adapter(league).page_columns)
+
+
+@profiling.timed('data.load_index')
+def load_index(league, columns=None):
+    # Season/team/player -> row positions for load_data(league, columns), built once per dataset version
+    return datasets.get_index(league, columns or get_adapter(league).page_columns)
+
+
+@profiling.timed('data.load_comparison')
+def load_comparison(league, stats=None):
+    # Season-normalized per-player stat means for the whole league, built once per dataset version
+    adapter = get_adapter(league)
+    stats = stats or adapter.stats_options
+    return datasets.get_derived(
+        league, ('comparison', tuple(stats)),
+        lambda df: ComparisonEngine(df, adapter.player_col, adapter.season_col, stats),
+        adapter.page_columns,
+    )
+
+
+@profiling.timed('data.load_similarity')
+def load_similarity(league):
+    # Season-normalized stat vectors of every player season, built once per dataset version
+    return similarity.load(league)
+
+
+@profiling.timed('viz.player_comparison')
+def player_comparison(league, df, index, key="comparison"):
+    st.subheader("Player Comparison Across Multiple Stats")
+
+    stats_options = get_adapter(league).stats_options
+
+    # User input for filtering
+    selected_players = st.multiselect("Select Players to Compare:", options=index.options('player'), default=index.first_values('player', 2), key=f"{key}_players")
+    selected_stats = st.multiselect("Select Stats for Comparison:", options=stats_options, default=stats_options[:4], key=f"{key}_stats")
+
+    if selected_players and selected_stats:
+        # Look up the precomputed normalized stats; no per-rerun scaling or per-player filtering
+        players, values = load_comparison(league).series(selected_players, selected_stats)
+        with profiling.span('compute.radar_figure'):
+            fig = charts.radar_chart(players, selected_stats, values)
+        profiling.plotly_chart(fig)
+    else:
+        st.warning("Please select at least one player and one stat for comparison.")
+
+
+@profiling.timed('viz.similar_players')
+def similar_players(league, df, index, key="similar"):
+    st.subheader("Similar Player Seasons")
+
+    engine = load_similarity(league)
+
+    # User input for the query
+    col1, col2, col3 = st.columns([3, 2, 2])
+    with col1:
+        selected_player = st.selectbox("Select Player:", options=index.options('player'), key=f"{key}_player")
+    with col2:
+        selected_season = st.selectbox("Season:", options=engine.seasons(selected_player), key=f"{key}_season")
+    with col3:
+        k = st.slider("Matches:", min_value=5, max_value=50, value=10, step=5, key=f"{key}_k")
+
+    # Nearest neighbours over the precomputed matrix; nothing is rescanned per rerun
+    with profiling.span('compute.similarity_query'):
+        matches = engine.query(selected_player, season=selected_season, k=k)
+    if not matches.empty:
+        st.dataframe(matches, hide_index=True)
+    else:
+        st.warning("No similar player seasons found.")
+
+
+@profiling.timed('data.load_trajectories')
+def load_trajectories(league):
+    # Every player's seasons as contiguous slices with their career metrics, kept per dataset version
+    return trajectories.load(league)
+
+
+@profiling.timed('viz.player_trajectory')
+def player_trajectory(league, df, index, key="trajectory"):
+    st.subheader("Player Career Trajectory")
+
+    engine = load_trajectories(league)
+
+    # User input for filtering
+    col1, col2 = st.columns([3, 2])
+    with col1:
+        selected_player = st.selectbox("Select Player:", options=index.options('player'), key=f"{key}_player")
+    with col2:
+        selected_stat = st.selectbox("Stat:", options=engine.stats, key=f"{key}_stat")
+
+    # One slice of the precomputed career arrays; nothing is filtered or grouped per rerun
+    with profiling.span('compute.trajectory_slice'):
+        frame = engine.trajectory(selected_player, selected_stat)
+    if frame.empty:
+        st.warning("No seasons found for this player.")
+        return
+
+    season, value = engine.peak(selected_player, selected_stat)
+    st.caption(f"Career best {selected_stat}: {value:g} in {season}. The last column compares each change "
+               f"with the league's average change into the same season of a career.")
+    with profiling.span('compute.trajectory_figure'):
+        fig = charts.trajectory_lines(frame, engine.season_col, selected_stat, f"rolling_{engine.window}")
+    profiling.plotly_chart(fig)
+    st.dataframe(frame, hide_index=True)
+
+
+@profiling.timed('data.load_projections')
+def load_projections(league):
+    # Batched next-season predictions of the saved model, computed once per (model, dataset version)
+    return predict.projections(league)
+
+
+@profiling.timed('viz.next_season_projection')
+def next_season_projection(league, df, index, key="projection"):
+    target = ml_utils.TARGETS.get(league)
+    if target is None:
+        return
+    st.subheader(f"Projected Next-Season {target}")
+
+    projected = load_projections(league)
+    if projected is None:
+        st.info(f"No trained model yet. Run `python -m models.train_model {league}` to train one.")
+        return
+
+    # User input for filtering
+    selected_players = st.multiselect("Select Players:", options=projected['player'].astype(str).tolist(), key=f"{key}_players")
+    if selected_players:
+        rows = projected[projected['player'].astype(str).isin(selected_players)]
+    else:
+        rows = projected.head(10)
+
+    bundle = predict.load_model(league)
+    metrics = bundle['metrics']
+    if 'holdout' in metrics:
+        st.caption(f"{bundle['estimator']} model; mean absolute error on the last held-out season "
+                   f"{metrics['holdout']['mae']:.3f} (repeating the current value: {metrics['baseline']['mae']:.3f})")
+
+    with profiling.span('compute.bar_figure'):
+        fig = charts.projection_bars(rows, target)
+    profiling.plotly_chart(fig)
+    st.dataframe(rows, hide_index=True)
+
+
+@profiling.timed('viz.leaders_bar_chart')
+def leaders_bar_chart(league, df, index, key, subheader=None, season_label="Select Season:"):
+    # Grouped bars of the adapter's bar_chart stats for the top N players or per team
+    adapter = get_adapter(league)
+    stats, title = adapter.bar_chart
+    st.subheader(subheader or title)
+
+    # User Input for Filtering
+    selected_season = st.selectbox(season_label, options=['All'] + index.options('season'), key=f"{key}_year")
+    selected_team = st.selectbox("Select Team:", options=['All'] + index.options('team'), key=f"{key}_team")
+
+    mode, top_n = aggregation.chart_limit_controls(key=key)
+
+    # Filter and limit to a bounded number of bars (top N players or team totals)
+    chart_df, x_col = aggregation.chart_frame(league, df, index, selected_season, selected_team, mode, top_n,
+                                              stats, adapter.player_col, adapter.team_col)
+
+    # Visualizations
+    if not chart_df.empty:
+        with profiling.span('compute.bar_figure'):
+            bar_fig = charts.grouped_bars(chart_df, x_col, stats, title)
+        profiling.plotly_chart(bar_fig)
+    else:
+        st.warning("No data available for the selected filters.")
@@ -0,0 +1,221 @@
+import json
+import os
+import resource
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+import streamlit as st
+from data import DATA_DIR
+
+# Opt-in timing instrumentation for one rerun of the app. Spans are named
+# '<category>.<what>': data (loading), compute (filtering, aggregation, building figures),
+# render (rasterizing and serializing charts to the browser), viz (a whole chart section,
+# including its widgets) and page (the rest of the page script). Each span records its own time minus its children's, so the
+# per-category totals add up to the rerun without double counting.
+#
+# Enabled by the "Profiling" toggle in the sidebar, or for every session with DASHBOARD_PROFILE=1
+# (which also writes the latest rerun to PROFILE_DIR, e.g. for a Prometheus textfile collector).
+
+ENV_FLAG = 'DASHBOARD_PROFILE'
+PROFILE_DIR = os.path.join(DATA_DIR, 'profiles')
+CATEGORIES = ['data', 'compute', 'render', 'viz', 'page']
+
+_local = threading.local()
+_lock = threading.Lock()
+# Process-wide totals per span name since start: [count, seconds, max seconds]
+_totals = {}
+_reruns = {'count': 0, 'seconds': 0.0}
+
+
+def env_enabled():
+    return os.environ.get(ENV_FLAG, '') not in ('', '0')
+
+
+def start_run(enabled):
+    # Called at the top of every rerun; spans are only recorded while a run is active
+    _local.enabled = enabled
+    _local.spans = []
+    _local.stack = []
+    _local.started = time.perf_counter()
+
+
+@contextmanager
+def span(name):
+    if not getattr(_local, 'enabled', False):
+        yield
+        return
+    start = time.perf_counter()
+    depth = len(_local.stack)
+    _local.stack.append(0.0)
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        children = _local.stack.pop()
+        if _local.stack:
+            _local.stack[-1] += elapsed
+        _local.spans.append({
+            'name': name, 'depth': depth, 'start_ms': round((start - _local.started) * 1000, 2),
+            'ms': round(elapsed * 1000, 2), 'self_ms': round((elapsed - children) * 1000, 2),
+        })
+        with _lock:
+            count, seconds, longest = _totals.get(name, (0, 0.0, 0.0))
+            _totals[name] = (count + 1, seconds + elapsed, max(longest, elapsed))
+
+
+def timed(name):
+    # Decorator form of span()
+    def decorate(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def plotly_chart(fig, **kwargs):
+    # st.plotly_chart, timed: serializing the figure to JSON happens here
+    with span('render.plotly_chart'):
+        return st.plotly_chart(fig, **kwargs)
+
+
+def image(png, **kwargs):
+    with span('render.image'):
+        return st.image(png, **kwargs)
+
+
+def counters():
+    # Cache hit/miss counters of the process-wide caches
+    from data import datasets
+    from visualizations import plots
+
+    return {
+        'datasets': dict(datasets.stats),
+        'figure_cache': dict(plots.figure_cache.stats, bytes=plots.figure_cache.num_bytes,
+                             items=len(plots.figure_cache)),
+    }
+
+
+def memory():
+    # Resident set size now and at its peak, plus what the cached datasets hold
+    from data import datasets
+
+    snapshot = {'peak_rss_bytes': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024}
+    try:
+        with open('/proc/self/statm') as f:
+            snapshot['rss_bytes'] = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        snapshot['rss_bytes'] = None
+    snapshot['datasets_bytes'] = datasets.memory_bytes()
+    return snapshot
+
+
+def finish_run(page):
+    # Close the rerun and return its profile, or None when profiling was off
+    if not getattr(_local, 'enabled', False):
+        return None
+    total = time.perf_counter() - _local.started
+    _local.enabled = False
+    with _lock:
+        _reruns['count'] += 1
+        _reruns['seconds'] += total
+    by_category = {category: 0.0 for category in CATEGORIES}
+    for item in _local.spans:
+        category = item['name'].split('.', 1)[0]
+        by_category[category] = by_category.get(category, 0.0) + item['self_ms']
+    spans = sorted(_local.spans, key=lambda item: item['start_ms'])
+    return {
+        'page': page,
+        'timestamp': time.time(),
+        'total_ms': round(total * 1000, 2),
+        'by_category_ms': {category: round(ms, 2) for category, ms in by_category.items()},
+        # Time in the script outside any span (layout, widgets, Streamlit itself)
+        'untracked_ms': round(total * 1000 - sum(item['ms'] for item in spans if item['depth'] == 0), 2),
+        'spans': spans,
+        'counters': counters(),
+        'memory': memory(),
+    }
+
+
+def to_prometheus(run=None):
+    # Prometheus text exposition format: process-wide span totals, cache counters, memory
+    lines = [
+        '# HELP dashboard_span_seconds_total Time spent in instrumented spans since start.',
+        '# TYPE dashboard_span_seconds_total counter',
+    ]
+    with _lock:
+        totals = dict(_totals)
+        reruns = dict(_reruns)
+    for name, (count, seconds, longest) in sorted(totals.items()):
+        lines.append(f'dashboard_span_seconds_total{{span="{name}"}} {seconds:.6f}')
+    lines += ['# HELP dashboard_span_count_total Number of times each span ran.',
+              '# TYPE dashboard_span_count_total counter']
+    for name, (count, seconds, longest) in sorted(totals.items()):
+        lines.append(f'dashboard_span_count_total{{span="{name}"}} {count}')
+    lines += ['# HELP dashboard_span_max_seconds Longest single run of each span.',
+              '# TYPE dashboard_span_max_seconds gauge']
+    for name, (count, seconds, longest) in sorted(totals.items()):
+        lines.append(f'dashboard_span_max_seconds{{span="{name}"}} {longest:.6f}')
+    lines += ['# HELP dashboard_reruns_total Profiled reruns.', '# TYPE dashboard_reruns_total counter',
+              f"dashboard_reruns_total {reruns['count']}",
+              '# HELP dashboard_rerun_seconds_total Time spent in profiled reruns.',
+              '# TYPE dashboard_rerun_seconds_total counter',
+              f"dashboard_rerun_seconds_total {reruns['seconds']:.6f}"]
+
+    lines += ['# HELP dashboard_cache_events_total Cache lookups by cache and outcome.',
+              '# TYPE dashboard_cache_events_total counter']
+    stats = counters()
+    for cache, values in stats.items():
+        for event in ('hits', 'misses', 'invalidations', 'evictions'):
+            if event in values:
+                lines.append(f'dashboard_cache_events_total{{cache="{cache}",event="{event}"}} {values[event]}')
+
+    snapshot = run['memory'] if run else memory()
+    lines += ['# HELP dashboard_memory_bytes Process and dataset cache memory.', '# TYPE dashboard_memory_bytes gauge']
+    for kind, value in snapshot.items():
+        if value is not None:
+            lines.append(f'dashboard_memory_bytes{{kind="{kind[:-len("_bytes")]}"}} {value}')
+    if run:
+        lines += ['# HELP dashboard_last_rerun_seconds Duration of the latest profiled rerun by category.',
+                  '# TYPE dashboard_last_rerun_seconds gauge']
+        for category, ms in run['by_category_ms'].items():
+            lines.append(f'dashboard_last_rerun_seconds{{page="{run["page"]}",category="{category}"}} {ms / 1000:.6f}')
+    return '\n'.join(lines) + '\n'
+
+
+def _write_atomic(path, text):
+    # data.store (and pandas with it) is imported on the first export, not with every page
+    from data import store
+
+    store.write_atomic(path, lambda f: f.write(text))
+
+
+def export(run, directory=PROFILE_DIR):
+    # last_rerun.json (the full profile) and metrics.prom (Prometheus text format)
+    os.makedirs(directory, exist_ok=True)
+    json_path = os.path.join(directory, 'last_rerun.json')
+    prom_path = os.path.join(directory, 'metrics.prom')
+    _write_atomic(json_path, json.dumps(run, indent=2))
+    _write_atomic(prom_path, to_prometheus(run))
+    return json_path, prom_path
+
+
+def sidebar_panel(run):
+    # Debug panel with the latest rerun's breakdown
+    import pandas as pd
+
+    with st.sidebar.expander("Profiling", expanded=True):
+        st.markdown(f"**{run['page']}**: {run['total_ms']:.0f} ms")
+        st.bar_chart(pd.Series(run['by_category_ms'], name='ms'))
+        spans = pd.DataFrame(run['spans'])
+        if not spans.empty:
+            spans['span'] = spans['depth'].map(lambda depth: '  ' * depth) + spans['name']
+            st.dataframe(spans[['span', 'ms', 'self_ms']], hide_index=True)
+        st.json(run['counters'], expanded=False)
+        st.json({kind: value and f"{value / 2**20:.1f} MiB" for kind, value in run['memory'].items()}, expanded=False)
+        if st.button("Export profile", key="profiling_export"):
+            json_path, prom_path = export(run)
+            st.caption(f"Wrote {json_path} and {prom_path}")
@@ -0,0 +1,68 @@
+import math
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from components import profiling
+
+# Rows per page the table offers
+PAGE_SIZES = [25, 50, 100]
+
+
+def search_mask(df, text, columns):
+    # Case-insensitive substring match over the text columns. Categorical columns are
+    # matched once per category and mapped back through the codes instead of per row.
+    mask = np.zeros(len(df), dtype=bool)
+    needle = text.lower()
+    for col in columns:
+        values = df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            hits = values.cat.categories.astype(str).str.lower().str.contains(needle, regex=False)
+            codes = values.cat.codes.to_numpy()
+            mask |= (codes >= 0) & np.asarray(hits)[codes]
+        else:
+            mask |= values.astype(str).str.lower().str.contains(needle, regex=False).to_numpy()
+    return mask
+
+
+@profiling.timed('viz.table')
+def paginated_table(df, key, default_columns=None, page_size=PAGE_SIZES[0]):
+    # Server-side table: search, sort and column projection happen here and only the
+    # visible page is sent to the browser
+    text_columns = [col for col in df.columns if not pd.api.types.is_numeric_dtype(df[col])]
+    all_columns = list(df.columns)
+
+    col1, col2, col3 = st.columns([2, 2, 1])
+    with col1:
+        search = st.text_input("Search:", key=f"{key}_search")
+    with col2:
+        sort_by = st.selectbox("Sort by:", options=['(none)'] + all_columns, key=f"{key}_sort")
+    with col3:
+        descending = st.checkbox("Descending", value=True, key=f"{key}_desc")
+    columns = st.multiselect(
+        "Columns:", options=all_columns, default=default_columns or all_columns[:12], key=f"{key}_columns"
+    )
+
+    positions = np.arange(len(df))
+    if search:
+        positions = positions[search_mask(df, search, text_columns)]
+    if sort_by != '(none)':
+        values = df[sort_by].to_numpy()[positions] if pd.api.types.is_numeric_dtype(df[sort_by]) \
+            else df[sort_by].astype(str).to_numpy()[positions]
+        order = np.argsort(values, kind='stable')
+        positions = positions[order[::-1] if descending else order]
+
+    total = len(positions)
+    col1, col2, col3 = st.columns([1, 1, 3])
+    with col2:
+        page_size = st.selectbox("Rows per page:", options=PAGE_SIZES, key=f"{key}_page_size",
+                                 index=PAGE_SIZES.index(page_size) if page_size in PAGE_SIZES else 0)
+    num_pages = max(1, math.ceil(total / page_size))
+    with col1:
+        page = st.number_input("Page:", min_value=1, max_value=num_pages, value=1, step=1, key=f"{key}_page")
+    page_positions = positions[(page - 1) * page_size: page * page_size]
+
+    st.dataframe(df.iloc[page_positions][columns or all_columns], hide_index=True)
+    with col3:
+        first = (page - 1) * page_size + 1 if total else 0
+        st.caption(f"Rows {first}–{min(page * page_size, total)} of {total} (page {page} of {num_pages})")
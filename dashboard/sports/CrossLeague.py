@@ -0,0 +1,98 @@
+import pandas as pd
+import streamlit as st
+from analytics import zscores
+from components import profiling
+from data import datasets, store
+from data.leagues import get_adapter
+from db import db_queries
+
+@profiling.timed('data.load_scores')
+def load_scores(league):
+    # Season-relative z-scores and percentiles, read from the precomputed season files
+    return zscores.load(league)
+
+def pick_player(column, key, default_league):
+    # League, player and season selectors for one side of the comparison
+    with column:
+        options = zscores.scored_leagues()
+        league = st.selectbox("League:", options=options, index=options.index(default_league) if default_league in options else 0,
+                              format_func=str.upper, key=f"{key}_league")
+        scores = load_scores(league)
+        player = st.selectbox("Player:", options=scores.player_options(), key=f"{key}_player")
+        season = st.selectbox("Season:", options=scores.seasons_of(player), key=f"{key}_season")
+    return league, scores, player, season
+
+@profiling.timed('viz.cross_league_comparison')
+def cross_league_comparison():
+    st.subheader("Player Comparison Across Leagues")
+    st.write("Every stat is scored against the player's own league and season: the percentile is the share "
+             "of that season's players with a lower or equal value.")
+
+    col1, col2 = st.columns(2)
+    sides = [pick_player(col1, "cross_a", 'mlb'), pick_player(col2, "cross_b", 'nba')]
+
+    frames = []
+    for (league, scores, player, season), column in zip(sides, (col1, col2)):
+        frame = scores.player_frame(player, season)
+        with column:
+            if frame.empty:
+                st.warning("No scores for this selection.")
+                continue
+            st.metric("Mean percentile", f"{frame['percentile'].mean():.0f}")
+            st.metric("Mean z-score", f"{frame['z'].mean():+.2f}")
+        frames.append(frame.assign(player=f"{player} ({league.upper()} {season})"))
+
+    if frames:
+        import plotly.express as px
+        data = pd.concat(frames, ignore_index=True)
+        with profiling.span('compute.bar_figure'):
+            fig = px.bar(data, x='stat', y='percentile', color='player', hover_data=['z'], barmode='group',
+                         title="Season Percentile of Each Stat", range_y=[0, 100])
+        profiling.plotly_chart(fig)
+
+@profiling.timed('viz.cross_league_leaders')
+def cross_league_leaders():
+    st.subheader("Most Dominant Seasons Across Leagues")
+
+    n = st.slider("Seasons:", min_value=5, max_value=50, value=10, step=5, key="cross_leaders_n")
+    # Each league's top n by mean z-score, then merged; only n rows per league are built
+    leaders = pd.concat([load_scores(league).top(n) for league in zscores.scored_leagues()], ignore_index=True)
+    st.dataframe(leaders.nlargest(n, 'mean_z'), hide_index=True)
+
+@profiling.timed('data.league_summary')
+def load_summary(leagues):
+    # Players, teams and player seasons per league and season: one query over the database's
+    # cross-league view for the leagues it holds at their current version, the in-memory
+    # datasets for the rest
+    in_db = [league for league in leagues if db_queries.available(league, store.dataset_version(league))]
+    frames = [db_queries.league_summary(in_db)] if in_db else []
+    for league in leagues:
+        if league in in_db:
+            continue
+        adapter = get_adapter(league)
+        df = datasets.get_dataset(league, adapter.page_columns)
+        summary = df.groupby(df[adapter.season_col].astype(str).rename('season')).agg(
+            players=(adapter.key_columns['player_id'], 'nunique'), teams=(adapter.team_col, 'nunique'),
+            player_seasons=(adapter.player_col, 'size'))
+        frames.append(summary.reset_index().assign(league=league))
+    summary = pd.concat(frames, ignore_index=True).sort_values(['league', 'season'], kind='stable', ignore_index=True)
+    return summary[['league', 'season', 'players', 'teams', 'player_seasons']]
+
+@profiling.timed('viz.league_summary')
+def league_summary():
+    st.subheader("Seasons on File")
+
+    summary = load_summary(zscores.scored_leagues())
+    st.dataframe(summary.assign(league=summary['league'].str.upper()), hide_index=True)
+
+def cross_league():
+    # Cross-League Title
+    st.markdown("<h1 style='text-align: center; color: black;'>Cross-League Comparisons 📊</h1>", unsafe_allow_html=True)
+
+    if not zscores.scored_leagues():
+        st.info("No league data yet. Run `python -m data.fetch_data mlb nba` to fetch it.")
+        return
+
+    cross_league_comparison()
+    cross_league_leaders()
+    league_summary()
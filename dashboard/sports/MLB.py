@@ -1,111 +1,56 @@
-import pandas as pd
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
-from sklearn.preprocessing import MinMaxScaler
+from components import aggregation, league_page, profiling, table
+from data.leagues import get_adapter
+from visualizations import charts
 
-def load_data():
-    return pd.read_csv('data/mlb_data.csv')
+ADAPTER = get_adapter('mlb')
 
-def visualize_home_runs_rbi(df):
-    st.subheader("Home Runs vs RBIs")
-    
-    # User input for filtering
-    selected_year = st.selectbox("Select Year:", options=['All'] + df['year'].unique().tolist(), key="hr_rbi_year")
-    selected_team = st.selectbox("Select Team:", options=['All'] + df['teamName'].unique().tolist(), key="hr_rbi_team")
-    
-    # Filter Data
-    filtered_df = df.copy()
-    if selected_team != 'All':
-        filtered_df = filtered_df[filtered_df['teamName'] == selected_team]
-    if selected_year != 'All':
-        filtered_df = filtered_df[filtered_df['year'] == selected_year]
-
-    # Visualizations
-    if not filtered_df.empty:
-        bar_fig = px.bar(filtered_df, x='playerFullName', y=['homeRuns', 'rbi'], title='Home Runs and RBIs', barmode='group')
-        st.plotly_chart(bar_fig)
-    else:
-        st.warning("No data available for the selected filters.")
+# Stats offered in the player comparison radar chart
+STATS_OPTIONS = ADAPTER.stats_options
+
+# Columns shown in the stats table until the user picks others
+TABLE_COLUMNS = ADAPTER.table_columns
+
+# Columns used by this page; everything else stays on disk
+PAGE_COLUMNS = ADAPTER.page_columns
+
+def load_data(columns=PAGE_COLUMNS):
+    return league_page.load_data('mlb', columns)
+
+def load_index(columns=PAGE_COLUMNS):
+    return league_page.load_index('mlb', columns)
+
+def visualize_home_runs_rbi(df, index):
+    league_page.leaders_bar_chart('mlb', df, index, key="hr_rbi", subheader="Home Runs vs RBIs", season_label="Select Year:")
 
-def visualize_avg_ops_comparison(df):
+@profiling.timed('viz.avg_ops_comparison')
+def visualize_avg_ops_comparison(df, index):
     st.subheader("Player Average and OPS Comparison")
     
     # User input for filtering
-    selected_players = st.multiselect("Select Players to Compare:", options=df['playerFullName'].unique().tolist(), default=df['playerFullName'].unique()[:2], key="avg_ops_players")
+    selected_players = st.multiselect("Select Players to Compare:", options=index.options('player'), default=index.first_values('player', 2), key="avg_ops_players")
     
     if selected_players:
-        filtered_df = df[df['playerFullName'].isin(selected_players)]
-        avg_ops_fig = go.Figure()
-
-        # Add a bar for batting average
-        avg_ops_fig.add_trace(go.Bar(
-            x=filtered_df['playerFullName'],
-            y=filtered_df['avg'],
-            name='Batting Average',
-            marker_color='blue'
-        ))
-
-        # Add a bar for OPS
-        avg_ops_fig.add_trace(go.Bar(
-            x=filtered_df['playerFullName'],
-            y=filtered_df['ops'],
-            name='OPS',
-            marker_color='lightBlue'
-        ))
-
-        avg_ops_fig.update_layout(
-            title='Player Average and OPS Comparison',
-            barmode='group',
-            xaxis_title='Player',
-            yaxis_title='Statistics',
-            legend_title='Metrics'
-        )
-        
-        st.plotly_chart(avg_ops_fig)
+        with profiling.span('compute.avg_ops_figure'):
+            filtered_df = aggregation.filter_rows('mlb', df, index, [ADAPTER.player_col, 'avg', 'ops'],
+                                                  player=selected_players)
+            avg_ops_fig = charts.avg_ops_bars(filtered_df, ADAPTER.player_col)
+
+        profiling.plotly_chart(avg_ops_fig)
     else:
         st.warning("Please select at least one player for comparison.")
 
-def visualize_player_comparison(df):
-    st.subheader("Player Comparison Across Multiple Stats")
-    
-    stats_options = ['homeRuns', 'avg', 'obp', 'slg', 'rbi', 'runs', 'hits', 'strikeOuts']
-    
-    # User input for filtering
-    selected_players = st.multiselect("Select Players to Compare:", options=df['playerFullName'].unique().tolist(), default=df['playerFullName'].unique()[:2], key="comparison_players")
-    selected_stats = st.multiselect("Select Stats for Comparison:", options=stats_options, default=stats_options[:4], key="comparison_stats")
-    
-    if selected_players and selected_stats:
-        # Normalize stats for comparison
-        filtered_df = df[df['playerFullName'].isin(selected_players)]
-        for stat in selected_stats:
-            filtered_df[stat] = filtered_df[stat].astype(float)
-
-        scaler = MinMaxScaler()
-        normalized_stats = scaler.fit_transform(filtered_df[selected_stats])
-        normalized_df = pd.DataFrame(normalized_stats, columns=selected_stats, index=filtered_df.index)
-
-        # Create radar chart
-        fig = go.Figure()
-        for player in selected_players:
-            player_data = normalized_df[filtered_df['playerFullName'] == player].mean()
-            fig.add_trace(go.Scatterpolar(
-                r=player_data,
-                theta=selected_stats,
-                fill='toself',
-                name=player
-            ))
-
-        fig.update_layout(
-            polar=dict(
-                radialaxis=dict(visible=True, range=[0, 1])),
-            showlegend=True,
-            title=f"Comparison of Selected Stats for {', '.join(selected_players)}"
-        )
-
-        st.plotly_chart(fig)
-    else:
-        st.warning("Please select at least one player and one stat for comparison.")
+def visualize_player_comparison(df, index):
+    league_page.player_comparison('mlb', df, index)
+
+def visualize_similar_players(df, index):
+    league_page.similar_players('mlb', df, index, key="mlb_similar")
+
+def visualize_trajectory(df, index):
+    league_page.player_trajectory('mlb', df, index, key="mlb_trajectory")
+
+def visualize_projections(df, index):
+    league_page.next_season_projection('mlb', df, index, key="mlb_projection")
 
 def mlb_stats():
     st.markdown(
@@ -142,17 +87,22 @@ def mlb_stats():
 
     # Load data
     df = load_data()
+    index = load_index()
     
     # Show DataFrame
-    st.dataframe(df)
+    # Only the visible page of the table is sent to the browser
+    table.paginated_table(df, key="mlb_table", default_columns=TABLE_COLUMNS)
 
     # EDA Section
     st.markdown("<h1 style='text-align: center; color: black;'> EDA Visualizations </h1>", unsafe_allow_html=True)
     
     # Call the visualizations
-    visualize_player_comparison(df)
-    visualize_home_runs_rbi(df)
-    visualize_avg_ops_comparison(df)
+    visualize_player_comparison(df, index)
+    visualize_similar_players(df, index)
+    visualize_trajectory(df, index)
+    visualize_home_runs_rbi(df, index)
+    visualize_avg_ops_comparison(df, index)
+    visualize_projections(df, index)
 
 # Run the app
 if __name__ == "__main__":
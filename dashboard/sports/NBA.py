@@ -1,146 +1,85 @@
-import pandas as pd
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
-from sklearn.preprocessing import MinMaxScaler
-import matplotlib.pyplot as plt
-import seaborn as sns
+from analytics import aggregates
+from components import aggregation, league_page, profiling, table
+from data.leagues import get_adapter
+from visualizations import plots
 
-def load_data():
-    return pd.read_csv('data/nba_data.csv')
+ADAPTER = get_adapter('nba')
 
-def vizualize_points_vs_games(df):
-    st.subheader("Player Points vs Games Played")
+# Stats offered in the player comparison radar chart
+STATS_OPTIONS = ADAPTER.stats_options
 
-    # User Input for Filtering 
-    selected_year = st.selectbox("Select Season:", options=['All'] + df['Season'].unique().tolist(), key="pts_game_year")
-    selected_team = st.selectbox("Select Team:", options=['All'] + df['TEAM'].unique().tolist(), key="pts_game_team") 
-
-    # Filtered Data
-    filtered_df = df.copy()
-    if selected_team != 'All':
-        filtered_df = filtered_df[filtered_df['TEAM'] == selected_team]
-    if selected_year != 'All':
-        filtered_df = filtered_df[filtered_df['Season'] == selected_year]
-
-    # Visualizations
-    if not filtered_df.empty:
-        bar_fig = px.bar(filtered_df, x='PLAYER', y=['PTS', 'GP'], title='Player Points vs Games Played', barmode='group')
-        st.plotly_chart(bar_fig)
-    else:
-        st.warning("No data available for the selected filters.")
+# Columns shown in the stats table until the user picks others
+TABLE_COLUMNS = ADAPTER.table_columns
 
-def fg_pct_over_season(df, selected_player=None):
-    st.subheader("Field Goal PCT vs. Season")
+# Columns used by this page; everything else stays on disk
+PAGE_COLUMNS = ADAPTER.page_columns
 
-    # User Input for Filtering 
-    selected_season = st.selectbox("Select Season:", options=['All'] + df['Season'].unique().tolist(), key="fg_pct_year")
-    selected_player = st.selectbox("Select Player:", options=['All'] + df['PLAYER'].unique().tolist(), key="fg_pct_player") 
+def load_data(columns=PAGE_COLUMNS):
+    return league_page.load_data('nba', columns)
 
-    # Filtered Data
-    filtered_df = df.copy()
-    if selected_season != 'All':
-        filtered_df = filtered_df[filtered_df['Season'] == selected_season]
-    if selected_player != 'All':
-        filtered_df = filtered_df[filtered_df['PLAYER'] == selected_player]
+def load_index(columns=PAGE_COLUMNS):
+    return league_page.load_index('nba', columns)
 
-    plt.figure(figsize=(10, 6))
+def vizualize_points_vs_games(df, index):
+    league_page.leaders_bar_chart('nba', df, index, key="pts_game")
+
+@profiling.timed('viz.fg_pct_over_season')
+def fg_pct_over_season(df, index, selected_player=None):
+    st.subheader("Field Goal PCT vs. Season")
+
+    # User Input for Filtering 
+    selected_season = st.selectbox("Select Season:", options=['All'] + index.options('season'), key="fg_pct_year")
+    selected_player = st.selectbox("Select Player:", options=['All'] + index.options('player'), key="fg_pct_player") 
 
+    version = df.attrs.get('version')
     if selected_player != 'All':
-        # Filter data for selected player
-        player_df = df[df['PLAYER'] == selected_player]
-        sns.lineplot(x='Season', y='FG_PCT', data=player_df, marker='o', label=selected_player)
+        # The player's seasons are one slice of the trajectory arrays
+        build = lambda: plots.fg_pct_line(league_page.load_trajectories('nba').history(selected_player, ['FG_PCT']),
+                                          selected_player, selected_season)
     else:
-        # Group by Season and calculate the mean for FG_PCT
-        avg_fg_pct = df.groupby('Season')['FG_PCT'].mean().reset_index()  # Convert to DataFrame
-        sns.lineplot(x='Season', y='FG_PCT', data=avg_fg_pct, marker='o', label='Average FG%')
+        # Mean FG_PCT per season from the precomputed season summary
+        build = lambda: plots.fg_pct_line(aggregates.season_means('nba', 'FG_PCT'), 'Average FG%', selected_season)
 
-    plt.title('Field Goal Percentage Over Seasons')
-    plt.xlabel('Season')
-    plt.ylabel('Field Goal Percentage')
-    plt.xticks(rotation=45)
-    plt.legend()
+    # Rendered once per (player, season, dataset version); repeat views reuse the cached PNG
+    with profiling.span('render.matplotlib'):
+        png = plots.figure_cache.get_or_render(('fg_pct_over_season', selected_player, selected_season, version),
+                                               profiling.timed('compute.matplotlib_figure')(build))
+    profiling.image(png)
 
-    # Display the plot in Streamlit
-    st.pyplot(plt)
-
-def plot_fgm_vs_fga_comparison(df):
+@profiling.timed('viz.fgm_vs_fga_comparison')
+def plot_fgm_vs_fga_comparison(df, index):
     st.subheader("Compare FGM vs FGA Across Multiple Players")
 
     # User Input for Filtering
-    selected_season = st.selectbox("Select Season:", options=['All'] + df['Season'].unique().tolist(), key="fgm_vs_fga_season")
-    selected_players = st.multiselect("Select Players:", options=df['PLAYER'].unique().tolist(), key="fgm_vs_fga_players")
-
-    # Filtered Data by Season
-    filtered_df = df.copy()
-    if selected_season != 'All':
-        filtered_df = filtered_df[filtered_df['Season'] == selected_season]
-
-    # Filter by Selected Players
-    if selected_players:
-        filtered_df = filtered_df[filtered_df['PLAYER'].isin(selected_players)]
-
-    # Plot FGM vs FGA for the selected players
-    plt.figure(figsize=(10, 6))
-
-    if selected_players:
-        # Loop over the selected players and plot each one
-        for player in selected_players:
-            player_df = filtered_df[filtered_df['PLAYER'] == player]
-            sns.scatterplot(x='FGA', y='FGM', data=player_df, marker='o', label=player)
-    else:
+    selected_season = st.selectbox("Select Season:", options=['All'] + index.options('season'), key="fgm_vs_fga_season")
+    selected_players = st.multiselect("Select Players:", options=index.options('player'), key="fgm_vs_fga_players")
+
+    # Filtered Data by Season and Selected Players
+    filtered_df = aggregation.filter_rows('nba', df, index, [ADAPTER.player_col, 'FGM', 'FGA'],
+                                          season=selected_season, player=selected_players or None)
+
+    if not selected_players:
         st.warning("Please select at least one player for comparison.")
 
-    plt.title('Field Goals Made vs Field Goals Attempted - Player Comparison')
-    plt.xlabel('Field Goals Attempted (FGA)')
-    plt.ylabel('Field Goals Made (FGM)')
-    plt.legend(title="Players")
-    plt.grid(True)
-
-    # Display the plot in Streamlit
-    st.pyplot(plt)
-
-def visualize_player_comparison(df):
-    st.subheader("Player Comparison Across Multiple Stats")
-
-    stats_options = ['MIN', 'FGM', 'FG_PCT', 'FG3M','FG3A','FG3_PCT','FTM','FTA','FT_PCT','OREB','DREB','REB','AST','STL','BLK','TOV','PTS']
-
-    # User input for filtering
-    selected_players = st.multiselect("Select Players to Compare:", options=df['PLAYER'].unique().tolist(), default=df['PLAYER'].unique()[:2], key="comparison_players")
-    selected_stats = st.multiselect("Select Stats for Comparison:", options=stats_options, default=stats_options[:4], key="comparison_stats")
-
-
-    if selected_players and selected_stats:
-        # Normalize stats for comparison
-        filtered_df = df[df['PLAYER'].isin(selected_players)]
-        for stat in selected_stats:
-            filtered_df[stat] = filtered_df[stat].astype(float)
-
-        scaler = MinMaxScaler()
-        normalized_stats = scaler.fit_transform(filtered_df[selected_stats])
-        normalized_df = pd.DataFrame(normalized_stats, columns=selected_stats, index=filtered_df.index)
-
-        # Create radar chart
-        fig = go.Figure()
-        for player in selected_players:
-            player_data = normalized_df[filtered_df['PLAYER'] == player].mean()
-            fig.add_trace(go.Scatterpolar(
-                r=player_data,
-                theta=selected_stats,
-                fill='toself',
-                name=player
-            ))
-
-        fig.update_layout(
-            polar=dict(
-                radialaxis=dict(visible=True, range=[0, 1])),
-            showlegend=True,
-            title=f"Comparison of Selected Stats for {', '.join(selected_players)}"
-        )
+    # Plot FGM vs FGA for the selected players, rendered once per selection and dataset version
+    key = ('fgm_vs_fga', selected_season, tuple(selected_players), df.attrs.get('version'))
+    build = profiling.timed('compute.matplotlib_figure')(lambda: plots.fgm_vs_fga_scatter(filtered_df, selected_players))
+    with profiling.span('render.matplotlib'):
+        png = plots.figure_cache.get_or_render(key, build)
+    profiling.image(png)
 
-        st.plotly_chart(fig)
-    else:
-        st.warning("Please select at least one player and one stat for comparison.")
+def visualize_player_comparison(df, index):
+    league_page.player_comparison('nba', df, index)
+
+def visualize_similar_players(df, index):
+    league_page.similar_players('nba', df, index, key="nba_similar")
+
+def visualize_trajectory(df, index):
+    league_page.player_trajectory('nba', df, index, key="nba_trajectory")
+
+def visualize_projections(df, index):
+    league_page.next_season_projection('nba', df, index, key="nba_projection")
 
 def nba_stats():
     # Page Style
@@ -180,14 +119,19 @@ def nba_stats():
         """, unsafe_allow_html=True)
     
     df = load_data()
+    index = load_index()
 
-    st.dataframe(df)
+    # Only the visible page of the table is sent to the browser
+    table.paginated_table(df, key="nba_table", default_columns=TABLE_COLUMNS)
 
     # EDA Section
     st.markdown("<h1 style='text-align: center; color: black;'> EDA Visualizations </h1>", unsafe_allow_html=True)
     
     # Call the visualizations
-    visualize_player_comparison(df)
-    vizualize_points_vs_games(df)
-    fg_pct_over_season(df)
-    plot_fgm_vs_fga_comparison(df)
+    visualize_player_comparison(df, index)
+    visualize_similar_players(df, index)
+    visualize_trajectory(df, index)
+    vizualize_points_vs_games(df, index)
+    fg_pct_over_season(df, index)
+    plot_fgm_vs_fga_comparison(df, index)
+    visualize_projections(df, index)
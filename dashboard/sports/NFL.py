@@ -1,5 +1,6 @@
 import streamlit as st
-import pandas as pd
+from components import league_page, table
+from data.leagues import get_adapter
 
 def nfl_stats():
     # Page Style
@@ -16,7 +17,7 @@ def nfl_stats():
             unsafe_allow_html=True
         )
 
-    # MLB Title
+    # NFL Title
     st.markdown("<h1 style='text-align: center; color: black;'>NFL Data 🏈</h1>", unsafe_allow_html=True)
 
 
@@ -38,5 +39,19 @@ def nfl_stats():
         """, unsafe_allow_html=True)
 
     # Loading in the Data
+    df = league_page.load_data('nfl')
+    if df.empty:
+        st.info("No NFL data yet. Run `python -m data.fetch_data nfl` to fetch it.")
+        return
+    index = league_page.load_index('nfl')
 
-    ### FIGURE OUT WHAT I AM DOING WITH DATA FOR NFL
\ No newline at end of file
+    # Only the visible page of the table is sent to the browser
+    table.paginated_table(df, key="nfl_table", default_columns=get_adapter('nfl').table_columns)
+
+    # EDA Section
+    st.markdown("<h1 style='text-align: center; color: black;'> EDA Visualizations </h1>", unsafe_allow_html=True)
+
+    # Same building blocks as the MLB and NBA pages, driven by the NFL adapter's columns
+    league_page.player_comparison('nfl', df, index)
+    league_page.similar_players('nfl', df, index, key="nfl_similar")
+    league_page.leaders_bar_chart('nfl', df, index, key="nfl_yards")
@@ -0,0 +1,4 @@
+# data package: fetchers and the shared data layer used by the dashboard
+import os
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
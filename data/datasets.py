@@ -0,0 +1,96 @@
+#datasets.py
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from data import store
+from data.indexes import FilterIndex
+from data.schema import SCHEMAS
+
+# Copy-on-Write makes column selections and filtered frames share memory with the
+# cached dataset, and writes to them never reach the cache. It is always on from pandas 3.
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.options.mode.copy_on_write = True
+
+# Maximum number of (league, columns) datasets kept in memory per process
+MAX_DATASETS = 8
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+
+def get_dataset(league, columns=None):
+    # One shared, read-only copy of each league dataset per process, reloaded when
+    # the files on disk change. Callers must not mutate the returned frame.
+    # The published store root is resolved once, so the version and the rows come from the same snapshot
+    key = (league, None if columns is None else tuple(columns))
+    root = store.current_root()
+    version = store.dataset_version(league, root)
+    with _lock:
+        entry = _cache.get(key)
+        if entry is not None and entry['version'] == version:
+            _cache.move_to_end(key)
+            stats['hits'] += 1
+            return entry['df']
+        if entry is not None:
+            stats['invalidations'] += 1
+        stats['misses'] += 1
+
+    # Load outside the lock so one slow read doesn't block other leagues
+    df = store.read_league(league, columns=None if columns is None else list(columns), store_dir=root)
+    df.attrs['league'] = league
+    df.attrs['version'] = version
+
+    with _lock:
+        _cache[key] = {'version': version, 'df': df, 'derived': {}}
+        _cache.move_to_end(key)
+        # Drop stale versions of this dataset and the least recently used entries
+        for other in [k for k, e in _cache.items() if k[0] == league and e['version'] != version]:
+            del _cache[other]
+        while len(_cache) > MAX_DATASETS:
+            _cache.popitem(last=False)
+    return df
+
+
+def get_derived(league, name, builder, columns=None):
+    # Cache builder(df) next to get_dataset(league, columns) so structures derived from a
+    # dataset (indexes, normalized matrices, ...) are built once per dataset version
+    df = get_dataset(league, columns)
+    key = (league, None if columns is None else tuple(columns))
+    with _lock:
+        entry = _cache.get(key)
+        if entry is not None and entry['df'] is df and name in entry['derived']:
+            stats['hits'] += 1
+            return entry['derived'][name]
+        stats['misses'] += 1
+
+    value = builder(df)
+    with _lock:
+        entry = _cache.get(key)
+        if entry is not None and entry['df'] is df:
+            entry['derived'][name] = value
+    return value
+
+
+def get_index(league, columns=None):
+    # FilterIndex over get_dataset(league, columns), built once per dataset version
+    schema = SCHEMAS[league]
+    return get_derived(
+        league, 'index',
+        lambda df: FilterIndex(df, schema['index'], newest_first=schema.get('newest_first', False)),
+        columns,
+    )
+
+
+def memory_bytes():
+    # Bytes held by the cached datasets (shared columns are counted once per dataset)
+    with _lock:
+        frames = [entry['df'] for entry in _cache.values()]
+    return int(sum(df.memory_usage(deep=True, index=False).sum() for df in frames))
+
+
+def clear():
+    with _lock:
+        _cache.clear()
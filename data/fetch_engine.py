@@ -0,0 +1,199 @@
+#fetch_engine.py
+import json
+import os
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from data.request_governor import DEFAULT_LIMITER, RetryPolicy
+
+# Default number of requests allowed in flight at the same time
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_TIMEOUT = 30
+
+# stats.nba.com drops requests that don't look like they come from a browser
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36',
+    'Accept': 'application/json, text/plain, */*',
+    'Referer': 'https://www.nba.com/',
+    'Origin': 'https://www.nba.com',
+}
+
+# One unit of work: key identifies the partition (e.g. (year, offset)), url/params the request.
+# cache_key is the (league, season, part) entry in the response cache and max_age its TTL in
+# seconds (None = never expires, revalidation still happens through ETag/Last-Modified when stale).
+FetchTask = namedtuple('FetchTask', ['key', 'url', 'params', 'cache_key', 'max_age'], defaults=(None, None))
+
+# Outcome of a task: payload is the decoded JSON when status_code == 200, error is set on exceptions.
+# from_cache is True when no request was sent or the server answered 304 Not Modified,
+# attempts counts the requests sent including retries.
+FetchResult = namedtuple('FetchResult', ['key', 'status_code', 'payload', 'error', 'from_cache', 'attempts'], defaults=(False, 0))
+
+
+def make_session(pool_size=DEFAULT_MAX_WORKERS, headers=None):
+    # A single session shares keep-alive connections between all worker threads
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update(DEFAULT_HEADERS if headers is None else headers)
+    return session
+
+
+def _send(session, task, headers, timeout, limiter, retry):
+    # Send one request, retrying throttled/transient failures with backoff
+    attempt = 0
+    while True:
+        attempt += 1
+        if limiter is not None:
+            limiter.acquire(task.url)
+        try:
+            response = session.get(task.url, params=task.params, headers=headers, timeout=timeout)
+        except requests.RequestException as e:
+            if retry.should_retry(attempt, error=e):
+                time.sleep(retry.delay(attempt))
+                continue
+            return None, e, attempt
+
+        if retry.should_retry(attempt, status_code=response.status_code):
+            time.sleep(retry.delay(attempt, response.headers.get('Retry-After')))
+            continue
+        return response, None, attempt
+
+
+def _run_task(session, task, timeout, cache, limiter, retry):
+    entry = None
+    if cache is not None and task.cache_key is not None:
+        entry = cache.get(task.cache_key)
+        # Fresh entries are served straight from disk without touching the network
+        if cache.is_fresh(entry, task.max_age):
+            return FetchResult(task.key, 200, entry['payload'], None, True, 0)
+
+    headers = cache.conditional_headers(entry) if entry is not None else None
+    response, error, attempts = _send(session, task, headers, timeout, limiter, retry)
+    if error is not None:
+        return FetchResult(task.key, None, None, error, False, attempts)
+
+    if response.status_code == 304 and entry is not None:
+        cache.touch(task.cache_key, entry)
+        return FetchResult(task.key, 200, entry['payload'], None, True, attempts)
+
+    if response.status_code != 200:
+        return FetchResult(task.key, response.status_code, None, None, False, attempts)
+
+    try:
+        payload = response.json()
+    except ValueError as e:
+        return FetchResult(task.key, response.status_code, None, e, False, attempts)
+
+    if cache is not None and task.cache_key is not None:
+        cache.put(task.cache_key, payload, response.headers)
+    return FetchResult(task.key, response.status_code, payload, None, False, attempts)
+
+
+def fetch_all(tasks, session=None, max_workers=DEFAULT_MAX_WORKERS, timeout=DEFAULT_TIMEOUT, cache=None,
+              limiter=DEFAULT_LIMITER, retry=None):
+    # Run every task on a thread pool and return the results in the same order as tasks.
+    # With a ResponseCache, tasks that carry a cache_key are served or revalidated from disk.
+    # Requests go through the per-host rate limiter and are retried per `retry` (a fresh
+    # RetryPolicy, and so a fresh retry budget, for each call by default).
+    tasks = list(tasks)
+    return list(iter_fetch(tasks, session, max_workers, timeout, cache, limiter, retry, window=len(tasks)))
+
+
+def iter_fetch(tasks, session=None, max_workers=DEFAULT_MAX_WORKERS, timeout=DEFAULT_TIMEOUT, cache=None,
+               limiter=DEFAULT_LIMITER, retry=None, window=None):
+    # Same as fetch_all, but yields each result (in task order) as soon as it is ready and keeps
+    # at most `window` tasks (2 per worker by default) submitted ahead of the consumer, so the
+    # payloads held in memory don't grow with the number of tasks
+    tasks = list(tasks)
+    if not tasks:
+        return
+
+    if retry is None:
+        retry = RetryPolicy()
+    max_workers = max(1, min(max_workers, len(tasks)))
+    window = max(1, window or 2 * max_workers)
+    own_session = session is None
+    if own_session:
+        session = make_session(pool_size=max_workers)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            submit = lambda task: executor.submit(_run_task, session, task, timeout, cache, limiter, retry)
+            remaining = iter(tasks)
+            pending = deque(submit(task) for task in islice(remaining, window))
+            while pending:
+                result = pending.popleft().result()
+                for task in islice(remaining, 1):
+                    pending.append(submit(task))
+                yield result
+    finally:
+        if own_session:
+            session.close()
+
+
+def without_payload(result):
+    # What FetchReport needs from a result once its payload has been written out: a
+    # successful result keeps a non-None (empty) payload so it isn't counted as failed
+    return result._replace(payload=None if result.payload is None else {})
+
+
+class FetchReport:
+    # Summary of a fetch run. failed lists every partition that could not be fetched
+    # so it can be re-run; a report with failures means the dataset is incomplete.
+
+    def __init__(self, league, results, retries_used=0):
+        self.league = league
+        self.requested = len(results)
+        self.from_cache = sum(1 for r in results if r.from_cache)
+        self.requests_sent = sum(r.attempts for r in results)
+        self.retries_used = retries_used
+        self.failed = [
+            {
+                'key': list(r.key) if isinstance(r.key, tuple) else r.key,
+                'status_code': r.status_code,
+                'error': None if r.error is None else repr(r.error),
+                'attempts': r.attempts,
+            }
+            for r in results if r.payload is None
+        ]
+
+    @property
+    def complete(self):
+        return not self.failed
+
+    def failed_keys(self):
+        return [tuple(f['key']) if isinstance(f['key'], list) else f['key'] for f in self.failed]
+
+    def to_dict(self):
+        return {
+            'league': self.league,
+            'complete': self.complete,
+            'requested': self.requested,
+            'from_cache': self.from_cache,
+            'requests_sent': self.requests_sent,
+            'retries_used': self.retries_used,
+            'failed': self.failed,
+        }
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        # The report a previous run saved to path
+        with open(path) as f:
+            saved = json.load(f)
+        report = cls(saved['league'], [], saved['retries_used'])
+        report.requested = saved['requested']
+        report.from_cache = saved['from_cache']
+        report.requests_sent = saved['requests_sent']
+        report.failed = saved['failed']
+        return report
@@ -0,0 +1,69 @@
+#indexes.py
+import numpy as np
+import pandas as pd
+
+# Key used by the dashboards for "no filter"
+ALL = 'All'
+
+
+class FilterIndex:
+    # Value -> row positions lookup for the columns the dashboards filter on.
+    # Built once per dataset version; filters intersect position arrays instead of
+    # scanning the whole frame with boolean masks.
+
+    def __init__(self, df, columns, newest_first=False):
+        # columns maps a filter name ('season', 'team', 'player') to a column of df
+        self.columns = dict(columns)
+        self.num_rows = len(df)
+        self._positions = {}
+        self._options = {}
+        self._first_seen = {}
+        for name, col in self.columns.items():
+            if col not in df.columns:
+                continue
+            codes, uniques = pd.factorize(df[col], sort=False)
+            uniques = list(uniques.tolist() if hasattr(uniques, 'tolist') else uniques)
+            # One stable argsort groups the row positions of every value, in row order
+            order = np.argsort(codes, kind='stable')
+            bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+            self._positions[name] = {
+                value: order[bounds[i]:bounds[i + 1]] for i, value in enumerate(uniques)
+            }
+            self._first_seen[name] = uniques
+            if name == 'season':
+                self._options[name] = sorted(uniques, reverse=newest_first)
+            else:
+                self._options[name] = sorted(uniques, key=str)
+
+    def options(self, name):
+        # Sorted distinct values, ready for a selectbox
+        return self._options.get(name, [])
+
+    def first_values(self, name, n):
+        # The first n distinct values in row order (e.g. top-ranked players for defaults)
+        return self._first_seen.get(name, [])[:n]
+
+    def positions(self, name, value):
+        return self._positions.get(name, {}).get(value, np.empty(0, dtype=np.intp))
+
+    def select(self, **filters):
+        # Row positions matching every filter; a filter is a value, a list of values
+        # (any of), or None/'All' (no filter). Returns None when nothing is filtered.
+        result = None
+        for name, value in filters.items():
+            if value is None or (isinstance(value, str) and value == ALL):
+                continue
+            if isinstance(value, (list, tuple, set)):
+                parts = [self.positions(name, v) for v in value]
+                matched = np.unique(np.concatenate(parts)) if parts else np.empty(0, dtype=np.intp)
+            else:
+                matched = self.positions(name, value)
+            result = matched if result is None else np.intersect1d(result, matched, assume_unique=True)
+        return result
+
+    def subset(self, df, **filters):
+        # df restricted to the matching rows, in their original order
+        positions = self.select(**filters)
+        if positions is None:
+            return df
+        return df.iloc[positions]
@@ -0,0 +1,23 @@
+# League adapter registry: every league the app knows about, keyed by its short name
+# ('mlb', 'nba', 'nfl'). Adding a league means adding an adapter module here plus its
+# SCHEMAS entry in data/schema.py; the fetch pipeline, stores and pages are shared.
+
+ADAPTERS = {}
+
+
+def register(adapter):
+    ADAPTERS[adapter.name] = adapter
+    return adapter
+
+
+def get_adapter(league):
+    if league not in ADAPTERS:
+        raise ValueError(f"Unknown league: {league}")
+    return ADAPTERS[league]
+
+
+def leagues():
+    return list(ADAPTERS)
+
+
+from data.leagues import mlb, nba, nfl  # noqa: E402,F401  (modules register themselves)
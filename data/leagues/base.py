@@ -0,0 +1,90 @@
+#base.py
+import copy
+
+import pandas as pd
+
+# Shared player-season layout: every league's rows are mapped onto these key columns
+# (stat columns keep the league's own names). It is the layout of the SQLite tables.
+NORMALIZED_KEYS = ['league', 'season', 'season_label', 'player_id', 'player_name', 'team_id', 'team_name', 'position']
+
+
+class LeagueAdapter:
+    # Everything that differs between leagues: the source API, how to page through it,
+    # how to turn one response into rows, and which columns hold the shared keys.
+    # The fetch pipeline, the stores and the dashboard components only talk to adapters.
+
+    name = None
+    title = None
+    api_url = None
+    # Seasons fetched by default: num_years seasons ending with current_year
+    current_year = None
+    num_years = 10
+    # Storage order of seasons (the NBA fetcher has always listed newest first)
+    newest_first = False
+    # Normalized key -> source column ('position' is optional)
+    key_columns = {}
+
+    # Dashboard configuration: radar chart stats, default table columns, columns the page
+    # loads, and the (stats, title) of the bar chart of top players / team totals
+    stats_options = []
+    table_columns = []
+    page_columns = []
+    bar_chart = None
+
+    def season_label(self, year):
+        return year
+
+    def seasons(self, num_years=None):
+        # Season labels in storage order
+        years = range(self.current_year - (num_years or self.num_years) + 1, self.current_year + 1)
+        labels = [self.season_label(year) for year in years]
+        return labels[::-1] if self.newest_first else labels
+
+    def current_season(self, seasons):
+        return seasons[0] if self.newest_first else seasons[-1]
+
+    def build_tasks(self, seasons, api_url, max_age_for):
+        # FetchTasks for the given seasons; max_age_for(season) is the cache TTL to use
+        raise NotImplementedError
+
+    def next_pages(self, task, result):
+        # Further FetchTasks found from a first page's response (e.g. its total row count)
+        return []
+
+    def with_options(self, **options):
+        # A copy of the adapter with some attributes changed (e.g. game_types for MLB)
+        adapter = copy.copy(self)
+        for name, value in options.items():
+            if not hasattr(adapter, name):
+                raise AttributeError(f"{type(self).__name__} has no option {name!r}")
+            setattr(adapter, name, value)
+        return adapter
+
+    def parse(self, result):
+        # Rows (a DataFrame) from one successful FetchResult, or None when it holds no players
+        raise NotImplementedError
+
+    @property
+    def season_col(self):
+        return self.key_columns['season']
+
+    @property
+    def player_col(self):
+        return self.key_columns['player_name']
+
+    @property
+    def team_col(self):
+        return self.key_columns['team_name']
+
+    def normalize(self, df):
+        # Map a league frame onto NORMALIZED_KEYS plus its stat columns
+        keys = {key: col for key, col in self.key_columns.items() if col in df.columns}
+        out = pd.DataFrame({'league': self.name}, index=df.index)
+        for key, col in keys.items():
+            out[key] = df[col].astype(str) if key in ('player_name', 'team_name', 'position') else df[col]
+        season = df[self.season_col].astype(str)
+        # NBA seasons are labelled '2023-24'; the numeric season is the year it starts in
+        out['season'] = season.str[:4].astype(int)
+        out['season_label'] = season
+        stats = df[[col for col in df.columns if col not in keys.values()]]
+        return pd.concat([out, stats], axis=1)
@@ -0,0 +1,97 @@
+#mlb.py
+import pandas as pd
+
+from data.fetch_engine import FetchTask
+from data.leagues import register
+from data.leagues.base import LeagueAdapter
+from data.schema import player_seasons
+
+# Rows asked for per page; fewer, bigger pages cut the per-request overhead. The API doesn't
+# document a maximum: when it serves fewer rows than asked (and fewer than totalSize), that
+# row count is its page size and the remaining pages are requested in steps of it.
+MAX_PAGE_SIZE = 1000
+
+# Sort order of each stat group (the first page holds the leaders)
+GROUP_SORT = {
+    'hitting': ('onBasePlusSlugging', 'desc'),
+    'pitching': ('inningsPitched', 'desc'),
+    'fielding': ('gamesPlayed', 'desc'),
+}
+
+
+class MLBAdapter(LeagueAdapter):
+    # MLB player stats from the bdfed stats API, one adapter per stat group. Every player
+    # (qualified or not) is fetched: the first page of each season and game type says how many
+    # rows there are (totalSize) and how many a page holds, and the remaining pages are then
+    # requested concurrently. Rows carry their gameType; only the regular season ('R') makes up
+    # the player seasons the dashboards read (schema.player_seasons).
+    api_url = 'https://bdfed.stitch.mlbinfra.com/bdfed/stats/player'
+    current_year = 2022
+    key_columns = {
+        'season': 'year', 'player_id': 'playerId', 'player_name': 'playerFullName',
+        'team_id': 'teamId', 'team_name': 'teamName', 'position': 'positionAbbrev',
+    }
+    page_size = MAX_PAGE_SIZE
+    # 'R' regular season, 'P' postseason, 'S' spring training, ...
+    game_types = ('R',)
+
+    # The MLB page shows the hitting dataset
+    stats_options = ['homeRuns', 'avg', 'obp', 'slg', 'rbi', 'runs', 'hits', 'strikeOuts']
+    table_columns = ['year', 'playerFullName', 'teamName', 'positionAbbrev', 'gamesPlayed', 'atBats', 'hits', 'homeRuns', 'rbi', 'avg', 'obp', 'slg', 'ops']
+    page_columns = [
+        'year', 'playerId', 'playerFullName', 'teamName', 'teamAbbrev', 'positionAbbrev',
+        'gamesPlayed', 'plateAppearances', 'atBats', 'runs', 'hits', 'doubles', 'triples', 'homeRuns', 'rbi',
+        'baseOnBalls', 'strikeOuts', 'stolenBases', 'avg', 'obp', 'slg', 'ops',
+    ]
+    bar_chart = (['homeRuns', 'rbi'], 'Home Runs and RBIs')
+
+    def __init__(self, group='hitting'):
+        self.group = group
+        self.name = 'mlb' if group == 'hitting' else f"mlb_{group}"
+        self.title = 'MLB' if group == 'hitting' else f"MLB {group}"
+        if group != 'hitting':
+            self.stats_options, self.table_columns, self.page_columns, self.bar_chart = [], [], [], None
+
+    def build_tasks(self, seasons, api_url, max_age_for):
+        # The first page of every season and game type
+        return [self._page_task(year, game_type, 0, api_url, max_age_for(year))
+                for year in seasons for game_type in self.game_types]
+
+    def next_pages(self, task, result):
+        year, game_type, offset = task.key
+        total = result.payload.get('totalSize') or 0
+        served = len(result.payload.get('stats') or [])
+        # A short first page that isn't the last one shows the server's own page size
+        page_size = served if 0 < served < min(self.page_size, total - offset) else self.page_size
+        return [self._page_task(year, game_type, next_offset, task.url, task.max_age, page_size)
+                for next_offset in range(offset + page_size, total, page_size)]
+
+    def _page_task(self, year, game_type, offset, api_url, max_age, page_size=None):
+        page_size = page_size or self.page_size
+        sort_stat, order = GROUP_SORT[self.group]
+        params = {
+            'env': 'prod', 'season': year, 'sportId': 1, 'stats': 'season', 'group': self.group,
+            'gameType': game_type, 'playerPool': 'ALL', 'limit': page_size, 'offset': offset,
+            'sortStat': sort_stat, 'order': order,
+        }
+        cache_key = (self.name, year, f"{game_type}_{offset}_{page_size}")
+        return FetchTask((year, game_type, offset), api_url, params, cache_key, max_age)
+
+    def parse(self, result):
+        data = result.payload
+        # Check if 'stats' key exists and contains data
+        if 'stats' in data and data['stats']:
+            df = pd.DataFrame(data['stats'])
+            df['gameType'] = result.key[1]
+            return df
+        return None
+
+    def normalize(self, df):
+        # The SQLite tables hold one row per player-season: keep the regular season
+        return super().normalize(player_seasons(self.name, df))
+
+
+register(MLBAdapter('hitting'))
+# Pitching and fielding are stored as their own datasets (no dashboard page yet)
+register(MLBAdapter('pitching'))
+register(MLBAdapter('fielding'))
@@ -0,0 +1,53 @@
+#nba.py
+import pandas as pd
+
+from data.fetch_engine import FetchTask
+from data.leagues import register
+from data.leagues.base import LeagueAdapter
+
+
+class NBAAdapter(LeagueAdapter):
+    # NBA playoff scoring leaders from stats.nba.com, one request per season
+    name = 'nba'
+    title = 'NBA'
+    api_url = 'https://stats.nba.com/stats/leagueLeaders'
+    current_year = 2023  # Adjust based on the current season
+    newest_first = True
+    key_columns = {
+        'season': 'Season', 'player_id': 'PLAYER_ID', 'player_name': 'PLAYER',
+        'team_id': 'TEAM_ID', 'team_name': 'TEAM',
+    }
+
+    stats_options = ['MIN', 'FGM', 'FG_PCT', 'FG3M','FG3A','FG3_PCT','FTM','FTA','FT_PCT','OREB','DREB','REB','AST','STL','BLK','TOV','PTS']
+    table_columns = ['Season', 'PLAYER', 'TEAM', 'GP', 'MIN', 'PTS', 'REB', 'AST', 'STL', 'BLK', 'FG_PCT', 'FG3_PCT', 'FT_PCT']
+    page_columns = [
+        'PLAYER_ID', 'PLAYER', 'TEAM', 'Season', 'GP', 'MIN', 'FGM', 'FGA', 'FG_PCT', 'FG3M', 'FG3A', 'FG3_PCT',
+        'FTM', 'FTA', 'FT_PCT', 'OREB', 'DREB', 'REB', 'AST', 'STL', 'BLK', 'TOV', 'PTS', 'EFF',
+    ]
+    bar_chart = (['PTS', 'GP'], 'Player Points vs Games Played')
+
+    def season_label(self, year):
+        # e.g. 2023 -> '2023-24'
+        return f"{year}-{str(year + 1)[-2:]}"
+
+    def build_tasks(self, seasons, api_url, max_age_for):
+        tasks = []
+        for season in seasons:
+            params = {
+                'LeagueID': '00', 'PerMode': 'PerGame', 'Scope': 'S', 'Season': season,
+                'SeasonType': 'Playoffs', 'StatCategory': 'PTS',
+            }
+            tasks.append(FetchTask(season, api_url, params, ('nba', season, 'PTS'), max_age_for(season)))
+        return tasks
+
+    def parse(self, result):
+        # Column names and rows come separately; add a 'Season' column to track the season
+        result_set = result.payload['resultSet']
+        if not result_set['rowSet']:
+            return None
+        df = pd.DataFrame(result_set['rowSet'], columns=result_set['headers'])
+        df['Season'] = result.key
+        return df
+
+
+register(NBAAdapter())
@@ -0,0 +1,82 @@
+#nfl.py
+import math
+
+import pandas as pd
+
+from data.fetch_engine import FetchTask
+from data.leagues import register
+from data.leagues.base import LeagueAdapter
+
+# Athlete fields kept from each entry of the ESPN payload (source key -> column)
+ATHLETE_FIELDS = {'id': 'athleteId', 'displayName': 'displayName', 'teamId': 'teamId', 'teamShortName': 'teamAbbrev'}
+
+
+class NFLAdapter(LeagueAdapter):
+    # NFL regular-season player stats from ESPN's statistics-by-athlete endpoint. Stats come
+    # grouped in categories (general, passing, rushing, ...): the stat names are listed once
+    # at the top level and every athlete carries one list of values per category. The first
+    # page of a season says how many pages there are (pagination.pages, or count / limit) and
+    # the remaining ones are then requested concurrently.
+    name = 'nfl'
+    title = 'NFL'
+    api_url = 'https://site.web.api.espn.com/apis/common/v3/sports/football/nfl/statistics/byathlete'
+    current_year = 2023
+    page_size = 50
+    key_columns = {
+        'season': 'season', 'player_id': 'athleteId', 'player_name': 'displayName',
+        'team_id': 'teamId', 'team_name': 'teamAbbrev', 'position': 'position',
+    }
+
+    stats_options = ['passingYards', 'passingTouchdowns', 'rushingYards', 'rushingTouchdowns',
+                     'receptions', 'receivingYards', 'receivingTouchdowns', 'totalTackles', 'sacks']
+    table_columns = ['season', 'displayName', 'teamAbbrev', 'position', 'gamesPlayed', 'passingYards',
+                     'passingTouchdowns', 'rushingYards', 'rushingTouchdowns', 'receivingYards', 'receivingTouchdowns']
+    page_columns = [
+        'season', 'athleteId', 'displayName', 'teamAbbrev', 'position', 'gamesPlayed',
+        'completions', 'passingAttempts', 'passingYards', 'passingTouchdowns', 'interceptions',
+        'rushingAttempts', 'rushingYards', 'rushingTouchdowns', 'receptions', 'receivingYards',
+        'receivingTouchdowns', 'totalTackles', 'sacks',
+    ]
+    bar_chart = (['rushingYards', 'receivingYards'], 'Rushing and Receiving Yards')
+
+    def build_tasks(self, seasons, api_url, max_age_for):
+        # The first page of every season
+        return [self._page_task(season, 1, api_url, max_age_for(season)) for season in seasons]
+
+    def next_pages(self, task, result):
+        season, page = task.key
+        pagination = result.payload.get('pagination') or {}
+        pages = pagination.get('pages')
+        if pages is None:
+            pages = math.ceil((pagination.get('count') or 0) / (pagination.get('limit') or self.page_size))
+        return [self._page_task(season, next_page, task.url, task.max_age) for next_page in range(page + 1, pages + 1)]
+
+    def _page_task(self, season, page, api_url, max_age):
+        params = {
+            'region': 'us', 'lang': 'en', 'contentorigin': 'espn', 'isqualified': 'false',
+            'season': season, 'seasontype': 2, 'limit': self.page_size, 'page': page,
+            'sort': 'general.gamesPlayed:desc',
+        }
+        return FetchTask((season, page), api_url, params, ('nfl', season, f"page_{page}"), max_age)
+
+    def parse(self, result):
+        data = result.payload
+        if not data.get('athletes'):
+            return None
+        names = {category['name']: category.get('names', []) for category in data.get('categories', [])}
+        rows = []
+        for entry in data['athletes']:
+            athlete = entry.get('athlete', {})
+            row = {'season': result.key[0]}
+            for field, col in ATHLETE_FIELDS.items():
+                row[col] = athlete.get(field)
+            row['position'] = (athlete.get('position') or {}).get('abbreviation')
+            for category in entry.get('categories', []):
+                for stat, value in zip(names.get(category['name'], []), category.get('values', [])):
+                    # A few stats (e.g. gamesPlayed) appear in several categories; the first one wins
+                    row.setdefault(stat, value)
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+
+register(NFLAdapter())
@@ -0,0 +1,295 @@
+#pipeline.py
+import os
+from itertools import islice
+
+import pandas as pd
+
+from analytics import aggregates, zscores
+from data import DATA_DIR, store
+from data.fetch_engine import DEFAULT_MAX_WORKERS, FetchReport, fetch_all, iter_fetch, make_session, without_payload
+from data.leagues import get_adapter
+from data.request_governor import DEFAULT_LIMITER, RetryPolicy
+from data.response_cache import ResponseCache
+from data.schema import apply_schema
+from db import db_setup
+
+# Shared fetch -> normalize -> store pipeline. The league adapter says what to request
+# and how to read a response; everything else is the same for every league.
+
+# Page numbers reserved for the follow-up pages of one first page when staging
+PAGE_STRIDE = 10000
+
+# Cached responses for the season in progress are refetched after this many seconds;
+# finished seasons never change so their cache entries never expire
+CURRENT_SEASON_TTL = 6 * 60 * 60
+
+def seasons_to_refresh(csv_path, season_col, seasons):
+    # Incremental mode: the current (last) season plus any season missing from the existing dataset
+    if not os.path.exists(csv_path):
+        return list(seasons)
+    existing = set(pd.read_csv(csv_path, usecols=[season_col])[season_col].astype(str))
+    current = seasons[-1]
+    return [season for season in seasons if season == current or str(season) not in existing]
+
+def merge_seasons(csv_path, season_col, new_df, fetched_seasons, seasons):
+    # Replace the refetched seasons in the existing dataset and keep the others untouched
+    if not os.path.exists(csv_path):
+        return new_df
+    existing = pd.read_csv(csv_path)
+    fetched = {str(season) for season in fetched_seasons}
+    kept = existing[~existing[season_col].astype(str).isin(fetched)]
+    merged = pd.concat([kept, new_df], ignore_index=True)
+    # Restore the fetcher's season ordering (stable, so rank order inside a season is kept)
+    order = {str(season): i for i, season in enumerate(seasons)}
+    merged = merged.iloc[merged[season_col].astype(str).map(order).fillna(len(order)).argsort(kind='stable')]
+    return merged.reset_index(drop=True)
+
+def report_path(league):
+    return os.path.join(DATA_DIR, f"fetch_report_{league}.json")
+
+def finish_report(league, results, retry):
+    # Record what was fetched; failed partitions are listed so --retry-failed can re-run them
+    report = FetchReport(league, results, retry.retries_used)
+    report.save(report_path(league))
+    if not report.complete:
+        print(f"{len(report.failed)} of {report.requested} {league.upper()} requests failed; see {report_path(league)}")
+    return report
+
+def failed_seasons(league):
+    # Seasons listed in the last run's report (paged leagues have (season, page) keys)
+    if not os.path.exists(report_path(league)):
+        return []
+    keys = FetchReport.load(report_path(league)).failed_keys()
+    return list(dict.fromkeys(key[0] if isinstance(key, tuple) else key for key in keys))
+
+def save_live(league, df=None, seasons=None):
+    # Write the CSV snapshot and the SQLite store. Both live outside the store roots, so they
+    # must only ever follow the published root: a refresh building a new root (live=False)
+    # leaves them alone and calls this once the root is published. df is the full dataset, or
+    # None to rebuild the CSV from the published partitions; seasons are the ones SQLite
+    # replaces (all of them by default).
+    if df is None:
+        store.export_csv(league)
+        df = store.read_league(league, seasons=seasons)
+    else:
+        store.write_atomic(store.CSV_PATHS[league], lambda f: df.to_csv(f, index=False))
+    db_setup.load_league(league, df, seasons=seasons, version=store.dataset_version(league))
+
+def save(league, df, seasons=None, store_dir=None, live=True):
+    # Save the refetched seasons to the columnar store and, when live, the combined data to the
+    # CSV snapshot and the same seasons into the SQLite store the dashboards query. The
+    # aggregate tables are then rebuilt from the full dataset and the changed seasons rescored.
+    # store_dir is the store root to write (the published one by default).
+    store_dir = store_dir or store.current_root()
+    store.write_partitions(league, df, seasons=seasons, store_dir=store_dir)
+    if live:
+        save_live(league, df, seasons)
+    aggregates.materialize(league, df, store_dir)
+    zscores.update(league, store_dir)
+
+def select_seasons(adapter, seasons, incremental=False, only_seasons=None):
+    # The seasons a run fetches: the given ones, the failed ones, or (incremental) the current and missing ones
+    if only_seasons is not None:
+        return [season for season in seasons if season in set(only_seasons)]
+    if incremental:
+        # seasons_to_refresh treats the last entry as the current season
+        csv_path = store.CSV_PATHS[adapter.name]
+        refresh = set(seasons_to_refresh(csv_path, adapter.season_col, seasons[::-1] if adapter.newest_first else seasons))
+        return [season for season in seasons if season in refresh]
+    return list(seasons)
+
+def max_age_for(adapter, seasons):
+    # Cache TTL of a season's responses: only the season in progress expires
+    current_season = adapter.current_season(seasons)
+    return lambda season: CURRENT_SEASON_TTL if season == current_season else None
+
+def task_season(task):
+    # Paged leagues key their tasks (season, page); the others by season alone
+    return task.key[0] if isinstance(task.key, tuple) else task.key
+
+def fetch_pages(adapter, tasks, session=None, max_workers=DEFAULT_MAX_WORKERS, cache=None, retry=None,
+                limiter=DEFAULT_LIMITER):
+    # Fetch the first page of every task, then every further page the adapter discovers from
+    # those responses (e.g. from a total row count), all concurrently and over one session.
+    # Results come back in page order: each first page followed by its own follow-up pages.
+    own_session = session is None
+    if own_session:
+        session = make_session(pool_size=max_workers)
+    try:
+        first = fetch_all(tasks, session=session, max_workers=max_workers, cache=cache, retry=retry, limiter=limiter)
+        follow_ups = [adapter.next_pages(task, result) if result.payload is not None else []
+                      for task, result in zip(tasks, first)]
+        rest = iter(fetch_all([task for pages in follow_ups for task in pages], session=session,
+                              max_workers=max_workers, cache=cache, retry=retry, limiter=limiter))
+    finally:
+        if own_session:
+            session.close()
+    results = []
+    for result, pages in zip(first, follow_ups):
+        results.append(result)
+        results.extend(islice(rest, len(pages)))
+    return results
+
+def run(league, seasons=None, max_workers=DEFAULT_MAX_WORKERS, session=None, api_url=None, incremental=False,
+        cache=None, retry=None, only_seasons=None, allow_partial=False, adapter=None, store_dir=None, live=True):
+    # adapter overrides the registered one, e.g. with other game types; store_dir is the store
+    # root to write and live=False leaves the CSV snapshot and SQLite to the caller (see save_live)
+    adapter = adapter or get_adapter(league)
+    csv_path = store.CSV_PATHS[league]
+    if seasons is None:
+        seasons = adapter.seasons()
+    seasons_to_fetch = select_seasons(adapter, seasons, incremental, only_seasons)
+    merge = incremental or only_seasons is not None
+    if cache is None:
+        cache = ResponseCache()
+    if retry is None:
+        retry = RetryPolicy()
+
+    tasks = adapter.build_tasks(seasons_to_fetch, api_url or adapter.api_url, max_age_for(adapter, seasons))
+
+    # Make the API requests concurrently; results come back in page order
+    results = fetch_pages(adapter, tasks, session=session, max_workers=max_workers, cache=cache, retry=retry)
+    report = finish_report(league, results, retry)
+    all_data = []
+    for result in results:
+        if result.payload is not None:
+            df = adapter.parse(result)
+            if df is not None:
+                all_data.append(df)
+            else:
+                print(f"No player data returned for {league.upper()} {result.key}.")
+        elif result.error is not None:
+            print(f"Failed to fetch {league.upper()} data for {result.key}. Error: {result.error}")
+        else:
+            print(f"Failed to fetch {league.upper()} data for {result.key}. Status code: {result.status_code}")
+
+    if not all_data:
+        print("No data collected from the API.")
+        return pd.DataFrame()
+
+    # Type the columns: missing counts become 0, missing rates stay empty instead of a fake 0
+    final_df = apply_schema(league, pd.concat(all_data, ignore_index=True))
+
+    if merge:
+        final_df = merge_seasons(csv_path, adapter.season_col, final_df, seasons_to_fetch, seasons)
+
+    final_df.attrs['complete'] = report.complete
+    # A partial fetch must not replace the snapshot and pass for a complete dataset
+    if report.complete or allow_partial:
+        save(league, final_df, seasons=seasons_to_fetch, store_dir=store_dir, live=live)
+    else:
+        print(f"Not saving {csv_path}: the fetch was incomplete. Re-run with --retry-failed.")
+
+    return final_df
+
+def stream(league, seasons=None, max_workers=DEFAULT_MAX_WORKERS, session=None, api_url=None, incremental=False,
+           cache=None, retry=None, only_seasons=None, allow_partial=False, resume=False, adapter=None,
+           store_dir=None, live=True):
+    # Streaming version of run(): every page is typed and staged on disk as soon as it arrives,
+    # and a season is promoted to its partition (and, when live, loaded into SQLite) once all
+    # its pages are in, so memory holds one season at most. Finished seasons and staged pages
+    # survive a crash; resume=True picks an interrupted run up where it stopped. Returns the FetchReport.
+    if store.pq is None:
+        print("pyarrow is not installed; streaming needs the columnar store. Fetching in one batch instead.")
+        run(league, seasons, max_workers, session, api_url, incremental, cache, retry, only_seasons, allow_partial, adapter,
+            store_dir, live)
+        return None
+
+    store_dir = store_dir or store.current_root()
+    adapter = adapter or get_adapter(league)
+    if seasons is None:
+        seasons = adapter.seasons()
+    manifest = store.read_manifest(league, store_dir) if resume else None
+    if manifest is None or manifest['complete']:
+        seasons_to_fetch = select_seasons(adapter, seasons, incremental, only_seasons)
+        store.clear_staging(league, store_dir)
+        manifest = {'seasons': [str(season) for season in seasons_to_fetch], 'finished': {}, 'complete': False}
+        store.write_manifest(league, manifest, store_dir)
+    else:
+        seasons_to_fetch = [season for season in seasons if str(season) in manifest['seasons']]
+        print(f"Resuming {league.upper()}: {len(manifest['finished'])} of {len(manifest['seasons'])} seasons already done.")
+    if cache is None:
+        cache = ResponseCache()
+    if retry is None:
+        retry = RetryPolicy()
+    own_session = session is None
+    if own_session:
+        session = make_session(pool_size=max_workers)
+
+    todo = [season for season in seasons_to_fetch if str(season) not in manifest['finished']]
+    first_pages = adapter.build_tasks(todo, api_url or adapter.api_url, max_age_for(adapter, seasons))
+
+    # Page numbers keep each season's rows in fetch order: the i-th first page of a season is
+    # page i * PAGE_STRIDE and its follow-up pages come right after it
+    numbered, counts = [], {}
+    for task in first_pages:
+        season = task_season(task)
+        numbered.append((season, counts.get(season, 0) * PAGE_STRIDE, task))
+        counts[season] = counts.get(season, 0) + 1
+    staged = {season: store.staged_pages(league, season, store_dir) for season in counts}
+    outstanding = dict(counts)
+    failed = set()
+    results = []
+
+    def finish(season):
+        if season in failed and not allow_partial:
+            print(f"Not promoting {league.upper()} {season}: some pages failed. Re-run with --resume.")
+            return
+        df = store.promote_season(league, season, store_dir)
+        if df is not None and live:
+            db_setup.load_league(league, df, seasons=[season], version=store.dataset_version(league, store_dir))
+        manifest['finished'][str(season)] = {'rows': 0 if df is None else len(df), 'pages': len(staged[season])}
+        store.write_manifest(league, manifest, store_dir)
+
+    def handle(season, page, result):
+        if result.payload is not None:
+            # First pages are always requested again (they say how many pages follow; finished
+            # seasons come from the response cache) but only staged once
+            if page not in staged[season]:
+                df = adapter.parse(result)
+                if df is not None:
+                    store.stage_page(league, season, page, df, store_dir)
+                else:
+                    print(f"No player data returned for {league.upper()} {result.key}.")
+            staged[season].add(page)
+        else:
+            failed.add(season)
+            print(f"Failed to fetch {league.upper()} data for {result.key}. Status code: {result.status_code}, error: {result.error}")
+        # Only the outcome is kept; the payload is already on disk
+        results.append(without_payload(result))
+
+    try:
+        follow_ups = []
+        fetched = iter_fetch([task for _, _, task in numbered], session=session, max_workers=max_workers, cache=cache, retry=retry)
+        for (season, page, task), result in zip(numbered, fetched):
+            if result.payload is not None:
+                for k, next_task in enumerate(adapter.next_pages(task, result), start=1):
+                    if page + k not in staged[season]:
+                        follow_ups.append((season, page + k, next_task))
+                        outstanding[season] += 1
+            handle(season, page, result)
+            outstanding[season] -= 1
+            if outstanding[season] == 0:
+                finish(season)
+
+        fetched = iter_fetch([task for _, _, task in follow_ups], session=session, max_workers=max_workers, cache=cache, retry=retry)
+        for (season, page, task), result in zip(follow_ups, fetched):
+            handle(season, page, result)
+            outstanding[season] -= 1
+            if outstanding[season] == 0:
+                finish(season)
+    finally:
+        if own_session:
+            session.close()
+
+    report = finish_report(league, results, retry)
+    manifest['complete'] = all(season in manifest['finished'] for season in manifest['seasons'])
+    store.write_manifest(league, manifest, store_dir)
+    if manifest['complete'] or allow_partial:
+        # The CSV snapshot is rebuilt from the partitions, one season at a time, and the
+        # aggregate tables from the whole stored dataset; only the promoted seasons are rescored
+        if live:
+            store.export_csv(league, store_dir=store_dir)
+        aggregates.materialize(league, store_dir=store_dir)
+        zscores.update(league, store_dir)
+    return report
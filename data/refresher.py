@@ -0,0 +1,222 @@
+#refresher.py
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import uuid
+
+from data import DATA_DIR, store
+from data.schema import SCHEMAS
+
+# Scheduled refreshes that readers never see half-done. Every refresh builds a new store root
+# under store/snapshots/, seeded with hard links to the published one: nothing is copied, and
+# the published files are never written to because every store write replaces its file by
+# rename. The leagues are fetched into the new root, which is then published with one pointer
+# swap (store.publish_root). Readers keep the old root until the swap and load the new dataset
+# version on their next request. The CSV snapshots and SQLite live outside the roots, so they
+# are only written after the swap (pipeline.save_live); a failed refresh never touches them.
+
+# Seconds between refreshes of the dashboard's background refresher; unset or 0 turns it off
+INTERVAL_ENV = 'DASHBOARD_REFRESH_SECONDS'
+DEFAULT_LEAGUES = ['mlb', 'nba']
+LOCK_PATH = os.path.join(store.STORE_DIR, 'refresh.lock')
+# A lock older than this was left behind by a refresh that crashed
+LOCK_TIMEOUT = 3 * 60 * 60
+# Published root plus the previous one, which a reader may still be finishing
+KEEP_SNAPSHOTS = 2
+
+# Background refresher of this process (see start_background)
+_thread = None
+_thread_lock = threading.Lock()
+status = {'running': False, 'last_finished': None, 'last_error': None}
+
+
+def _link_tree(src, dst):
+    # Mirror src into dst with hard links (copies where the filesystem can't link)
+    for dirpath, dirnames, filenames in os.walk(src):
+        # Staged pages belong to the run that wrote them
+        dirnames[:] = [name for name in dirnames if name != '_staging']
+        target = os.path.join(dst, os.path.relpath(dirpath, src))
+        os.makedirs(target, exist_ok=True)
+        for name in filenames:
+            if name.endswith('.tmp'):
+                continue
+            try:
+                os.link(os.path.join(dirpath, name), os.path.join(target, name))
+            except OSError:
+                shutil.copy2(os.path.join(dirpath, name), os.path.join(target, name))
+
+
+def new_snapshot():
+    # A new root holding the published leagues: (name, path)
+    name = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+    root = os.path.join(store.SNAPSHOTS_DIR, name)
+    os.makedirs(root)
+    current = store.current_root()
+    for league in SCHEMAS:
+        if os.path.isdir(os.path.join(current, league)):
+            _link_tree(os.path.join(current, league), os.path.join(root, league))
+    return name, root
+
+
+def collect_garbage(keep=KEEP_SNAPSHOTS):
+    # Remove all but the newest `keep` roots (names sort by creation time); never the published one
+    if not os.path.isdir(store.SNAPSHOTS_DIR):
+        return
+    pointer = store.read_pointer()
+    published = pointer['snapshot'] if pointer else None
+    for name in sorted(os.listdir(store.SNAPSHOTS_DIR))[:-keep]:
+        if name != published:
+            shutil.rmtree(os.path.join(store.SNAPSHOTS_DIR, name), ignore_errors=True)
+
+
+def _read_lock(path=LOCK_PATH):
+    try:
+        with open(path) as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _remove_lock(token):
+    # Remove the lock only while it holds token. It is renamed away first (only one process can
+    # move a file), and put back if it turns out to belong to someone else.
+    moved = f"{LOCK_PATH}.{uuid.uuid4().hex}"
+    try:
+        os.rename(LOCK_PATH, moved)
+    except FileNotFoundError:
+        return False
+    ours = _read_lock(moved) == token
+    if not ours:
+        try:
+            os.link(moved, LOCK_PATH)
+        except FileExistsError:
+            pass
+    os.remove(moved)
+    return ours
+
+
+def _acquire_lock():
+    # One refresh at a time, across every dashboard process sharing the store. The lock file
+    # holds its owner's token; returns ours, or None when another refresh holds the lock.
+    token = f"{os.getpid()}:{uuid.uuid4().hex}"
+    for _ in range(3):
+        try:
+            fd = os.open(LOCK_PATH, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            held = _read_lock()
+            try:
+                age = time.time() - os.path.getmtime(LOCK_PATH)
+            except FileNotFoundError:
+                continue
+            if age < LOCK_TIMEOUT:
+                return None
+            # Left behind by a refresh that crashed; remove it unless it was just replaced
+            _remove_lock(held)
+            continue
+        with os.fdopen(fd, 'w') as f:
+            f.write(token)
+        return token
+    return None
+
+
+def refresh(leagues=None, incremental=True):
+    # Fetch the leagues into a new root and publish it if every fetch completed. Returns the
+    # published snapshot name, or None when nothing was published.
+    from data import pipeline
+
+    leagues = leagues or DEFAULT_LEAGUES
+    os.makedirs(store.STORE_DIR, exist_ok=True)
+    token = _acquire_lock()
+    if token is None:
+        print("Another refresh is running; skipping this one.")
+        return None
+    try:
+        name, root = new_snapshot()
+        try:
+            complete = True
+            # {league: (full dataset or None, seasons to load into SQLite)} once published
+            live = {}
+            for league in leagues:
+                if store.pq is not None:
+                    # Streaming keeps one season in memory at a time
+                    report = pipeline.stream(league, incremental=incremental, store_dir=root, live=False)
+                    complete = complete and report is not None and report.complete
+                    live[league] = (None, store.read_manifest(league, root)['seasons'])
+                else:
+                    df = pipeline.run(league, incremental=incremental, store_dir=root, live=False)
+                    complete = complete and df.attrs.get('complete', False)
+                    live[league] = (df, None)
+            if not complete:
+                print(f"Refresh {name} was incomplete; keeping the published data.")
+                shutil.rmtree(root, ignore_errors=True)
+                return None
+            store.publish_root(name, leagues)
+        except BaseException:
+            shutil.rmtree(root, ignore_errors=True)
+            raise
+        for league, (df, seasons) in live.items():
+            pipeline.save_live(league, df, seasons)
+        collect_garbage()
+        print(f"Published {name}: {', '.join(league.upper() for league in leagues)}")
+        return name
+    finally:
+        _remove_lock(token)
+
+
+def _warm(leagues):
+    # Load the new version into this process's cache so no page request pays for it; the
+    # old version is dropped as soon as the new one is cached
+    from data import datasets
+    from data.leagues import get_adapter
+
+    for league in leagues:
+        columns = get_adapter(league).page_columns
+        datasets.get_dataset(league, columns)
+        datasets.get_index(league, columns)
+
+
+def _loop(interval, leagues):
+    # Every refresh runs in a child process: fetching and parsing never hold this process's
+    # GIL during page reruns and its memory doesn't grow with the refresh
+    while True:
+        time.sleep(interval)
+        status['running'] = True
+        before = store.read_pointer()
+        try:
+            result = subprocess.run([sys.executable, '-m', 'data.refresher', *leagues], capture_output=True,
+                                    text=True, cwd=os.path.dirname(DATA_DIR))
+            status['last_error'] = None if result.returncode == 0 else result.stderr[-2000:]
+            if store.read_pointer() != before:
+                _warm(leagues)
+        except Exception as e:
+            status['last_error'] = str(e)
+        finally:
+            status['running'] = False
+            status['last_finished'] = time.time()
+
+
+def start_background(interval, leagues=None):
+    # Start this process's refresher thread once; later calls (every Streamlit rerun) are no-ops
+    global _thread
+    with _thread_lock:
+        if _thread is None or not _thread.is_alive():
+            _thread = threading.Thread(target=_loop, args=(interval, list(leagues or DEFAULT_LEAGUES)),
+                                       name='data-refresher', daemon=True)
+            _thread.start()
+    return _thread
+
+
+if __name__ == "__main__":
+    # Usage: python -m data.refresher [league ...] [--full] [--every SECONDS]
+    # Refreshes the current and missing seasons (every season with --full) of the given leagues
+    # (MLB and NBA by default) once, or every SECONDS with --every.
+    selected = [arg for arg in sys.argv[1:] if arg in SCHEMAS] or DEFAULT_LEAGUES
+    every = int(sys.argv[sys.argv.index('--every') + 1]) if '--every' in sys.argv else None
+    while True:
+        refresh(selected, incremental='--full' not in sys.argv)
+        if every is None:
+            break
+        time.sleep(every)
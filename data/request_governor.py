@@ -0,0 +1,114 @@
+#request_governor.py
+import email.utils
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+# Statuses worth retrying: throttling and transient server errors
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Requests per second and burst size allowed per host. stats.nba.com starts
+# throttling (and eventually blackholing) clients that send bursts of requests.
+HOST_RATE_LIMITS = {
+    'stats.nba.com': (2.0, 4),
+    'bdfed.stitch.mlbinfra.com': (10.0, 10),
+}
+DEFAULT_RATE_LIMIT = (10.0, 10)
+
+
+class TokenBucket:
+    # Classic token bucket: `rate` tokens are added per second up to `capacity`;
+    # every request takes one token and waits when the bucket is empty.
+
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class HostRateLimiter:
+    # One token bucket per host, created lazily from HOST_RATE_LIMITS
+
+    def __init__(self, limits=None, default=DEFAULT_RATE_LIMIT):
+        self.limits = HOST_RATE_LIMITS if limits is None else limits
+        self.default = default
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url):
+        host = urlsplit(url).hostname or ''
+        with self._lock:
+            if host not in self._buckets:
+                rate, capacity = self.limits.get(host, self.default)
+                self._buckets[host] = TokenBucket(rate, capacity)
+            return self._buckets[host]
+
+    def acquire(self, url):
+        self.bucket(url).acquire()
+
+
+class RetryPolicy:
+    # Exponential backoff with full jitter, capped per task by max_attempts and
+    # across a whole run by `budget` so a failing upstream can't stall a backfill.
+
+    def __init__(self, max_attempts=4, base_delay=0.5, max_delay=30.0, budget=50):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self.retries_used = 0
+        self._lock = threading.Lock()
+
+    def should_retry(self, attempt, status_code=None, error=None):
+        if attempt >= self.max_attempts:
+            return False
+        if error is None and status_code not in RETRY_STATUSES:
+            return False
+        # Spend one unit of the shared retry budget
+        with self._lock:
+            if self.retries_used >= self.budget:
+                return False
+            self.retries_used += 1
+            return True
+
+    def delay(self, attempt, retry_after=None):
+        # Honour the server's Retry-After when it asks for longer than our own backoff
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        server_delay = parse_retry_after(retry_after)
+        if server_delay is not None:
+            return min(self.max_delay, max(backoff, server_delay))
+        return backoff
+
+
+def parse_retry_after(value):
+    # Retry-After is either a number of seconds or an HTTP date
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+# Shared across every fetch in the process so concurrent backfills respect the same limits
+DEFAULT_LIMITER = HostRateLimiter()
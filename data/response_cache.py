@@ -0,0 +1,73 @@
+#response_cache.py
+import hashlib
+import json
+import os
+import threading
+import time
+
+from data import DATA_DIR, store
+
+DEFAULT_CACHE_DIR = os.path.join(DATA_DIR, 'cache')
+
+
+class ResponseCache:
+    # Persistent JSON cache of API responses keyed by (league, season, part).
+    # Each entry keeps the decoded payload plus the validators (ETag / Last-Modified)
+    # needed to revalidate it with a conditional request.
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        league, season, part = key
+        name = f"{season}_{part}"
+        # Keep file names filesystem safe whatever the stat category looks like
+        if not name.replace('-', '').replace('_', '').isalnum():
+            name = hashlib.sha1(name.encode()).hexdigest()
+        return os.path.join(self.cache_dir, str(league), f"{name}.json")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self, entry, max_age):
+        # max_age=None means the entry never expires (e.g. a finished season)
+        if entry is None:
+            return False
+        if max_age is None:
+            return True
+        return time.time() - entry['fetched_at'] < max_age
+
+    def put(self, key, payload, headers=None):
+        headers = headers or {}
+        entry = {
+            'key': list(key),
+            'fetched_at': time.time(),
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'payload': payload,
+        }
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._lock:
+            store.write_atomic(path, lambda f: json.dump(entry, f))
+        return entry
+
+    def touch(self, key, entry):
+        # A 304 confirms the cached payload is still current; restart its TTL
+        return self.put(key, entry['payload'], {'ETag': entry.get('etag'), 'Last-Modified': entry.get('last_modified')})
+
+    @staticmethod
+    def conditional_headers(entry):
+        headers = {}
+        if entry is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
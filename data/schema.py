@@ -0,0 +1,286 @@
+#schema.py
+import os
+
+import numpy as np
+import pandas as pd
+
+# Explicit column types for each league's dataset. Any column not listed falls
+# back to a numeric conversion, so new stats added upstream still load as numbers.
+#   season:      partition column of the columnar store
+#   newest_first: seasons are listed newest first (the NBA fetcher's order)
+#   index:       columns the dashboards filter on, keyed by filter name
+#   ids:         identifiers, stored as int16 (int32 when a value doesn't fit)
+#   ints:        counting stats, stored as int16 (int32 when a value doesn't fit). Not int8:
+#                adding two stats of a row (doubles + triples + homeRuns) would wrap around.
+#   floats:      rate and per-game stats, stored as float32 (the MLB API sends rates as strings like '.356')
+#   categories:  repeated strings (names, teams, positions)
+#   dimensions:  attributes split out of the fact table into one row per key; the
+#                fact table keeps only the key columns and joins them back on read
+#   player_seasons: {column: value} picking the rows that are one player season each, for
+#                datasets that also hold other rows of the same player and season
+# Columns shared by every MLB stat group (hitting, pitching, fielding)
+MLB_IDS = ['year', 'playerId', 'teamId', 'leagueId']
+MLB_CATEGORIES = [
+    'playerName', 'type', 'playerFullName', 'playerFirstName', 'playerLastName', 'playerUseName',
+    'playerInitLastName', 'teamAbbrev', 'teamName', 'teamShortName', 'leagueName', 'positionAbbrev',
+    'position', 'primaryPositionAbbrev', 'gameType',
+]
+MLB_DIMENSIONS = {
+    'players': {
+        'key': ['playerId'],
+        'columns': ['playerName', 'playerFullName', 'playerFirstName', 'playerLastName', 'playerUseName',
+                    'playerInitLastName', 'primaryPositionAbbrev'],
+    },
+    # Teams are keyed per season: franchises get renamed (Indians -> Guardians) under the same id
+    'teams': {
+        'key': ['year', 'teamId'],
+        'columns': ['teamAbbrev', 'teamName', 'teamShortName', 'leagueName', 'leagueId'],
+    },
+}
+MLB_INDEX = {'season': 'year', 'team': 'teamName', 'player': 'playerFullName'}
+# Postseason and spring training rows repeat (playerId, year); the dashboards use the regular season
+MLB_PLAYER_SEASONS = {'gameType': 'R'}
+
+SCHEMAS = {
+    'mlb': {
+        'season': 'year',
+        'index': MLB_INDEX,
+        'ids': MLB_IDS,
+        'ints': [
+            'rank', 'plateAppearances', 'totalBases', 'leftOnBase',
+            'sacBunts', 'sacFlies', 'extraBaseHits', 'hitByPitch', 'gidp', 'gidpOpp', 'numberOfPitches',
+            'reachedOnError', 'walkOffs', 'flyOuts', 'totalSwings', 'swingAndMisses', 'ballsInPlay', 'popOuts',
+            'lineOuts', 'groundOuts', 'flyHits', 'popHits', 'lineHits', 'groundHits', 'gamesPlayed', 'airOuts',
+            'runs', 'doubles', 'triples', 'homeRuns', 'strikeOuts', 'baseOnBalls', 'intentionalWalks', 'hits',
+            'atBats', 'caughtStealing', 'stolenBases', 'groundIntoDoublePlay', 'rbi', 'catchersInterference',
+        ],
+        'floats': [
+            'babip', 'pitchesPerPlateAppearance', 'walksPerPlateAppearance', 'strikeoutsPerPlateAppearance',
+            'homeRunsPerPlateAppearance', 'walksPerStrikeout', 'iso', 'avg', 'obp', 'slg', 'ops',
+            'stolenBasePercentage', 'groundOutsToAirouts', 'atBatsPerHomeRun',
+        ],
+        'categories': MLB_CATEGORIES,
+        'dimensions': MLB_DIMENSIONS,
+        'player_seasons': MLB_PLAYER_SEASONS,
+    },
+    'mlb_pitching': {
+        'season': 'year',
+        'index': MLB_INDEX,
+        'ids': MLB_IDS,
+        'ints': [
+            'rank', 'gamesPlayed', 'gamesStarted', 'wins', 'losses', 'saves', 'saveOpportunities', 'holds',
+            'blownSaves', 'completeGames', 'shutouts', 'outs', 'battersFaced', 'hits', 'runs', 'earnedRuns',
+            'homeRuns', 'baseOnBalls', 'intentionalWalks', 'strikeOuts', 'hitBatsmen', 'balks', 'wildPitches',
+            'pickoffs', 'numberOfPitches', 'strikes', 'groundOuts', 'airOuts', 'gamesFinished', 'inheritedRunners',
+            'inheritedRunnersScored',
+        ],
+        'floats': [
+            'inningsPitched', 'era', 'whip', 'avg', 'obp', 'slg', 'ops', 'strikeoutsPer9Inn', 'walksPer9Inn',
+            'hitsPer9Inn', 'homeRunsPer9', 'runsScoredPer9', 'strikeoutWalkRatio', 'winPercentage',
+            'pitchesPerInning', 'strikePercentage', 'groundOutsToAirouts',
+        ],
+        'categories': MLB_CATEGORIES,
+        'dimensions': MLB_DIMENSIONS,
+        'player_seasons': MLB_PLAYER_SEASONS,
+    },
+    'mlb_fielding': {
+        'season': 'year',
+        'index': MLB_INDEX,
+        'ids': MLB_IDS,
+        'ints': [
+            'rank', 'gamesPlayed', 'gamesStarted', 'assists', 'putOuts', 'errors', 'chances', 'doublePlays',
+            'triplePlays', 'throwingErrors', 'passedBall', 'caughtStealing', 'stolenBases',
+        ],
+        'floats': ['fielding', 'innings', 'rangeFactorPerGame', 'rangeFactorPer9Inn', 'stolenBasePercentage'],
+        'categories': MLB_CATEGORIES,
+        'dimensions': MLB_DIMENSIONS,
+        'player_seasons': MLB_PLAYER_SEASONS,
+    },
+    'nba': {
+        'season': 'Season',
+        'newest_first': True,
+        'index': {'season': 'Season', 'team': 'TEAM', 'player': 'PLAYER'},
+        'ids': ['PLAYER_ID', 'TEAM_ID'],
+        'ints': ['RANK', 'GP'],
+        'floats': [
+            'MIN', 'FGM', 'FGA', 'FG_PCT', 'FG3M', 'FG3A', 'FG3_PCT', 'FTM', 'FTA', 'FT_PCT',
+            'OREB', 'DREB', 'REB', 'AST', 'STL', 'BLK', 'TOV', 'PTS', 'EFF',
+        ],
+        'categories': ['PLAYER', 'TEAM', 'Season'],
+        'dimensions': {
+            'players': {'key': ['PLAYER_ID'], 'columns': ['PLAYER']},
+            'teams': {'key': ['Season', 'TEAM_ID'], 'columns': ['TEAM']},
+        },
+    },
+    'nfl': {
+        'season': 'season',
+        'index': {'season': 'season', 'team': 'teamAbbrev', 'player': 'displayName'},
+        'ids': ['season', 'athleteId', 'teamId'],
+        'ints': [
+            'gamesPlayed', 'completions', 'passingAttempts', 'passingYards', 'passingTouchdowns', 'interceptions',
+            'rushingAttempts', 'rushingYards', 'rushingTouchdowns', 'receptions', 'receivingTargets',
+            'receivingYards', 'receivingTouchdowns', 'totalTackles', 'fumbles', 'fumblesLost',
+        ],
+        'floats': [
+            'completionPct', 'QBRating', 'yardsPerPassAttempt', 'yardsPerRushAttempt', 'yardsPerReception', 'sacks',
+        ],
+        'categories': ['displayName', 'teamAbbrev', 'position'],
+        'dimensions': {
+            'players': {'key': ['athleteId'], 'columns': ['displayName']},
+            'teams': {'key': ['season', 'teamId'], 'columns': ['teamAbbrev']},
+        },
+    },
+}
+
+# Measured on the CSV snapshots (python -m data.schema), the typed fact table plus its dimension
+# tables is about 3.6x smaller than a plain pd.read_csv for MLB and 2.3x for NBA, short of 5x.
+# The name and team variants are already stored once per player/team in the dimension tables;
+# what is left is numeric, where int64 -> int16 saves 4x but float64 -> float32 only 2x, and
+# nearly every NBA stat is a per-game float. Going further would take lossy float16. What a
+# dashboard worker actually holds is the page columns only, about 11x smaller for MLB.
+
+
+def season_column(league):
+    return SCHEMAS[league]['season']
+
+
+def season_year(labels):
+    # '2023-24' -> 2023, 2023 -> 2023
+    return pd.Series(labels).astype(str).str[:4].astype(int).to_numpy()
+
+
+def smallest_int(values):
+    # int16 when every value fits, int32 otherwise
+    info = np.iinfo('int16')
+    return 'int16' if values.empty or (values.min() >= info.min and values.max() <= info.max) else 'int32'
+
+
+def apply_schema(league, df):
+    # Coerce a raw frame (API payload or CSV) to the league's declared compact dtypes.
+    # Missing counts become 0; missing rates stay NaN instead of pretending to be 0.
+    schema = SCHEMAS[league]
+    df = df.copy()
+    for col in df.columns:
+        if col in schema['categories']:
+            if not isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].fillna('').astype(str).astype('category')
+        elif col in schema['ids'] or col in schema['ints']:
+            values = pd.to_numeric(df[col], errors='coerce').fillna(0)
+            df[col] = values.astype(smallest_int(values))
+        elif col in schema['floats']:
+            # Placeholders like '.---' become NaN rather than failing the whole column
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype('float32')
+        else:
+            converted = pd.to_numeric(df[col], errors='coerce', downcast='float')
+            # Only keep the conversion when the column really is numeric
+            if converted.notna().sum() >= df[col].notna().sum():
+                df[col] = converted
+    return df
+
+
+def player_seasons(league, df):
+    # Only the rows that are one player season each (see 'player_seasons' above). Rows without
+    # a value predate the column and were all regular season.
+    for col, value in SCHEMAS[league].get('player_seasons', {}).items():
+        if col in df.columns:
+            df = df[df[col].isna().to_numpy() | (df[col].astype(str) == value).to_numpy()]
+    return df
+
+
+def dimension_columns(league):
+    # Every attribute column that lives in a dimension table rather than the fact table
+    return [col for dim in SCHEMAS[league]['dimensions'].values() for col in dim['columns']]
+
+
+def dimension_keys(league):
+    return sorted({key for dim in SCHEMAS[league]['dimensions'].values() for key in dim['key']})
+
+
+def split_dimensions(league, df):
+    # Split a typed frame into (fact table, {dimension name: table}). Each dimension
+    # keeps one row per key (the latest one seen); the fact table keeps the keys.
+    dims = {}
+    for name, dim in SCHEMAS[league]['dimensions'].items():
+        present = [col for col in dim['columns'] if col in df.columns]
+        if not present or not all(key in df.columns for key in dim['key']):
+            continue
+        dims[name] = df[dim['key'] + present].drop_duplicates(dim['key'], keep='last').reset_index(drop=True)
+    moved = set(dimension_columns(league)) - set(dimension_keys(league))
+    fact = df[[col for col in df.columns if col not in moved or not any(col in t.columns for t in dims.values())]]
+    return fact, dims
+
+
+def join_dimensions(league, fact, dims, columns=None):
+    # Add dimension attributes (all of them, or only `columns`) back onto fact rows
+    out = fact.copy()
+    for name, dim in SCHEMAS[league]['dimensions'].items():
+        table = dims.get(name)
+        if table is None:
+            continue
+        wanted = [col for col in dim['columns'] if col in table.columns and (columns is None or col in columns)]
+        if not wanted or not all(key in fact.columns for key in dim['key']):
+            continue
+        if len(dim['key']) == 1:
+            key = dim['key'][0]
+            positions = pd.Index(table[key]).get_indexer(fact[key])
+        else:
+            lookup = pd.MultiIndex.from_frame(table[dim['key']].astype(str))
+            positions = lookup.get_indexer(pd.MultiIndex.from_frame(fact[dim['key']].astype(str)))
+        for col in wanted:
+            values = table[col]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                codes = np.where(positions >= 0, values.cat.codes.to_numpy()[positions], -1)
+                out[col] = pd.Categorical.from_codes(codes, dtype=values.dtype)
+            else:
+                out[col] = values.to_numpy()[positions]
+    if columns is not None:
+        out = out[[col for col in columns if col in out.columns]]
+    return out
+
+
+def memory_report(before, after, tables=None):
+    # Bytes per column before/after compaction. `tables` are extra frames (dimension
+    # tables) that are part of the compact representation and counted in the total.
+    before_bytes = before.memory_usage(deep=True, index=False)
+    after_bytes = after.memory_usage(deep=True, index=False)
+    rows = []
+    for col in before.columns:
+        rows.append({
+            'column': col,
+            'before_dtype': str(before[col].dtype),
+            'after_dtype': str(after[col].dtype) if col in after.columns else 'dimension',
+            'before_bytes': int(before_bytes[col]),
+            'after_bytes': int(after_bytes[col]) if col in after.columns else 0,
+        })
+    report = pd.DataFrame(rows)
+    extra = sum(int(table.memory_usage(deep=True, index=False).sum()) for table in (tables or {}).values())
+    total_before = int(report['before_bytes'].sum())
+    total_after = int(report['after_bytes'].sum()) + extra
+    summary = {
+        'before_bytes': total_before,
+        'after_bytes': total_after,
+        'dimension_bytes': extra,
+        'ratio': round(total_before / total_after, 2) if total_after else None,
+    }
+    return report, summary
+
+
+if __name__ == "__main__":
+    from data.leagues import get_adapter
+    from data.store import CSV_PATHS
+
+    # Compare a naive pd.read_csv against the typed fact table plus its dimension tables, and
+    # against the page columns a dashboard worker keeps in memory
+    for league in SCHEMAS:
+        if not os.path.exists(CSV_PATHS[league]):
+            continue
+        raw = pd.read_csv(CSV_PATHS[league])
+        fact, dims = split_dimensions(league, apply_schema(league, raw))
+        report, summary = memory_report(raw, fact, dims)
+        print(f"\n{league.upper()}: {summary['before_bytes']:,} -> {summary['after_bytes']:,} bytes "
+              f"({summary['ratio']}x, dimension tables {summary['dimension_bytes']:,} bytes)")
+        if get_adapter(league).page_columns:
+            page = join_dimensions(league, fact, dims, get_adapter(league).page_columns)
+            page_bytes = int(page.memory_usage(deep=True, index=False).sum())
+            print(f"Page columns: {page_bytes:,} bytes ({round(summary['before_bytes'] / page_bytes, 2)}x)")
+        print(report.sort_values('before_bytes', ascending=False).to_string(index=False))
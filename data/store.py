@@ -0,0 +1,356 @@
+#store.py
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+
+import pandas as pd
+
+from data import DATA_DIR
+from data.schema import (SCHEMAS, apply_schema, dimension_columns, join_dimensions, player_seasons, season_column,
+                         split_dimensions)
+
+# pyarrow is optional: without it the loaders keep reading the CSV snapshots
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+STORE_DIR = os.path.join(DATA_DIR, 'store')
+# CSV snapshot of each league: data/<league>_data.csv
+CSV_PATHS = {league: os.path.join(DATA_DIR, f"{league}_data.csv") for league in SCHEMAS}
+
+# Layout: store/<league>/season=<value>/part-0.parquet holds the fact rows of one season,
+# store/<league>/dim_<name>.parquet the dimension tables (player and team names) for all seasons.
+# Streaming ingestion stages pages under store/<league>/_staging/season=<value>/page-<n>.parquet
+# and records finished seasons in store/<league>/_manifest.json.
+# Aggregates materialized after a fetch live in store/<league>/agg_<name>.parquet and record
+# the dataset version they were computed from.
+#
+# store/ above is the store root. A background refresh (data/refresher.py) builds every new
+# dataset version in its own root, store/snapshots/<name>/, and publishes it by atomically
+# replacing the store/CURRENT pointer, so readers switch from one complete version to the next.
+# Without a pointer the leagues live directly under store/. Functions given store_dir=None read
+# the published root; multi-file reads resolve it once so they never mix two versions.
+POINTER_PATH = os.path.join(STORE_DIR, 'CURRENT')
+SNAPSHOTS_DIR = os.path.join(STORE_DIR, 'snapshots')
+
+
+def write_atomic(path, write, mode='w'):
+    # Every file the project writes for other readers goes through here: write(f) fills a
+    # temporary file next to path, which then replaces path with one rename, so a reader (or
+    # a crash) sees the old file or the new one, never a partial one. The temporary name is
+    # unique per process and thread, so concurrent writers of one path don't collide.
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, mode, newline=None if 'b' in mode else '') as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+    return path
+
+
+def read_pointer():
+    # {'snapshot': name, 'published_at': unix time, 'leagues': [...]} or None
+    try:
+        with open(POINTER_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def current_root():
+    pointer = read_pointer()
+    if pointer is None:
+        return STORE_DIR
+    return os.path.join(SNAPSHOTS_DIR, pointer['snapshot'])
+
+
+def publish_root(name, leagues=()):
+    # Point readers at store/snapshots/<name>: one rename, so a reader sees the old or the new pointer
+    pointer = {'snapshot': name, 'published_at': time.time(), 'leagues': list(leagues)}
+    write_atomic(POINTER_PATH, lambda f: json.dump(pointer, f))
+
+
+def league_dir(league, store_dir=None):
+    return os.path.join(store_dir or current_root(), league)
+
+
+def has_store(league, store_dir=None):
+    return pq is not None and bool(list_seasons(league, store_dir))
+
+
+def list_seasons(league, store_dir=None):
+    path = league_dir(league, store_dir)
+    if not os.path.isdir(path):
+        return []
+    seasons = []
+    for name in sorted(os.listdir(path)):
+        if name.startswith('season=') and os.path.exists(os.path.join(path, name, 'part-0.parquet')):
+            seasons.append(name[len('season='):])
+    return seasons
+
+
+def dimension_path(league, name, store_dir=None):
+    return os.path.join(league_dir(league, store_dir), f"dim_{name}.parquet")
+
+
+def _write_table(table, path):
+    write_atomic(path, lambda f: pq.write_table(table, f, compression='zstd'), 'wb')
+
+
+def read_dimensions(league, store_dir=None):
+    store_dir = store_dir or current_root()
+    dims = {}
+    for name in SCHEMAS[league]['dimensions']:
+        path = dimension_path(league, name, store_dir)
+        if os.path.exists(path):
+            dims[name] = pq.read_table(path).to_pandas()
+    return dims
+
+
+def dataset_version(league, store_dir=None):
+    # Cheap fingerprint of what read_league would return: changes whenever a
+    # partition, a dimension table (or the CSV fallback) is rewritten. Paths are relative to
+    # the root, so a snapshot that shares unchanged files has the same version.
+    store_dir = store_dir or current_root()
+    if has_store(league, store_dir):
+        paths = [os.path.join(league_dir(league, store_dir), f"season={season}", 'part-0.parquet')
+                 for season in list_seasons(league, store_dir)]
+        paths += [dimension_path(league, name, store_dir) for name in SCHEMAS[league]['dimensions']]
+    else:
+        paths = [CSV_PATHS[league]]
+    parts = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        parts.append(f"{os.path.relpath(path, store_dir)}:{stat.st_mtime_ns}:{stat.st_size}")
+    return hashlib.sha1('|'.join(parts).encode()).hexdigest()[:12]
+
+
+def partition_version(league, season, store_dir=None):
+    # Fingerprint of one season's partition file (None when it doesn't exist)
+    try:
+        stat = os.stat(os.path.join(league_dir(league, store_dir), f"season={season}", 'part-0.parquet'))
+    except OSError:
+        return None
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def write_partitions(league, df, seasons=None, store_dir=None):
+    # Write one Parquet file of fact rows per season. Only `seasons` are rewritten when
+    # given, so an incremental fetch doesn't touch partitions that haven't changed.
+    # Dimension rows are merged into the existing dimension tables.
+    store_dir = store_dir or current_root()
+    if pq is None:
+        print("pyarrow is not installed; skipping the columnar store.")
+        return []
+
+    df, dims = split_dimensions(league, apply_schema(league, df))
+    season_col = season_column(league)
+    wanted = None if seasons is None else {str(season) for season in seasons}
+    written = []
+    for season, part in df.groupby(season_col, sort=False, observed=True):
+        if wanted is not None and str(season) not in wanted:
+            continue
+        part_dir = os.path.join(league_dir(league, store_dir), f"season={season}")
+        os.makedirs(part_dir, exist_ok=True)
+        # Drop categories that belong to other seasons before encoding the partition
+        part = part.reset_index(drop=True)
+        for col in part.select_dtypes('category').columns:
+            part[col] = part[col].cat.remove_unused_categories()
+        _write_table(pa.Table.from_pandas(part, preserve_index=False), os.path.join(part_dir, 'part-0.parquet'))
+        written.append(str(season))
+
+    existing = read_dimensions(league, store_dir)
+    for name, table in dims.items():
+        key = SCHEMAS[league]['dimensions'][name]['key']
+        if name in existing:
+            # Newer rows win; re-typing restores the categoricals lost by concatenating
+            table = pd.concat([existing[name].astype(object), table.astype(object)], ignore_index=True)
+            table = apply_schema(league, table.drop_duplicates(key, keep='last').reset_index(drop=True))
+        _write_table(pa.Table.from_pandas(table, preserve_index=False), dimension_path(league, name, store_dir))
+    return written
+
+
+def read_league(league, columns=None, seasons=None, store_dir=None, all_rows=False):
+    # Read only the requested columns of the requested seasons. Falls back to the
+    # CSV snapshot (typed with the same schema) when there is no columnar store.
+    # Only the player-season rows are returned (schema.player_seasons) unless all_rows.
+    store_dir = store_dir or current_root()
+    # Columns the player-season filter needs, read even when not requested
+    filters = [] if all_rows else list(SCHEMAS[league].get('player_seasons', {}))
+    if not has_store(league, store_dir):
+        if not os.path.exists(CSV_PATHS[league]):
+            # Nothing fetched yet for this league
+            return apply_schema(league, pd.DataFrame(columns=columns or []))
+        season_col = season_column(league)
+        wanted = None if columns is None else set(columns) | set(filters)
+        df = pd.read_csv(CSV_PATHS[league], usecols=None if wanted is None else lambda col: col in wanted)
+        if seasons is not None and season_col in df.columns:
+            df = df[df[season_col].astype(str).isin({str(season) for season in seasons})]
+        if filters:
+            df = player_seasons(league, df)
+            df = df.drop(columns=[col for col in filters if col in df.columns and col not in (columns or df.columns)])
+        return apply_schema(league, df).reset_index(drop=True)
+
+    available = list_seasons(league, store_dir)
+    if seasons is not None:
+        wanted = {str(season) for season in seasons}
+        available = [season for season in available if season in wanted]
+    if not available:
+        return apply_schema(league, pd.DataFrame(columns=columns or []))
+    # Keep the fetcher's season ordering (MLB oldest first, NBA newest first)
+    available = sorted(available, reverse=SCHEMAS[league].get('newest_first', False))
+
+    # Names and team attributes come from the dimension tables; read their keys instead
+    fact_columns = None
+    if columns is not None:
+        attributes = set(dimension_columns(league))
+        fact_columns = [col for col in columns if col not in attributes]
+        for dim in SCHEMAS[league]['dimensions'].values():
+            if any(col in columns for col in dim['columns']):
+                fact_columns += [key for key in dim['key'] if key not in fact_columns]
+
+    tables = []
+    for season in available:
+        path = os.path.join(league_dir(league, store_dir), f"season={season}", 'part-0.parquet')
+        read = fact_columns
+        if fact_columns is not None and any(col not in fact_columns for col in filters):
+            # Partitions written before a filter column existed don't have it
+            names = set(pq.read_schema(path).names)
+            read = fact_columns + [col for col in filters if col not in fact_columns and col in names]
+        tables.append(pq.read_table(path, columns=read))
+    # Partitions carry their own dictionaries; to_pandas unifies them into one categorical per column
+    fact = pa.concat_tables(tables, promote_options='permissive').to_pandas()
+    if filters:
+        fact = player_seasons(league, fact).reset_index(drop=True)
+    return join_dimensions(league, fact, read_dimensions(league, store_dir), columns)
+
+
+def staging_dir(league, season, store_dir=None):
+    return os.path.join(league_dir(league, store_dir), '_staging', f"season={season}")
+
+
+def staged_pages(league, season, store_dir=None):
+    # Page numbers already staged for a season (kept across an interrupted run)
+    path = staging_dir(league, season, store_dir)
+    if not os.path.isdir(path):
+        return set()
+    return {int(name[len('page-'):-len('.parquet')]) for name in os.listdir(path)
+            if name.startswith('page-') and name.endswith('.parquet')}
+
+
+def stage_page(league, season, page, df, store_dir=None):
+    # Write one fetched page of a season; it only becomes visible to readers when the season is promoted
+    path = staging_dir(league, season, store_dir)
+    os.makedirs(path, exist_ok=True)
+    _write_table(pa.Table.from_pandas(apply_schema(league, df), preserve_index=False),
+                  os.path.join(path, f"page-{page:08d}.parquet"))
+
+
+def promote_season(league, season, store_dir=None):
+    # Turn a season's staged pages (in page order) into its partition and drop the staging files.
+    # Only one season is ever read back into memory.
+    store_dir = store_dir or current_root()
+    path = staging_dir(league, season, store_dir)
+    pages = sorted(staged_pages(league, season, store_dir))
+    if not pages:
+        return None
+    tables = [pq.read_table(os.path.join(path, f"page-{page:08d}.parquet")) for page in pages]
+    df = apply_schema(league, pa.concat_tables(tables, promote_options='permissive').to_pandas())
+    write_partitions(league, df, seasons=[season], store_dir=store_dir)
+    shutil.rmtree(path, ignore_errors=True)
+    return df
+
+
+def clear_staging(league, store_dir=None):
+    shutil.rmtree(os.path.join(league_dir(league, store_dir), '_staging'), ignore_errors=True)
+
+
+def manifest_path(league, store_dir=None):
+    return os.path.join(league_dir(league, store_dir), '_manifest.json')
+
+
+def read_manifest(league, store_dir=None):
+    # {'seasons': [requested...], 'finished': {season: {'rows': n, 'pages': n}}, 'complete': bool}
+    path = manifest_path(league, store_dir)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_manifest(league, manifest, store_dir=None):
+    path = manifest_path(league, store_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    write_atomic(path, lambda f: json.dump(manifest, f, indent=2))
+
+
+def export_csv(league, path=None, store_dir=None):
+    # Rewrite the CSV snapshot from the partitions, one season at a time
+    store_dir = store_dir or current_root()
+    path = path or CSV_PATHS[league]
+    seasons = sorted(list_seasons(league, store_dir), reverse=SCHEMAS[league].get('newest_first', False))
+
+    def write(f):
+        columns = None
+        for season in seasons:
+            df = read_league(league, seasons=[season], store_dir=store_dir, all_rows=True)
+            if columns is None:
+                columns = list(df.columns)
+            df.reindex(columns=columns).to_csv(f, header=season == seasons[0], index=False)
+
+    return write_atomic(path, write)
+
+
+def aggregate_path(league, name, store_dir=None):
+    return os.path.join(league_dir(league, store_dir), f"agg_{name}.parquet")
+
+
+def write_aggregates(league, tables, version, store_dir=None):
+    # The version goes into the Parquet schema metadata, next to the pandas metadata
+    store_dir = store_dir or current_root()
+    if pq is None:
+        print("pyarrow is not installed; skipping the aggregate tables.")
+        return
+    os.makedirs(league_dir(league, store_dir), exist_ok=True)
+    for name, df in tables.items():
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        metadata = dict(table.schema.metadata or {}, dataset_version=version)
+        _write_table(table.replace_schema_metadata(metadata), aggregate_path(league, name, store_dir))
+
+
+def read_aggregate(league, name, version=None, store_dir=None):
+    # A materialized table, or None when it is missing or was built from another dataset version
+    path = aggregate_path(league, name, store_dir)
+    if pq is None or not os.path.exists(path):
+        return None
+    table = pq.read_table(path)
+    if version is not None and (table.schema.metadata or {}).get(b'dataset_version') != version.encode():
+        return None
+    return table.to_pandas()
+
+
+def build_from_csv(league, store_dir=None):
+    # Rebuild a league's store from its CSV snapshot
+    store_dir = store_dir or current_root()
+    df = pd.read_csv(CSV_PATHS[league])
+    shutil.rmtree(league_dir(league, store_dir), ignore_errors=True)
+    return write_partitions(league, df, store_dir=store_dir)
+
+
+if __name__ == "__main__":
+    for league in SCHEMAS:
+        if os.path.exists(CSV_PATHS[league]):
+            print(f"{league}: wrote seasons {build_from_csv(league)}")
@@ -0,0 +1 @@
+# db package: embedded SQLite store loaded by the fetchers and queried by the dashboard
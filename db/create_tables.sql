@@ -0,0 +1,167 @@
+-- create_tables.sql
+-- Player-season tables for the embedded SQLite store (see db/db_setup.py).
+-- Every league table shares the same key columns so queries can filter and join
+-- across leagues; stat columns keep the names used by the upstream APIs.
+
+CREATE TABLE IF NOT EXISTS mlb_player_seasons (
+    league        TEXT    NOT NULL DEFAULT 'mlb',
+    season        INTEGER NOT NULL,
+    season_label  TEXT    NOT NULL,
+    player_id     INTEGER NOT NULL,
+    player_name   TEXT    NOT NULL,
+    team_id       INTEGER NOT NULL,
+    team_name     TEXT    NOT NULL,
+    position      TEXT,
+    rank                         INTEGER,
+    plateAppearances             INTEGER,
+    totalBases                   INTEGER,
+    leftOnBase                   INTEGER,
+    sacBunts                     INTEGER,
+    sacFlies                     INTEGER,
+    extraBaseHits                INTEGER,
+    hitByPitch                   INTEGER,
+    gidp                         INTEGER,
+    gidpOpp                      INTEGER,
+    numberOfPitches              INTEGER,
+    reachedOnError               INTEGER,
+    walkOffs                     INTEGER,
+    flyOuts                      INTEGER,
+    totalSwings                  INTEGER,
+    swingAndMisses               INTEGER,
+    ballsInPlay                  INTEGER,
+    popOuts                      INTEGER,
+    lineOuts                     INTEGER,
+    groundOuts                   INTEGER,
+    flyHits                      INTEGER,
+    popHits                      INTEGER,
+    lineHits                     INTEGER,
+    groundHits                   INTEGER,
+    gamesPlayed                  INTEGER,
+    airOuts                      INTEGER,
+    runs                         INTEGER,
+    doubles                      INTEGER,
+    triples                      INTEGER,
+    homeRuns                     INTEGER,
+    strikeOuts                   INTEGER,
+    baseOnBalls                  INTEGER,
+    intentionalWalks             INTEGER,
+    hits                         INTEGER,
+    atBats                       INTEGER,
+    caughtStealing               INTEGER,
+    stolenBases                  INTEGER,
+    groundIntoDoublePlay         INTEGER,
+    rbi                          INTEGER,
+    catchersInterference         INTEGER,
+    babip                        REAL,
+    pitchesPerPlateAppearance    REAL,
+    walksPerPlateAppearance      REAL,
+    strikeoutsPerPlateAppearance REAL,
+    homeRunsPerPlateAppearance   REAL,
+    walksPerStrikeout            REAL,
+    iso                          REAL,
+    avg                          REAL,
+    obp                          REAL,
+    slg                          REAL,
+    ops                          REAL,
+    stolenBasePercentage         REAL,
+    groundOutsToAirouts          REAL,
+    atBatsPerHomeRun             REAL,
+    PRIMARY KEY (league, season, player_id, team_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_mlb_season_team ON mlb_player_seasons (season, team_id);
+CREATE INDEX IF NOT EXISTS idx_mlb_player ON mlb_player_seasons (player_id, season);
+CREATE INDEX IF NOT EXISTS idx_mlb_player_name ON mlb_player_seasons (player_name);
+CREATE INDEX IF NOT EXISTS idx_mlb_team_name ON mlb_player_seasons (team_name, season);
+
+CREATE TABLE IF NOT EXISTS nba_player_seasons (
+    league        TEXT    NOT NULL DEFAULT 'nba',
+    season        INTEGER NOT NULL,
+    season_label  TEXT    NOT NULL,
+    player_id     INTEGER NOT NULL,
+    player_name   TEXT    NOT NULL,
+    team_id       INTEGER NOT NULL,
+    team_name     TEXT    NOT NULL,
+    RANK                         INTEGER,
+    GP                           INTEGER,
+    MIN                          REAL,
+    FGM                          REAL,
+    FGA                          REAL,
+    FG_PCT                       REAL,
+    FG3M                         REAL,
+    FG3A                         REAL,
+    FG3_PCT                      REAL,
+    FTM                          REAL,
+    FTA                          REAL,
+    FT_PCT                       REAL,
+    OREB                         REAL,
+    DREB                         REAL,
+    REB                          REAL,
+    AST                          REAL,
+    STL                          REAL,
+    BLK                          REAL,
+    TOV                          REAL,
+    PTS                          REAL,
+    EFF                          REAL,
+    PRIMARY KEY (league, season, player_id, team_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_nba_season_team ON nba_player_seasons (season, team_id);
+CREATE INDEX IF NOT EXISTS idx_nba_player ON nba_player_seasons (player_id, season);
+CREATE INDEX IF NOT EXISTS idx_nba_player_name ON nba_player_seasons (player_name);
+CREATE INDEX IF NOT EXISTS idx_nba_team_name ON nba_player_seasons (team_name, season);
+
+CREATE TABLE IF NOT EXISTS nfl_player_seasons (
+    league        TEXT    NOT NULL DEFAULT 'nfl',
+    season        INTEGER NOT NULL,
+    season_label  TEXT    NOT NULL,
+    player_id     INTEGER NOT NULL,
+    player_name   TEXT    NOT NULL,
+    team_id       INTEGER NOT NULL,
+    team_name     TEXT    NOT NULL,
+    position      TEXT,
+    gamesPlayed                  INTEGER,
+    completions                  INTEGER,
+    passingAttempts              INTEGER,
+    passingYards                 INTEGER,
+    passingTouchdowns            INTEGER,
+    interceptions                INTEGER,
+    rushingAttempts              INTEGER,
+    rushingYards                 INTEGER,
+    rushingTouchdowns            INTEGER,
+    receptions                   INTEGER,
+    receivingTargets             INTEGER,
+    receivingYards               INTEGER,
+    receivingTouchdowns          INTEGER,
+    totalTackles                 INTEGER,
+    fumbles                      INTEGER,
+    fumblesLost                  INTEGER,
+    completionPct                REAL,
+    QBRating                     REAL,
+    yardsPerPassAttempt          REAL,
+    yardsPerRushAttempt          REAL,
+    yardsPerReception            REAL,
+    sacks                        REAL,
+    PRIMARY KEY (league, season, player_id, team_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_nfl_season_team ON nfl_player_seasons (season, team_id);
+CREATE INDEX IF NOT EXISTS idx_nfl_player ON nfl_player_seasons (player_id, season);
+CREATE INDEX IF NOT EXISTS idx_nfl_player_name ON nfl_player_seasons (player_name);
+CREATE INDEX IF NOT EXISTS idx_nfl_team_name ON nfl_player_seasons (team_name, season);
+
+-- Key columns of every league in one place for multi-league queries
+DROP VIEW IF EXISTS player_seasons;
+CREATE VIEW player_seasons AS
+    SELECT league, season, season_label, player_id, player_name, team_id, team_name FROM mlb_player_seasons
+    UNION ALL
+    SELECT league, season, season_label, player_id, player_name, team_id, team_name FROM nba_player_seasons
+    UNION ALL
+    SELECT league, season, season_label, player_id, player_name, team_id, team_name FROM nfl_player_seasons;
+
+-- Dataset version loaded for each league, used to key caches on top of the store
+CREATE TABLE IF NOT EXISTS dataset_versions (
+    league     TEXT PRIMARY KEY,
+    version    TEXT NOT NULL,
+    loaded_at  TEXT NOT NULL DEFAULT (datetime('now'))
+);
@@ -0,0 +1,105 @@
+#db_queries.py
+import os
+
+import pandas as pd
+
+from data.leagues import get_adapter
+from data.leagues.base import NORMALIZED_KEYS
+from db.db_setup import DB_PATH, reader, table_columns, table_name
+
+# The dashboard's filtered and aggregated reads run inside SQLite; only the (small) result reaches
+# pandas. Results use the page's column names (playerFullName, not player_name) so they can stand
+# in for rows of the in-memory dataset. Column names can't be bound as parameters, so every
+# column is checked against the table first.
+
+ALL = 'All'
+
+
+def available(league, version=None, path=DB_PATH):
+    # True when the database holds this league (at `version`, when given)
+    if not os.path.exists(path):
+        return False
+    try:
+        row = reader(path).execute('SELECT version FROM dataset_versions WHERE league = ?', (league,)).fetchone()
+    except Exception:
+        return False
+    return row is not None and (version is None or row[0] == version)
+
+
+def _stats(league, stats, path):
+    columns = set(table_columns(reader(path), league)) - set(NORMALIZED_KEYS)
+    unknown = [stat for stat in stats if stat not in columns]
+    if unknown:
+        raise ValueError(f"Unknown {league} stats: {unknown}")
+    return [f'"{stat}"' for stat in stats]
+
+
+def _columns(league, columns, path):
+    # SELECT list for page columns: the shared key columns under the league's own names
+    adapter = get_adapter(league)
+    keys = {col: key for key, col in adapter.key_columns.items()}
+    # The page's season column holds the label ('2023-24'), not the integer season
+    keys[adapter.season_col] = 'season_label'
+    stats = iter(_stats(league, [col for col in columns if col not in keys], path))
+    return [f'{keys[col]} AS "{col}"' if col in keys else next(stats) for col in columns]
+
+
+def _where(season=None, team=None, player=None):
+    # WHERE clause for the dashboard filters; 'All'/None means no filter, lists mean any of
+    # Seasons are matched on the indexed integer column ('2023-24' -> 2023)
+    clauses, params = [], []
+    for col, value in (('season', season), ('team_name', team), ('player_name', player)):
+        if value is None or (isinstance(value, str) and value == ALL):
+            continue
+        convert = (lambda v: int(str(v)[:4])) if col == 'season' else str
+        if isinstance(value, (list, tuple, set)):
+            values = [convert(v) for v in value]
+            clauses.append(f"{col} IN ({', '.join('?' for _ in values)})")
+            params.extend(values)
+        else:
+            clauses.append(f"{col} = ?")
+            params.append(convert(value))
+    return (' WHERE ' + ' AND '.join(clauses) if clauses else ''), params
+
+
+def query(sql, params=(), path=DB_PATH):
+    return pd.read_sql_query(sql, reader(path), params=list(params))
+
+
+def top_n(league, stats, n=25, season=None, team=None, path=DB_PATH):
+    # The n player-seasons with the highest first stat
+    adapter = get_adapter(league)
+    cols = _columns(league, [adapter.player_col, adapter.team_col, adapter.season_col] + stats, path)
+    where, params = _where(season, team)
+    sql = f'SELECT {", ".join(cols)} FROM "{table_name(league)}"{where} ORDER BY "{stats[0]}" DESC LIMIT ?'
+    return query(sql, params + [int(n)], path)
+
+
+def team_totals(league, stats, season=None, team=None, path=DB_PATH):
+    # Per-team sums of stats for one season (or all of them), largest first
+    adapter = get_adapter(league)
+    cols = _stats(league, stats, path)
+    sums = ', '.join(f'SUM({col}) AS {col}' for col in cols)
+    where, params = _where(season, team)
+    sql = (f'SELECT team_name AS "{adapter.team_col}", {sums} FROM "{table_name(league)}"{where} '
+           f'GROUP BY team_name ORDER BY {cols[0]} DESC')
+    return query(sql, params, path)
+
+
+def rows(league, columns, season=None, team=None, player=None, path=DB_PATH):
+    # The player-seasons matching the filters, in load order
+    where, params = _where(season, team, player)
+    sql = f'SELECT {", ".join(_columns(league, columns, path))} FROM "{table_name(league)}"{where} ORDER BY rowid'
+    return query(sql, params, path)
+
+
+def league_summary(leagues=None, path=DB_PATH):
+    # Players, teams and player-seasons per league and season, across leagues in one query
+    where, params = '', []
+    if leagues:
+        where = f" WHERE league IN ({', '.join('?' for _ in leagues)})"
+        params = list(leagues)
+    sql = ('SELECT league, season_label AS season, COUNT(DISTINCT player_id) AS players, '
+           'COUNT(DISTINCT team_name) AS teams, COUNT(*) AS player_seasons '
+           f'FROM player_seasons{where} GROUP BY league, season, season_label ORDER BY league, season')
+    return query(sql, params, path)
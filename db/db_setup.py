@@ -0,0 +1,94 @@
+#db_setup.py
+import os
+import sqlite3
+import threading
+
+from data import DATA_DIR
+from data.leagues import get_adapter, leagues
+
+DB_PATH = os.path.join(DATA_DIR, 'league_stats.sqlite')
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'create_tables.sql')
+
+_local = threading.local()
+
+
+def table_name(league):
+    return f"{get_adapter(league).name}_player_seasons"
+
+
+def connect(path=DB_PATH, read_only=False):
+    # WAL lets the dashboard keep reading while a fetcher loads new seasons
+    if read_only:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+    else:
+        conn = sqlite3.connect(path, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA query_only=ON' if read_only else 'PRAGMA query_only=OFF')
+    return conn
+
+
+def reader(path=DB_PATH):
+    # One read-only connection per thread (Streamlit runs each session on its own thread)
+    conns = getattr(_local, 'conns', None)
+    if conns is None:
+        conns = _local.conns = {}
+    if path not in conns:
+        conns[path] = connect(path, read_only=True)
+    return conns[path]
+
+
+def create_tables(conn):
+    with open(SCHEMA_PATH) as f:
+        conn.executescript(f.read())
+
+
+def table_columns(conn, league):
+    return [row[1] for row in conn.execute(f'PRAGMA table_info("{table_name(league)}")')]
+
+
+def load_league(league, df, seasons=None, version=None, path=DB_PATH):
+    # Replace the given seasons inside one transaction, so readers see either the old or the
+    # new rows, never a mix. A season df has no rows for is emptied; without seasons, df is
+    # the whole league and replaces everything in its table.
+    conn = connect(path)
+    try:
+        create_tables(conn)
+        # The league adapter maps its columns onto the shared key columns of the table
+        rows = get_adapter(league).normalize(df)
+        columns = table_columns(conn, league)
+        if not columns:
+            # Only the dashboard leagues have a table (not e.g. the MLB pitching dataset)
+            return 0
+        rows = rows[[col for col in columns if col in rows.columns]]
+        if seasons is not None:
+            wanted = {str(season) for season in seasons}
+            rows = rows[rows['season_label'].isin(wanted)]
+        # sqlite3 only binds plain Python values
+        records = rows.astype(object).where(rows.notna(), None).itertuples(index=False, name=None)
+
+        placeholders = ', '.join('?' for _ in rows.columns)
+        quoted = ', '.join(f'"{col}"' for col in rows.columns)
+        with conn:
+            if seasons is None:
+                conn.execute(f'DELETE FROM "{table_name(league)}"')
+            else:
+                conn.executemany(f'DELETE FROM "{table_name(league)}" WHERE season_label = ?',
+                                 [(label,) for label in wanted])
+            conn.executemany(f'INSERT OR REPLACE INTO "{table_name(league)}" ({quoted}) VALUES ({placeholders})', records)
+            if version is not None:
+                conn.execute('INSERT OR REPLACE INTO dataset_versions (league, version) VALUES (?, ?)', (league, version))
+        conn.execute('ANALYZE')
+        return len(rows)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    from data import store
+
+    # Build the database from the columnar store (or the CSV snapshots)
+    for league in leagues():
+        if not os.path.exists(store.CSV_PATHS[league]) and not store.has_store(league):
+            continue
+        count = load_league(league, store.read_league(league), version=store.dataset_version(league))
+        print(f"{league}: loaded {count} player-seasons into {DB_PATH}")
@@ -0,0 +1 @@
+# models package: next-season feature matrices, training and batched predictions
@@ -0,0 +1,99 @@
+#ml_utils.py
+import os
+
+import numpy as np
+import pandas as pd
+
+from data import store
+from data.leagues import get_adapter
+from data.schema import season_year
+
+# scikit-learn is imported inside the functions that need it, so the dashboard pages
+# only pay for it when a model is actually used
+
+MODELS_DIR = os.path.dirname(os.path.abspath(__file__))
+# Feature matrices on disk: models/cache/<league>-<dataset version>-v<FEATURE_VERSION>.parquet
+CACHE_DIR = os.path.join(MODELS_DIR, 'cache')
+
+# What each league's model predicts for a player's next season, and from which of the
+# current season's stats (plus the same stats one season earlier, suffixed _prev)
+TARGETS = {'mlb': 'ops', 'nba': 'PTS'}
+FEATURES = {
+    'mlb': ['gamesPlayed', 'plateAppearances', 'atBats', 'runs', 'hits', 'doubles', 'triples', 'homeRuns',
+            'rbi', 'baseOnBalls', 'strikeOuts', 'stolenBases', 'avg', 'obp', 'slg', 'ops'],
+    'nba': ['GP', 'MIN', 'PTS', 'FGM', 'FGA', 'FG_PCT', 'FG3M', 'FG3A', 'FG3_PCT', 'FTM', 'FTA', 'FT_PCT',
+            'OREB', 'DREB', 'REB', 'AST', 'STL', 'BLK', 'TOV', 'EFF'],
+}
+# Bump when the feature layout changes so cached matrices are rebuilt
+FEATURE_VERSION = 1
+
+
+def feature_columns(league):
+    base = FEATURES[league]
+    return base + [f"{col}_prev" for col in base] + ['seasons_played']
+
+
+def build_features(league, df):
+    # One row per player season: that season's stats, the previous season's stats, how many
+    # seasons the player has played so far, and (when known) the target stat of the next season
+    adapter = get_adapter(league)
+    base = [col for col in FEATURES[league] if col in df.columns]
+    keys = {adapter.key_columns['player_id']: 'player_id', adapter.season_col: 'season',
+            adapter.player_col: 'player', adapter.team_col: 'team'}
+    seasons = df[list(keys) + base].rename(columns=keys)
+    seasons['year'] = season_year(seasons['season'])
+    seasons = seasons.drop_duplicates(['player_id', 'year']).sort_values(['player_id', 'year'], kind='stable')
+    seasons['seasons_played'] = seasons.groupby('player_id').cumcount() + 1
+
+    previous = seasons[['player_id', 'year'] + base].assign(year=seasons['year'] + 1)
+    following = seasons[['player_id', 'year', TARGETS[league]]].assign(year=seasons['year'] - 1)
+    features = (seasons
+                .merge(previous, on=['player_id', 'year'], how='left', suffixes=('', '_prev'))
+                .merge(following.rename(columns={TARGETS[league]: 'target'}), on=['player_id', 'year'], how='left'))
+    for col in feature_columns(league):
+        if col not in features.columns:
+            features[col] = np.nan
+    return features.reset_index(drop=True)
+
+
+def cache_path(league, version):
+    return os.path.join(CACHE_DIR, f"{league}-{version}-v{FEATURE_VERSION}.parquet")
+
+
+def load_features(league):
+    # build_features over the stored dataset, cached on disk per dataset version. Matrices of
+    # older versions are removed when a new one is written.
+    root = store.current_root()
+    version = store.dataset_version(league, root)
+    path = cache_path(league, version)
+    if store.pq is not None and os.path.exists(path):
+        return pd.read_parquet(path), version
+
+    features = build_features(league, store.read_league(league, store_dir=root))
+    if store.pq is not None:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        for name in os.listdir(CACHE_DIR):
+            if name.startswith(f"{league}-"):
+                os.remove(os.path.join(CACHE_DIR, name))
+        store.write_atomic(path, lambda f: features.to_parquet(f, index=False), 'wb')
+    return features, version
+
+
+def training_rows(features):
+    # Player seasons whose next season is known
+    return features[features['target'].notna()].reset_index(drop=True)
+
+
+def latest_rows(features):
+    # Player seasons of the latest season: the ones to project forward
+    return features[features['year'] == features['year'].max()].reset_index(drop=True)
+
+
+def evaluate(y_true, y_pred):
+    from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+    return {
+        'mae': float(mean_absolute_error(y_true, y_pred)),
+        'rmse': float(np.sqrt(mean_squared_error(y_true, y_pred))),
+        'r2': float(r2_score(y_true, y_pred)),
+    }
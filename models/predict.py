@@ -0,0 +1,67 @@
+#predict.py
+import os
+import threading
+
+from data import store
+from models import ml_utils
+from models.train_model import model_path
+
+# Trained models and their batched projections, per process:
+#   _models:      {league: (model file mtime, bundle)}
+#   _projections: {league: ((model file mtime, dataset version), frame)}
+_models = {}
+_projections = {}
+_lock = threading.Lock()
+
+
+def _model_mtime(league):
+    try:
+        return os.stat(model_path(league)).st_mtime_ns
+    except OSError:
+        return None
+
+
+def load_model(league):
+    # The saved bundle for a league (see train_model.train), reloaded when the file changes; None if untrained
+    if league not in ml_utils.TARGETS:
+        return None
+    mtime = _model_mtime(league)
+    if mtime is None:
+        return None
+    with _lock:
+        entry = _models.get(league)
+        if entry is not None and entry[0] == mtime:
+            return entry[1]
+
+    import joblib
+    bundle = joblib.load(model_path(league))
+    if bundle.get('feature_version') != ml_utils.FEATURE_VERSION:
+        # Trained on another feature layout; needs retraining
+        return None
+    with _lock:
+        _models[league] = (mtime, bundle)
+    return bundle
+
+
+def projections(league):
+    # Next-season projection of every player of the latest season, predicted in one batch per
+    # (model, dataset version); a page rerun only filters the result. None if there is no model.
+    bundle = load_model(league)
+    if bundle is None:
+        return None
+    key = (_model_mtime(league), store.dataset_version(league))
+    with _lock:
+        entry = _projections.get(league)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+
+    features, _ = ml_utils.load_features(league)
+    latest = ml_utils.latest_rows(features)
+    target = bundle['target']
+    frame = latest[['player', 'team', 'season', target]].rename(columns={target: 'current'})
+    frame['projected'] = bundle['model'].predict(latest[bundle['features']].to_numpy(dtype='float64'))
+    frame['change'] = frame['projected'] - frame['current']
+    frame = frame.sort_values('projected', ascending=False, kind='stable').reset_index(drop=True)
+    with _lock:
+        _projections[league] = (key, frame)
+    return frame
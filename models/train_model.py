@@ -0,0 +1,105 @@
+#train_model.py
+import os
+import sys
+import time
+
+from data import store
+from models import ml_utils
+
+SAVED_MODELS_DIR = os.path.join(ml_utils.MODELS_DIR, 'saved_models')
+
+# Folds of the cross-validated search; folds are split by player so a player's seasons
+# never sit on both sides of a split
+CV_FOLDS = 5
+
+
+def candidates():
+    # Estimators and the hyperparameter grid searched for each
+    from sklearn.ensemble import HistGradientBoostingRegressor
+    from sklearn.impute import SimpleImputer
+    from sklearn.linear_model import Ridge
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    return {
+        'ridge': (make_pipeline(SimpleImputer(), StandardScaler(), Ridge()),
+                  {'ridge__alpha': [0.1, 1.0, 10.0, 100.0]}),
+        # Handles the missing previous season natively
+        'hist_gbm': (HistGradientBoostingRegressor(random_state=0),
+                     {'learning_rate': [0.03, 0.1], 'max_leaf_nodes': [7, 15, 31], 'max_iter': [200],
+                      'l2_regularization': [0.0, 1.0]}),
+    }
+
+
+def model_path(league):
+    return os.path.join(SAVED_MODELS_DIR, f"{league}_{ml_utils.TARGETS[league]}.joblib")
+
+
+def train(league, n_jobs=-1):
+    # Grid search every candidate on all but the latest known target season, score the best on
+    # that held-out season against "same as this season", refit it on every row and save it
+    import joblib
+    from sklearn.model_selection import GridSearchCV, GroupKFold
+
+    started = time.perf_counter()
+    features, version = ml_utils.load_features(league)
+    rows = ml_utils.training_rows(features)
+    if rows.empty:
+        print(f"{league.upper()}: no player has two consecutive seasons; nothing to train.")
+        return None
+    columns = ml_utils.feature_columns(league)
+    target = ml_utils.TARGETS[league]
+
+    holdout_mask = (rows['year'] == rows['year'].max()).to_numpy()
+    train_rows, holdout = rows[~holdout_mask], rows[holdout_mask]
+    if train_rows['player_id'].nunique() < CV_FOLDS:
+        # Too little history to hold a season out
+        train_rows, holdout = rows, rows.iloc[:0]
+    X = train_rows[columns].to_numpy(dtype='float64')
+    y = train_rows['target'].to_numpy(dtype='float64')
+    groups = train_rows['player_id'].to_numpy()
+
+    # Every (candidate, parameters, fold) fit runs in the joblib worker pool
+    results = {}
+    for name, (estimator, grid) in candidates().items():
+        search = GridSearchCV(estimator, grid, cv=GroupKFold(n_splits=CV_FOLDS),
+                              scoring='neg_mean_absolute_error', n_jobs=n_jobs)
+        search.fit(X, y, groups=groups)
+        results[name] = search
+        print(f"{league.upper()} {name}: CV MAE {-search.best_score_:.4f} {search.best_params_}")
+    best_name = max(results, key=lambda name: results[name].best_score_)
+    best = results[best_name]
+
+    metrics = {'cv_mae': float(-best.best_score_)}
+    if len(holdout):
+        X_holdout = holdout[columns].to_numpy(dtype='float64')
+        metrics['holdout'] = ml_utils.evaluate(holdout['target'], best.best_estimator_.predict(X_holdout))
+        metrics['baseline'] = ml_utils.evaluate(holdout['target'], holdout[target].fillna(holdout[target].mean()))
+
+    # Final model on every known next season
+    model = best.best_estimator_.fit(rows[columns].to_numpy(dtype='float64'), rows['target'].to_numpy(dtype='float64'))
+    bundle = {
+        'league': league, 'target': target, 'features': columns, 'model': model, 'estimator': best_name,
+        'params': best.best_params_, 'metrics': metrics, 'dataset_version': version,
+        'feature_version': ml_utils.FEATURE_VERSION, 'rows': len(rows), 'trained_at': time.time(),
+    }
+    os.makedirs(SAVED_MODELS_DIR, exist_ok=True)
+    path = model_path(league)
+    store.write_atomic(path, lambda f: joblib.dump(bundle, f), 'wb')
+
+    summary = f"{league.upper()} {target}: {best_name}, {len(rows)} rows"
+    if 'holdout' in metrics:
+        summary += f", holdout MAE {metrics['holdout']['mae']:.4f} (baseline {metrics['baseline']['mae']:.4f})"
+    print(f"{summary}, {time.perf_counter() - started:.1f} s -> {path}")
+    return bundle
+
+
+if __name__ == "__main__":
+    # python -m models.train_model [league ...] [--jobs N]
+    args = sys.argv[1:]
+    n_jobs = -1
+    if '--jobs' in args:
+        n_jobs = int(args[args.index('--jobs') + 1])
+        del args[args.index('--jobs'):args.index('--jobs') + 2]
+    for league in args or list(ml_utils.TARGETS):
+        train(league, n_jobs=n_jobs)
@@ -0,0 +1 @@
+# visualizations package: figure builders shared by the dashboard pages
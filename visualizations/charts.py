@@ -0,0 +1,88 @@
+#charts.py
+# plotly is imported inside each builder so importing this module stays cheap
+
+
+def radar_chart(players, stats, values):
+    # values is the (players x stats) array returned by ComparisonEngine.series
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    for player, row in zip(players, values):
+        fig.add_trace(go.Scatterpolar(
+            r=row,
+            theta=stats,
+            fill='toself',
+            name=player
+        ))
+
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(visible=True, range=[0, 1])),
+        showlegend=True,
+        title=f"Comparison of Selected Stats for {', '.join(players)}"
+    )
+    return fig
+
+
+def grouped_bars(data, x, stats, title):
+    # One group per x value (player or team), one bar per stat
+    import plotly.express as px
+
+    return px.bar(data, x=x, y=stats, title=title, barmode='group')
+
+
+def avg_ops_bars(data, player_col='playerFullName'):
+    # Batting average next to OPS for each row's player
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+
+    # Add a bar for batting average
+    fig.add_trace(go.Bar(
+        x=data[player_col],
+        y=data['avg'],
+        name='Batting Average',
+        marker_color='blue'
+    ))
+
+    # Add a bar for OPS
+    fig.add_trace(go.Bar(
+        x=data[player_col],
+        y=data['ops'],
+        name='OPS',
+        marker_color='lightBlue'
+    ))
+
+    fig.update_layout(
+        title='Player Average and OPS Comparison',
+        barmode='group',
+        xaxis_title='Player',
+        yaxis_title='Statistics',
+        legend_title='Metrics'
+    )
+    return fig
+
+
+def projection_bars(rows, target):
+    # Current and projected value of the target stat per player (rows from predict.projections)
+    import plotly.express as px
+
+    return px.bar(rows, x='player', y=['current', 'projected'], barmode='group',
+                  title=f"{target}: {rows['season'].iloc[0]} and Projected Next Season" if len(rows) else target)
+
+
+def trajectory_lines(data, season_col, stat, rolling_col):
+    # A stat over a player's seasons with its rolling mean (data from TrajectoryEngine.trajectory)
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=data[season_col], y=data[stat], mode='lines+markers', name=stat))
+    fig.add_trace(go.Scatter(x=data[season_col], y=data[rolling_col], mode='lines', name='Rolling mean',
+                             line=dict(dash='dash')))
+    fig.update_layout(
+        title=f"{stat} by Season",
+        xaxis=dict(title='Season', type='category'),
+        yaxis_title=stat,
+        legend_title='Metrics'
+    )
+    return fig
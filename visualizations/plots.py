@@ -0,0 +1,110 @@
+#plots.py
+import io
+import threading
+from collections import OrderedDict
+
+# matplotlib and seaborn are imported inside the builders: they are only paid for
+# when a figure actually has to be rendered (not on a cache hit)
+
+# Rendered PNGs kept per process; whichever limit is hit first evicts the oldest entries
+MAX_FIGURES = 256
+MAX_BYTES = 64 * 1024 * 1024
+
+
+class FigureCache:
+    # Bounded LRU of rendered figures (PNG bytes) keyed by (chart, selection, dataset version).
+    # Only bytes are kept: the matplotlib Figure is dropped as soon as it is rasterized.
+
+    def __init__(self, max_items=MAX_FIGURES, max_bytes=MAX_BYTES):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.num_bytes = 0
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_render(self, key, build_figure, dpi=100):
+        with self._lock:
+            png = self._items.get(key)
+            if png is not None:
+                self._items.move_to_end(key)
+                self.stats['hits'] += 1
+                return png
+            self.stats['misses'] += 1
+
+        png = render_png(build_figure(), dpi=dpi)
+        with self._lock:
+            if key not in self._items:
+                self._items[key] = png
+                self.num_bytes += len(png)
+            while self._items and (len(self._items) > self.max_items or self.num_bytes > self.max_bytes):
+                _, evicted = self._items.popitem(last=False)
+                self.num_bytes -= len(evicted)
+                self.stats['evictions'] += 1
+        return png
+
+    def __len__(self):
+        return len(self._items)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.num_bytes = 0
+
+
+figure_cache = FigureCache()
+
+
+def render_png(fig, dpi=100):
+    # Figure objects aren't registered with pyplot, so nothing global is left behind
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=dpi, bbox_inches='tight')
+    return buffer.getvalue()
+
+
+def _by_season(data):
+    # Plot seasons as ordered labels, oldest first
+    data = data.assign(Season=data['Season'].astype(str))
+    return data.sort_values('Season', kind='stable')
+
+
+def fg_pct_line(data, label, season=None):
+    # FG% per season for one player, or the league average when data is already aggregated;
+    # a season on the line is marked
+    import seaborn as sns
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    data = _by_season(data)
+    sns.lineplot(x='Season', y='FG_PCT', data=data, marker='o', label=label, ax=ax)
+    marked = data[data['Season'] == str(season)]
+    if not marked.empty:
+        ax.scatter(marked['Season'], marked['FG_PCT'], s=150, color='red', zorder=3, label=f"Season {season}")
+
+    ax.set_title('Field Goal Percentage Over Seasons')
+    ax.set_xlabel('Season')
+    ax.set_ylabel('Field Goal Percentage')
+    ax.tick_params(axis='x', labelrotation=45)
+    ax.legend()
+    return fig
+
+
+def fgm_vs_fga_scatter(data, players):
+    # One scatter series per selected player
+    import seaborn as sns
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    for player in players:
+        player_df = data[data['PLAYER'] == player]
+        sns.scatterplot(x='FGA', y='FGM', data=player_df, marker='o', label=player, ax=ax)
+
+    ax.set_title('Field Goals Made vs Field Goals Attempted - Player Comparison')
+    ax.set_xlabel('Field Goals Attempted (FGA)')
+    ax.set_ylabel('Field Goals Made (FGM)')
+    if players:
+        ax.legend(title="Players")
+    ax.grid(True)
+    return fig
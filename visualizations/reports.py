@@ -0,0 +1,221 @@
+#reports.py
+import hashlib
+import html
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from data import datasets, store
+from data.leagues import get_adapter
+from visualizations import charts, plots
+
+# Static team and season reports rendered without a Streamlit session: one HTML page per
+# (league, season, team), one per season for the whole league (team 'all') and one per team
+# over every season. The parent process slices the dataset into each report's chart inputs
+# and hashes them; only reports whose hash changed are sent to the worker pool, which builds
+# the figures with the same builders as the dashboard pages. Plotly charts are embedded in
+# the HTML (they need a browser to draw); matplotlib charts are written next to it as PNG.
+#
+# Layout: data/reports/<league>/<season or 'history'>/<team>.html (+ <team>.<chart>.png), an
+# index.html per league, plotly.min.js shared by every page and _manifest.json with each
+# report's hash.
+
+REPORTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'reports')
+DEFAULT_LEAGUES = ['mlb', 'nba']
+# Bump when a report's charts change so every report is rendered again
+REPORT_VERSION = 1
+# Players in the leaders chart, and in the per-player comparisons
+TOP_N = 25
+COMPARE_N = 10
+
+BUILDERS = {'charts': charts, 'plots': plots}
+
+
+def slug(value):
+    return re.sub(r'[^A-Za-z0-9]+', '-', str(value)).strip('-').lower() or 'unknown'
+
+
+def _plain(frame):
+    # Small, self-contained chart input: categorical columns would carry (and pickle) every
+    # category of the full dataset
+    frame = frame.reset_index(drop=True)
+    for col in frame.columns:
+        if isinstance(frame[col].dtype, pd.CategoricalDtype):
+            frame[col] = frame[col].astype(str)
+    return frame
+
+
+def report_charts(league, rows, team):
+    # The charts of one season report: [(name, 'module.builder', data, kwargs)]. rows are the
+    # season's rows of the team, or of every team for the league report (team None).
+    adapter = get_adapter(league)
+    stats, title = adapter.bar_chart
+    player_col, team_col = adapter.player_col, adapter.team_col
+    leaders = rows.nlargest(TOP_N, stats[0])
+    specs = [('leaders', 'charts.grouped_bars', leaders[[player_col] + stats],
+              {'x': player_col, 'stats': stats, 'title': title})]
+    if team is None:
+        totals = rows.groupby(team_col, observed=True)[stats].sum().reset_index()
+        specs.append(('teams', 'charts.grouped_bars', totals.sort_values(stats[0], ascending=False),
+                      {'x': team_col, 'stats': stats, 'title': f"{title} by Team"}))
+
+    compared = leaders.head(COMPARE_N)
+    if league == 'mlb':
+        specs.append(('avg_ops', 'charts.avg_ops_bars', compared[[player_col, 'avg', 'ops']], {'player_col': player_col}))
+    elif league == 'nba':
+        players = compared[player_col].astype(str).tolist()
+        specs.append(('fgm_vs_fga', 'plots.fgm_vs_fga_scatter', compared[[player_col, 'FGM', 'FGA']],
+                      {'players': players}))
+    return [(name, builder, _plain(data), kwargs) for name, builder, data, kwargs in specs]
+
+
+def history_charts(league, rows, team):
+    # The charts of a team's (or the league's) report over every season
+    adapter = get_adapter(league)
+    stats, title = adapter.bar_chart
+    season_col = adapter.season_col
+    by_season = rows.groupby(season_col, observed=True, sort=True)
+    specs = [('seasons', 'charts.grouped_bars', by_season[stats].sum().reset_index(),
+              {'x': season_col, 'stats': stats, 'title': f"{title} by Season"})]
+    if league == 'nba':
+        means = by_season['FG_PCT'].mean().reset_index().rename(columns={season_col: 'Season'})
+        specs.append(('fg_pct', 'plots.fg_pct_line', means,
+                      {'label': 'Average FG%' if team is None else f"{team} average FG%"}))
+    return [(name, builder, _plain(data), kwargs) for name, builder, data, kwargs in specs]
+
+
+def content_hash(specs):
+    # Hash of everything a report is drawn from: chart inputs, their options and REPORT_VERSION
+    digest = hashlib.sha256(f"v{REPORT_VERSION}".encode())
+    for name, builder, data, kwargs in specs:
+        digest.update(repr((name, builder, list(data.columns), sorted(kwargs.items()))).encode())
+        digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def plan(league, out_dir=REPORTS_DIR):
+    # Every report of a league: [(key, title, specs, html path)]. One per season and team, and
+    # one per team over all seasons (in <league>/history/)
+    adapter = get_adapter(league)
+    df = datasets.get_dataset(league, adapter.page_columns)
+    season_col, team_col = adapter.season_col, adapter.team_col
+
+    def job(folder, name, title, specs):
+        return (f"{league}/{folder}/{name}", f"{adapter.title} {title}", specs,
+                os.path.join(out_dir, league, folder, f"{name}.html"))
+
+    jobs = []
+    for season, season_rows in df.groupby(season_col, observed=True, sort=True):
+        jobs.append(job(slug(season), 'all', f"{season}: League", report_charts(league, season_rows, None)))
+        for team, rows in season_rows.groupby(team_col, observed=True, sort=True):
+            jobs.append(job(slug(season), slug(team), f"{season}: {team}", report_charts(league, rows, team)))
+    jobs.append(job('history', 'all', "League History", history_charts(league, df, None)))
+    for team, rows in df.groupby(team_col, observed=True, sort=True):
+        jobs.append(job('history', slug(team), f"{team} History", history_charts(league, rows, team)))
+    return jobs
+
+
+def _write(path, content, mode='w'):
+    store.write_atomic(path, lambda f: f.write(content), mode)
+
+
+def render_report(title, specs, html_path, plotly_js):
+    # Runs in a pool worker: build one report's figures and write its files
+    os.makedirs(os.path.dirname(html_path), exist_ok=True)
+    stem = html_path[:-len('.html')]
+    parts = []
+    for name, builder, data, kwargs in specs:
+        module, function = builder.split('.')
+        fig = getattr(BUILDERS[module], function)(data, **kwargs)
+        if module == 'plots':
+            _write(f"{stem}.{name}.png", plots.render_png(fig), 'wb')
+            parts.append(f'<img src="{os.path.basename(stem)}.{name}.png" alt="{html.escape(name)}">')
+        else:
+            parts.append(fig.to_html(full_html=False, include_plotlyjs=False))
+    script = os.path.relpath(plotly_js, os.path.dirname(html_path))
+    _write(html_path, f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{html.escape(title)}</title>
+<script src="{script}"></script></head>
+<body><h1>{html.escape(title)}</h1>
+{chr(10).join(parts)}
+</body></html>
+""")
+    return html_path
+
+
+def write_index(league, jobs, out_dir):
+    links = '\n'.join(f'<li><a href="{os.path.relpath(path, os.path.join(out_dir, league))}">{html.escape(title)}</a></li>'
+                      for _, title, _, path in jobs)
+    _write(os.path.join(out_dir, league, 'index.html'),
+           f"<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>{league.upper()} reports</title></head>\n"
+           f"<body><h1>{league.upper()} reports</h1>\n<ul>\n{links}\n</ul>\n</body></html>\n")
+
+
+def read_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, '_manifest.json')) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def render(leagues=None, out_dir=REPORTS_DIR, max_workers=None, force=False):
+    # Render every report whose inputs changed since the last run; returns (rendered, skipped, failed)
+    started = time.perf_counter()
+    os.makedirs(out_dir, exist_ok=True)
+    plotly_js = os.path.join(out_dir, 'plotly.min.js')
+    if not os.path.exists(plotly_js):
+        from plotly.offline import get_plotlyjs
+        _write(plotly_js, get_plotlyjs())
+
+    manifest = read_manifest(out_dir)
+    todo, skipped = [], 0
+    for league in leagues or DEFAULT_LEAGUES:
+        jobs = plan(league, out_dir)
+        for key, title, specs, path in jobs:
+            digest = content_hash(specs)
+            if not force and manifest.get(key) == digest and os.path.exists(path):
+                skipped += 1
+            else:
+                todo.append((key, digest, title, specs, path))
+        os.makedirs(os.path.join(out_dir, league), exist_ok=True)
+        write_index(league, jobs, out_dir)
+
+    failed = 0
+    if todo:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(render_report, title, specs, path, plotly_js): (key, digest)
+                       for key, digest, title, specs, path in todo}
+            for future in as_completed(futures):
+                key, digest = futures[future]
+                try:
+                    future.result()
+                    manifest[key] = digest
+                except Exception as e:
+                    failed += 1
+                    manifest.pop(key, None)
+                    print(f"Failed to render {key}: {e}")
+        _write(os.path.join(out_dir, '_manifest.json'), json.dumps(manifest, indent=2, sort_keys=True))
+
+    print(f"Rendered {len(todo) - failed} reports, skipped {skipped} unchanged, {failed} failed "
+          f"in {time.perf_counter() - started:.1f} s -> {out_dir}")
+    return len(todo) - failed, skipped, failed
+
+
+if __name__ == "__main__":
+    # python -m visualizations.reports [league ...] [--jobs N] [--out DIR] [--force]
+    args = sys.argv[1:]
+    options = {}
+    for flag in ('--jobs', '--out'):
+        if flag in args:
+            options[flag] = args[args.index(flag) + 1]
+            del args[args.index(flag):args.index(flag) + 2]
+    force = '--force' in args
+    leagues = [arg for arg in args if arg != '--force'] or DEFAULT_LEAGUES
+    render(leagues, out_dir=options.get('--out', REPORTS_DIR),
+           max_workers=int(options['--jobs']) if '--jobs' in options else None, force=force)